@@ -2,7 +2,9 @@ __version__ = '0.1'
 
 import argparse
 import sys
-from .misp_stix_mapping import Mapping
+from .misp_stix_mapping import Mapping, shared_mapping
+from .misp_stix_timestamps import (
+    datetime_from_stix_str, datetime_from_str, datetime_from_timestamp, timestamp_from_datetime)
 from .misp2stix import *
 from .misp_stix_converter import (
     misp_attribute_collection_to_stix1, misp_collection_to_stix2_0, misp_collection_to_stix2_1,
@@ -17,6 +19,7 @@ from .misp_stix_converter import (
     _get_campaigns_header, _get_courses_of_action_header, _get_indicators_header,
     _get_observables_header, _get_threat_actors_header, _get_ttps_header)
 from .stix2misp import *
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from uuid import uuid4
 
@@ -33,7 +36,8 @@ def _process_arguments(stix_args):
                     version = stix_args.version,
                     in_memory = not stix_args.tmp_files,
                     namespace = stix_args.namespace,
-                    org = stix_args.org
+                    org = stix_args.org,
+                    buffer_size = stix_args.buffer_size
                 )
                 if status != 1:
                     sys.exit(f'Error while processing {stix_args.file[0]} - status code = {status}')
@@ -47,7 +51,8 @@ def _process_arguments(stix_args):
                     version = stix_args.version,
                     in_memory = not stix_args.tmp_files,
                     namespace = stix_args.namespace,
-                    org = stix_args.org
+                    org = stix_args.org,
+                    buffer_size = stix_args.buffer_size
                 )
                 if status != 1:
                     sys.exit(f'Error while processing your files - status code = {status}')
@@ -62,7 +67,8 @@ def _process_arguments(stix_args):
                     version = stix_args.version,
                     in_memory = not stix_args.tmp_files,
                     namespace = stix_args.namespace,
-                    org = stix_args.org
+                    org = stix_args.org,
+                    buffer_size = stix_args.buffer_size
                 )
                 if status == 1:
                     results.append(output)
@@ -76,7 +82,8 @@ def _process_arguments(stix_args):
                 stix_args.format,
                 stix_args.version,
                 namespace = stix_args.namespace,
-                org = stix_args.org
+                org = stix_args.org,
+                workers = stix_args.workers
             )
             if status != 1:
                 sys.exit(f'Error while processing {filename} - status code = {status}')
@@ -90,7 +97,9 @@ def _process_arguments(stix_args):
                 version = stix_args.version,
                 in_memory = not stix_args.tmp_files,
                 namespace = stix_args.namespace,
-                org = stix_args.org
+                org = stix_args.org,
+                workers = stix_args.workers,
+                buffer_size = stix_args.buffer_size
             )
             if status != 1:
                 sys.exit(f'Error while processing your files - status code = {status}')
@@ -102,7 +111,8 @@ def _process_arguments(stix_args):
                 stix_args.format,
                 stix_args.version,
                 namespace = stix_args.namespace,
-                version = stix_args.version
+                org = stix_args.org,
+                workers = stix_args.workers
             )
             if status == 1:
                 results.append(f'{filename}.out')
@@ -121,15 +131,21 @@ def _process_arguments(stix_args):
         status = method(
             output,
             *stix_args.file,
-            in_memory = not stix_args.tmp_files
+            in_memory = not stix_args.tmp_files,
+            workers = stix_args.workers,
+            buffer_size = stix_args.buffer_size
         )
         if status != 1:
             sys.exit(f'Error while processing your files - status code = {status}')
         return output
     results = []
     method = misp_to_stix2_0 if stix_args.version == '2.0' else misp_to_stix2_1
-    for filename in stix_args.file:
-        status = method(filename)
+    if stix_args.workers > 1:
+        with ProcessPoolExecutor(max_workers=stix_args.workers) as executor:
+            statuses = list(executor.map(method, stix_args.file))
+    else:
+        statuses = map(method, stix_args.file)
+    for filename, status in zip(stix_args.file, statuses):
         if status == 1:
             results.append(f'{filename}.out')
         else:
@@ -146,6 +162,8 @@ def main():
     parser.add_argument('-f', '--file', nargs='+', help='Path to the file(s) to convert.')
     parser.add_argument('-s', '--single_output', action='store_true', help='Produce only one result file (in case of multiple input file).')
     parser.add_argument('-t', '--tmp_files', action='store_true', help='Store result in file (in case of multiple result files) instead of keeping it in memory only.')
+    parser.add_argument('-b', '--buffer_size', type=int, default=-1, help='Size in bytes of the write buffer of the results files (default: system choice).')
+    parser.add_argument('-w', '--workers', type=int, default=1, help='Number of processes used to convert multiple input files with STIX 2, or the events of the input files with STIX 1.')
     stix1_parser = parser.add_argument_group('STIX 1 specific parameters')
     stix1_parser.add_argument('--feature', default='event', choices=['attribute', 'event'], help='MISP data structure level.')
     stix1_parser.add_argument('--format', default='xml', choices=['json', 'xml'], help='STIX 1 format.')
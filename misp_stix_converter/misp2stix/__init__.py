@@ -1,4 +1,5 @@
 from .framing import stix1_attributes_framing, stix1_framing, stix20_framing, stix21_framing
+from .galaxies_catalog import build_galaxies_catalog
 from .misp_to_stix1 import MISPtoSTIX1AttributesParser, MISPtoSTIX1EventsParser
 from .misp_to_stix20 import MISPtoSTIX20Parser
 from .misp_to_stix21 import MISPtoSTIX21Parser
@@ -1,11 +1,15 @@
 # -*- coding: utf-8 -*-
 #!/usr/bin/env python3
 
+import json
 import traceback
+from .. import datetime_from_timestamp
+from .json_stream import StreamedArray, load_json_content
 from .stix20_mapping import Stix20Mapping
 from .stix21_mapping import Stix21Mapping
 from collections import defaultdict
 from datetime import datetime
+from pathlib import Path
 from typing import Optional, Union
 
 
@@ -17,6 +21,7 @@ class MISPtoSTIXParser:
         super().__init__()
         self.__errors: defaultdict = defaultdict(list)
         self.__warnings: defaultdict = defaultdict(set)
+        self.__dispatch_tables: dict = {}
         self._identifier: str
         self._mapping: Union[Stix20Mapping, Stix21Mapping]
         self._misp_event: dict
@@ -115,11 +120,11 @@ class MISPtoSTIXParser:
     def _handle_event_tags_and_galaxies(self) -> tuple:
         if self._misp_event.get('Galaxy'):
             tag_names: list = []
+            galaxy_parsers = self._dispatch_table('galaxy_types_mapping', 'event')
             for galaxy in self._misp_event['Galaxy']:
                 galaxy_type = galaxy['type']
-                if galaxy_type in self._mapping.galaxy_types_mapping:
-                    to_call = self._mapping.galaxy_types_mapping[galaxy_type]
-                    getattr(self, to_call.format('event'))(galaxy)
+                if galaxy_type in galaxy_parsers:
+                    galaxy_parsers[galaxy_type](galaxy)
                     tag_names.extend(self._quick_fetch_tag_names(galaxy))
                 else:
                     self.__warnings[self._identifier].add(f'{galaxy_type} galaxy in event not mapped.')
@@ -127,11 +132,11 @@ class MISPtoSTIXParser:
         return tuple(tag['name'] for tag in self._misp_event.get('Tag', []))
 
     def _parse_event_galaxies(self, galaxies: list):
+        galaxy_parsers = self._dispatch_table('galaxy_types_mapping', 'parent')
         for galaxy in galaxies:
             galaxy_type = galaxy['type']
-            if galaxy_type in self._mapping.galaxy_types_mapping:
-                to_call = self._mapping.galaxy_types_mapping[galaxy_type]
-                getattr(self, to_call.format('parent'))(galaxy)
+            if galaxy_type in galaxy_parsers:
+                galaxy_parsers[galaxy_type](galaxy)
             else:
                 self.__warnings[self._identifier].add(f'{galaxy_type} galaxy from event level not mapped.')
 
@@ -141,7 +146,19 @@ class MISPtoSTIXParser:
 
     @staticmethod
     def _datetime_from_timestamp(timestamp: str) -> datetime:
-        return datetime.utcfromtimestamp(int(timestamp))
+        return datetime_from_timestamp(timestamp)
+
+    def _dispatch_table(self, mapping_name: str, feature: Optional[str] = None) -> dict:
+        key = (mapping_name, feature)
+        if key not in self.__dispatch_tables:
+            dispatch_table = {}
+            for name, to_call in getattr(self._mapping, mapping_name).items():
+                if feature is not None:
+                    to_call = to_call.format(feature)
+                if hasattr(self, to_call):
+                    dispatch_table[name] = getattr(self, to_call)
+            self.__dispatch_tables[key] = dispatch_table
+        return self.__dispatch_tables[key]
 
     @staticmethod
     def _fetch_ids_flag(attributes: list) -> bool:
@@ -158,6 +175,13 @@ class MISPtoSTIXParser:
             return False
         return 'Object' in reference and reference['Object'].get('name') == name
 
+    @staticmethod
+    def _load_json_content(filename: Union[Path, str], incremental: bool = False) -> Union[dict, StreamedArray]:
+        if incremental:
+            return load_json_content(filename)
+        with open(filename, 'rt', encoding='utf-8') as f:
+            return json.loads(f.read())
+
     @staticmethod
     def _merge_galaxy_clusters(galaxies: dict, galaxy: dict):
         for cluster in galaxy['GalaxyCluster']:
@@ -30,6 +30,13 @@ def stix1_framing(namespace: str, orgname: str, return_format: str, version: str
     return _stix_json_framing(stix_package)
 
 
+def stix1_package_framing(stix_package: STIXPackage, namespace: str, orgname: str, return_format: str) -> tuple:
+    if return_format == 'xml':
+        namespaces = _handle_namespaces(namespace, orgname)
+        return _stix_xml_framing(stix_package, namespaces)
+    return _stix_json_indented_framing(stix_package)
+
+
 def stix_xml_separator():
     header = "stix:Related_Package"
     return f"        </{header}>\n        <{header}>\n"
@@ -72,6 +79,15 @@ def _stix_json_framing(stix_package: STIXPackage) -> tuple:
     return header, ', ', ']}}'
 
 
+def _stix_json_indented_framing(stix_package: STIXPackage) -> tuple:
+    placeholder = 'related_package'
+    package = stix_package.to_dict()
+    package['related_packages'] = {'related_packages': [placeholder]}
+    header, footer = json.dumps(package, indent=4).split(json.dumps(placeholder))
+    indent = header[header.rindex('\n') + 1:]
+    return header, f',\n{indent}', footer
+
+
 def _stix_package(orgname: str, version: str, uuid: Optional[str] = None) -> STIXPackage:
     parsed_orgname = re.sub('[\W]+', '', orgname.replace(' ', '_'))
     if uuid is None:
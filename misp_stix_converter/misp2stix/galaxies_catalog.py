@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import sqlite3
+from .. import shared_mapping
+from .stix2_mapping import Stix2Mapping
+from collections import defaultdict
+from pathlib import Path
+from threading import Lock
+from typing import Optional, Union
+
+_ROOT_PATH = Path(__file__).parents[1].resolve()
+_CATALOG_PATH = _ROOT_PATH / 'data' / 'galaxiesCatalog.db'
+_CATALOG_VERSION = 2
+_CTI_PATH = _ROOT_PATH / 'data' / 'cti'
+_REFERENCE_FEATURES = ('external_id', 'url')
+# Galaxies catalogs already loaded by the current process, by catalog path and source names
+_GALAXIES_CATALOGS: dict = {}
+_GALAXIES_CATALOGS_LOCK = Lock()
+
+
+def build_galaxies_catalog(cti_path: Union[Path, str] = _CTI_PATH,
+                           catalog_path: Union[Path, str] = _CATALOG_PATH,
+                           source_names: Optional[tuple] = None) -> Path:
+    """
+    Compiles the MITRE CTI bundles into the on-disk index used to match MISP
+    galaxy clusters with their STIX 2 counterparts in interoperability mode.
+
+    :param cti_path: Path to the CTI repository (defaults to the submodule)
+    :param catalog_path: Path of the index to write
+    :param source_names: External references source names used to index the
+        STIX objects by external id
+    :return: The path of the written index
+    """
+    cti_path = Path(cti_path)
+    catalog_path = Path(catalog_path)
+    catalog_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = catalog_path.with_name(f'{catalog_path.name}.{os.getpid()}.tmp')
+    try:
+        connection = sqlite3.connect(str(tmp_path))
+        try:
+            _populate_catalog(connection, cti_path, source_names)
+            connection.commit()
+        finally:
+            connection.close()
+        os.replace(tmp_path, catalog_path)
+    except BaseException:
+        if tmp_path.exists():
+            os.remove(tmp_path)
+        raise
+    # The catalogs loaded from the previous index are loaded again when needed
+    for key, catalog in list(_GALAXIES_CATALOGS.items()):
+        if key[0] == catalog_path.resolve():
+            catalog.close()
+    return catalog_path
+
+
+def _cti_fingerprint(cti_path: Path) -> str:
+    fingerprint = []
+    for filename in sorted(cti_path.glob('*/*.json')):
+        stat = filename.stat()
+        fingerprint.append([filename.relative_to(cti_path).as_posix(), stat.st_size, stat.st_mtime_ns])
+    return json.dumps(fingerprint)
+
+
+def _populate_catalog(connection: sqlite3.Connection, cti_path: Path, source_names: Optional[tuple]):
+    if source_names is None:
+        source_names = shared_mapping(Stix2Mapping).source_names
+    catalog = defaultdict(lambda: defaultdict(dict))
+    stix_objects = {}
+    for filename in sorted(cti_path.glob('*/*.json')):
+        with open(filename, 'rt', encoding='utf-8') as f:
+            bundle = json.loads(f.read())
+        for stix_object in bundle['objects']:
+            object_id = stix_object['id']
+            if stix_object['type'] == 'identity':
+                stix_objects[object_id] = stix_object
+                continue
+            if not stix_object.get('name'):
+                continue
+            stix_objects.setdefault(object_id, stix_object)
+            object_type = stix_object['type']
+            catalog[stix_object['name']][object_type].setdefault(object_id, stix_object)
+            for reference in stix_object.get('external_references', []):
+                if reference['source_name'] in source_names:
+                    if reference.get('external_id') is not None:
+                        catalog[reference['external_id']][object_type].setdefault(object_id, stix_object)
+                    break
+    galaxies = []
+    references = {}
+    for key, values in catalog.items():
+        for object_type, candidates in values.items():
+            named = [stix_object for stix_object in candidates.values() if stix_object['name'] == key]
+            galaxies.append((key, object_type, named[0]['id'] if len(named) == 1 else None))
+            for stix_object in named:
+                for reference in stix_object.get('external_references', []):
+                    if reference['source_name'] not in source_names:
+                        continue
+                    for feature in _REFERENCE_FEATURES:
+                        if reference.get(feature) is not None:
+                            matching = (key, object_type, feature, reference[feature])
+                            references.setdefault(matching, set()).add(stix_object['id'])
+    connection.executescript(
+        '''
+        DROP TABLE IF EXISTS galaxies;
+        DROP TABLE IF EXISTS metadata;
+        DROP TABLE IF EXISTS objects;
+        DROP TABLE IF EXISTS refs;
+        CREATE TABLE galaxies (
+            key TEXT NOT NULL,
+            object_type TEXT NOT NULL,
+            name_match TEXT,
+            PRIMARY KEY (key, object_type)
+        );
+        CREATE TABLE refs (
+            key TEXT NOT NULL,
+            object_type TEXT NOT NULL,
+            feature TEXT NOT NULL,
+            value TEXT NOT NULL,
+            object_id TEXT,
+            PRIMARY KEY (key, object_type, feature, value)
+        );
+        CREATE TABLE objects (id TEXT PRIMARY KEY, stix_object TEXT NOT NULL);
+        CREATE TABLE metadata (version INTEGER NOT NULL, fingerprint TEXT NOT NULL);
+        '''
+    )
+    connection.executemany('INSERT INTO galaxies VALUES (?, ?, ?)', galaxies)
+    connection.executemany(
+        'INSERT INTO refs VALUES (?, ?, ?, ?, ?)',
+        (
+            (*matching, next(iter(object_ids)) if len(object_ids) == 1 else None)
+            for matching, object_ids in references.items()
+        )
+    )
+    connection.executemany(
+        'INSERT INTO objects VALUES (?, ?)',
+        (
+            (object_id, json.dumps(stix_object, separators=(',', ':')))
+            for object_id, stix_object in stix_objects.items()
+        )
+    )
+    connection.execute(
+        'INSERT INTO metadata VALUES (?, ?)',
+        (_CATALOG_VERSION, _cti_fingerprint(cti_path))
+    )
+
+
+class GalaxiesCatalog:
+    def __init__(self, connection: sqlite3.Connection):
+        self.__connection = connection
+        self.__entries: dict = {}
+        self.__references: dict = {}
+        self.__stix_objects: dict = {}
+
+    @classmethod
+    def load(cls, source_names: Optional[tuple] = None,
+             cti_path: Union[Path, str] = _CTI_PATH,
+             catalog_path: Union[Path, str] = _CATALOG_PATH):
+        key = (Path(catalog_path).resolve(), source_names)
+        try:
+            return _GALAXIES_CATALOGS[key]
+        except KeyError:
+            with _GALAXIES_CATALOGS_LOCK:
+                if key not in _GALAXIES_CATALOGS:
+                    _GALAXIES_CATALOGS[key] = cls.__load(source_names, Path(cti_path), key[0])
+            return _GALAXIES_CATALOGS[key]
+
+    @classmethod
+    def __load(cls, source_names: Optional[tuple], cti_path: Path, catalog_path: Path):
+        if catalog_path.exists():
+            connection = cls.__connect(catalog_path)
+            if cls.__is_up_to_date(connection, cti_path):
+                return cls(connection)
+            connection.close()
+        if cti_path.exists():
+            try:
+                build_galaxies_catalog(cti_path, catalog_path, source_names)
+            except (OSError, sqlite3.Error):
+                pass
+            else:
+                return cls(cls.__connect(catalog_path))
+        connection = sqlite3.connect(':memory:', check_same_thread=False)
+        _populate_catalog(connection, cti_path, source_names)
+        return cls(connection)
+
+    def close(self):
+        for key, catalog in list(_GALAXIES_CATALOGS.items()):
+            if catalog is self:
+                del _GALAXIES_CATALOGS[key]
+        self.__connection.close()
+
+    def __contains__(self, key: str) -> bool:
+        return bool(self[key])
+
+    def __getitem__(self, key: str) -> dict:
+        try:
+            return self.__entries[key]
+        except KeyError:
+            query = 'SELECT object_type, name_match FROM galaxies WHERE key = ?'
+            self.__entries[key] = dict(self.__connection.execute(query, (key,)))
+            return self.__entries[key]
+
+    def identity(self, identity_id: str) -> dict:
+        return self.stix_object(identity_id)
+
+    def match_by_name(self, key: str, object_type: str) -> Union[dict, None]:
+        object_id = self[key].get(object_type)
+        if object_id is not None:
+            return self.stix_object(object_id)
+
+    def match_by_references(self, key: str, object_type: str, feature: str, values: list) -> Union[dict, None]:
+        object_ids = set()
+        for value in ((values,) if isinstance(values, str) else values):
+            matching = (key, object_type, feature, value)
+            if matching not in self.__references:
+                query = 'SELECT object_id FROM refs WHERE key = ? AND object_type = ? AND feature = ? AND value = ?'
+                row = self.__connection.execute(query, matching).fetchone()
+                self.__references[matching] = '' if row is None else row[0]
+            object_id = self.__references[matching]
+            if object_id is None:
+                return None
+            if object_id:
+                object_ids.add(object_id)
+        if len(object_ids) == 1:
+            return self.stix_object(object_ids.pop())
+
+    def stix_object(self, object_id: str) -> dict:
+        if object_id not in self.__stix_objects:
+            row = self.__connection.execute(
+                'SELECT stix_object FROM objects WHERE id = ?', (object_id,)
+            ).fetchone()
+            if row is None:
+                raise KeyError(object_id)
+            self.__stix_objects[object_id] = json.loads(row[0])
+        return self.__stix_objects[object_id]
+
+    @staticmethod
+    def __connect(catalog_path: Path) -> sqlite3.Connection:
+        # The catalog is shared by the parsers of the current process, whatever their thread
+        return sqlite3.connect(
+            f'{catalog_path.resolve().as_uri()}?mode=ro', uri=True, check_same_thread=False
+        )
+
+    @staticmethod
+    def __is_up_to_date(connection: sqlite3.Connection, cti_path: Path) -> bool:
+        try:
+            row = connection.execute('SELECT version, fingerprint FROM metadata').fetchone()
+        except sqlite3.DatabaseError:
+            return False
+        if row is None or row[0] != _CATALOG_VERSION:
+            return False
+        return not cti_path.exists() or row[1] == _cti_fingerprint(cti_path)
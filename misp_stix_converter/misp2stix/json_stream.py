@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import re
+from json import JSONDecodeError
+from pathlib import Path
+from typing import Iterator, Union
+
+_CHUNK_SIZE = 1 << 16
+_STREAMED_ARRAYS = ('Attribute', 'Object', 'response')
+_STREAMED_OBJECTS = ('Event', 'response')
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+def load_json_content(filename: Union[Path, str], chunk_size: int = _CHUNK_SIZE) -> Union[dict, 'StreamedArray']:
+    with open(filename, 'rt', encoding='utf-8') as f:
+        stream = JSONStream(f, chunk_size)
+        if stream.peek() == '[':
+            return StreamedArray(filename, (), stream.count(), chunk_size)
+        return _load_object(stream, filename, (), chunk_size)
+
+
+def _load_object(stream: 'JSONStream', filename: Union[Path, str], path: tuple, chunk_size: int) -> dict:
+    content = {}
+    for key in stream.iter_keys():
+        character = stream.peek()
+        if character == '[' and key in _STREAMED_ARRAYS:
+            length = stream.count()
+            content[key] = StreamedArray(filename, (*path, key), length, chunk_size)
+        elif character == '{' and key in _STREAMED_OBJECTS:
+            content[key] = _load_object(stream, filename, (*path, key), chunk_size)
+        else:
+            content[key] = stream.decode()
+    return content
+
+
+class JSONStream:
+    def __init__(self, handle, chunk_size: int = _CHUNK_SIZE):
+        self.__handle = handle
+        self.__chunk_size = chunk_size
+        self.__buffer = ''
+        self.__index = 0
+        self.__eof = False
+        self.__decoder = json.JSONDecoder()
+
+    def count(self) -> int:
+        length = 0
+        for _ in self.__walk_array():
+            self.skip()
+            length += 1
+        return length
+
+    def decode(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.__decoder.raw_decode(self.__buffer, self.__index)
+            except JSONDecodeError:
+                if self.__read():
+                    continue
+                raise
+            # a number ending with the buffer may continue in the next chunk
+            if end == len(self.__buffer) and self.__read():
+                continue
+            self.__index = end
+            return value
+
+    def iter_array(self) -> Iterator:
+        for _ in self.__walk_array():
+            yield self.decode()
+
+    def iter_keys(self) -> Iterator[str]:
+        # The value of each yielded key must be consumed before resuming
+        self.__consume('{')
+        if self.peek() == '}':
+            self.__index += 1
+            return
+        while True:
+            key = self.decode()
+            self.__consume(':')
+            yield key
+            if self.__consume(',}') == '}':
+                return
+
+    def peek(self) -> str:
+        while True:
+            self.__index = _WHITESPACE.match(self.__buffer, self.__index).end()
+            if self.__index < len(self.__buffer):
+                return self.__buffer[self.__index]
+            if not self.__read():
+                raise JSONDecodeError('Unexpected end of content', self.__buffer, self.__index)
+
+    def skip(self):
+        character = self.peek()
+        if character == '[':
+            for _ in self.__walk_array():
+                self.skip()
+        elif character == '{':
+            for _ in self.iter_keys():
+                self.skip()
+        else:
+            self.decode()
+
+    def __consume(self, expected: str) -> str:
+        character = self.peek()
+        if character not in expected:
+            raise JSONDecodeError(f'Expecting one of {expected!r}', self.__buffer, self.__index)
+        self.__index += 1
+        return character
+
+    def __read(self) -> bool:
+        if self.__eof:
+            return False
+        remaining = len(self.__buffer) - self.__index
+        chunk = self.__handle.read(max(self.__chunk_size, remaining))
+        self.__buffer = f'{self.__buffer[self.__index:]}{chunk}'
+        self.__index = 0
+        if not chunk:
+            self.__eof = True
+            return False
+        return True
+
+    def __walk_array(self) -> Iterator[None]:
+        self.__consume('[')
+        if self.peek() == ']':
+            self.__index += 1
+            return
+        while True:
+            yield
+            if self.__consume(',]') == ']':
+                return
+
+
+class StreamedArray:
+    def __init__(self, filename: Union[Path, str], path: tuple, length: int, chunk_size: int = _CHUNK_SIZE):
+        self.__filename = filename
+        self.__path = path
+        self.__length = length
+        self.__chunk_size = chunk_size
+
+    def __bool__(self) -> bool:
+        return self.__length > 0
+
+    def __iter__(self) -> Iterator:
+        with open(self.__filename, 'rt', encoding='utf-8') as f:
+            stream = JSONStream(f, self.__chunk_size)
+            for key in self.__path:
+                for current in stream.iter_keys():
+                    if current == key:
+                        break
+                    stream.skip()
+            yield from stream.iter_array()
+
+    def __len__(self) -> int:
+        return self.__length
@@ -1,9 +1,9 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import json
 import re
 import socket
+from .. import shared_mapping
 from .stix1_mapping import Stix1Mapping
 from .exportparser import MISPtoSTIXParser
 from collections import defaultdict
@@ -49,7 +49,7 @@ from stix.coa import CourseOfAction
 from stix.common import InformationSource, Identity, ToolInformation
 from stix.common.confidence import Confidence
 from stix.common.related import RelatedCOA, RelatedIndicator, RelatedObservable, RelatedThreatActor, RelatedTTP
-from stix.common.vocabs import IncidentStatus
+from stix.common.vocabs import IncidentStatus, IndicatorType
 from stix.core import STIXPackage, STIXHeader
 from stix.data_marking import Marking, MarkingSpecification
 from stix.exploit_target import ExploitTarget, Vulnerability, Weakness
@@ -70,7 +70,7 @@ from stix.ttp.attack_pattern import AttackPattern
 from stix.ttp.malware_instance import MalwareInstance
 from stix.ttp.resource import Resource, Tools
 from stix.ttp.victim_targeting import VictimTargeting
-from typing import Optional, Union
+from typing import Iterator, Optional, Union
 from uuid import uuid5, UUID
 
 _FILE_SINGLE_ATTRIBUTES = (
@@ -92,7 +92,12 @@ class MISPtoSTIX1Parser(MISPtoSTIXParser):
         self._orgname = orgname
         self._orgname_id = re.sub('[\W]+', '', orgname.replace(" ", "_"))
         self._version = version
-        self._mapping = Stix1Mapping()
+        self._mapping = shared_mapping(Stix1Mapping)
+        self._confidences = {}
+        self._handlings = {}
+        self._indicator_types = {}
+        self._information_sources = {}
+        self._valid_time = ValidTime()
 
     @property
     def stix_package(self) -> STIXPackage:
@@ -104,9 +109,10 @@ class MISPtoSTIX1Parser(MISPtoSTIXParser):
 
     def _resolve_attribute(self, attribute: dict):
         attribute_type = attribute['type']
+        attribute_parsers = self._dispatch_table('attribute_types_mapping')
         try:
-            if attribute_type in self._mapping.attribute_types_mapping:
-                getattr(self, self._mapping.attribute_types_mapping[attribute_type])(attribute)
+            if attribute_type in attribute_parsers:
+                attribute_parsers[attribute_type](attribute)
             else:
                 self._parse_custom_attribute(attribute)
                 self._attribute_not_mapped_warning(attribute_type)
@@ -125,11 +131,11 @@ class MISPtoSTIX1Parser(MISPtoSTIXParser):
     def _handle_attribute_tags_and_galaxies(self, attribute: dict, indicator: Indicator) -> tuple:
         if attribute.get('Galaxy'):
             tag_names = []
+            galaxy_parsers = self._dispatch_table('galaxy_types_mapping', 'attribute')
             for galaxy in attribute['Galaxy']:
                 galaxy_type = galaxy['type']
-                if galaxy_type in self._mapping.galaxy_types_mapping:
-                    to_call = self._mapping.galaxy_types_mapping[galaxy_type]
-                    getattr(self, to_call.format('attribute'))(galaxy, indicator)
+                if galaxy_type in galaxy_parsers:
+                    galaxy_parsers[galaxy_type](galaxy, indicator)
                     tag_names.extend(self._quick_fetch_tag_names(galaxy))
                 else:
                     self._attribute_galaxy_not_mapped_warning(galaxy_type, attribute['type'])
@@ -150,7 +156,7 @@ class MISPtoSTIX1Parser(MISPtoSTIXParser):
         tags = self._handle_non_indicator_attribute_tags_and_galaxies(attribute, ttp)
         if tags:
             ttp.handling = self._set_handling(tags)
-        self._stix_package.add_ttp(ttp)
+        self._append_ttp(ttp)
         if self._identifier != 'attributes collection':
             related_ttp = self._create_related_ttp(ttp.id_, attribute['type'], timestamp=timestamp)
             self._incident.add_leveraged_ttps(related_ttp)
@@ -158,14 +164,14 @@ class MISPtoSTIX1Parser(MISPtoSTIXParser):
     def _handle_non_indicator_attribute_tags_and_galaxies(self, attribute: dict, ttp: TTP) -> tuple:
         if attribute.get('Galaxy'):
             tag_names = []
+            galaxy_parsers = self._dispatch_table('galaxy_types_mapping', 'object')
             for galaxy in attribute['Galaxy']:
                 galaxy_type = galaxy['type']
                 if galaxy_type not in self._mapping.ttp_names:
-                    if galaxy_type not in self._mapping.galaxy_types_mapping:
+                    if galaxy_type not in galaxy_parsers:
                         self._attribute_galaxy_not_mapped_warning(galaxy_type, attribute['type'])
                     continue
-                to_call = self._mapping.galaxy_types_mapping[galaxy_type]
-                getattr(self, to_call.format('object'))(galaxy, ttp)
+                galaxy_parsers[galaxy_type](galaxy, ttp)
                 tag_names.extend(self._quick_fetch_tag_names(galaxy))
             return tuple(tag['name'] for tag in attribute.get('Tag', []) if tag['name'] not in tag_names)
         return tuple(tag['name'] for tag in attribute.get('Tag', []))
@@ -653,7 +659,7 @@ class MISPtoSTIX1Parser(MISPtoSTIXParser):
         if cluster['uuid'] not in self._ids:
             ttp = self._create_ttp_from_galaxy(galaxy_name, cluster['uuid'])
             getattr(self, f'_parse_{feature}_galaxy')(cluster, ttp)
-            self._stix_package.add_ttp(ttp)
+            self._append_ttp(ttp)
             self._ids.add(cluster['uuid'])
             return ttp.id_
         return f"{self._orgname_id}:TTP-{cluster['uuid']}"
@@ -757,6 +763,16 @@ class MISPtoSTIX1Parser(MISPtoSTIXParser):
         ciq_identity.name = f"{attribute['category']}: {attribute['value']} (MISP Attribute)"
         return ciq_identity
 
+    def _create_confidence(self, timestamp: datetime) -> Confidence:
+        # The indicators with the same timestamp share the same confidence
+        if timestamp not in self._confidences:
+            self._confidences[timestamp] = Confidence(
+                value=self._mapping.confidence_value,
+                description=self._mapping.confidence_description,
+                timestamp=timestamp
+            )
+        return self._confidences[timestamp]
+
     def _create_course_of_action_from_galaxy(self, cluster: dict) -> CourseOfAction:
         course_of_action = CourseOfAction()
         course_of_action.id_ = f"{self._orgname_id}:CourseOfAction-{cluster['uuid']}"
@@ -797,28 +813,26 @@ class MISPtoSTIX1Parser(MISPtoSTIXParser):
 
     def _create_indicator_from_attribute(self, attribute: dict) -> Indicator:
         timestamp = self._datetime_from_timestamp(attribute['timestamp'])
-        indicator = Indicator(timestamp=timestamp)
-        indicator.id_ = f"{self._orgname_id}:Indicator-{attribute['uuid']}"
+        indicator = Indicator(
+            id_=f"{self._orgname_id}:Indicator-{attribute['uuid']}",
+            timestamp=timestamp
+        )
         indicator.producer = self._producer
         indicator.title = f"{attribute['category']}: {attribute['value']} (MISP Attribute)"
         indicator.description = attribute['comment'] if attribute.get('comment') else indicator.title
-        indicator.confidence = Confidence(
-            value=self._mapping.confidence_value,
-            description=self._mapping.confidence_description,
-            timestamp=timestamp
-        )
+        indicator.confidence = self._create_confidence(timestamp)
         indicator.add_indicator_type(self._set_indicator_type(attribute['type']))
-        indicator.add_valid_time_position(ValidTime())
+        indicator.add_valid_time_position(self._valid_time)
         tags = self._handle_attribute_tags_and_galaxies(attribute, indicator)
         if tags:
             indicator.handling = self._set_handling(tags)
         return indicator
 
-    @staticmethod
-    def _create_information_source(name: str) -> InformationSource:
-        identity = Identity(name=name)
-        information_source = InformationSource(identity=identity)
-        return information_source
+    def _create_information_source(self, name: str) -> InformationSource:
+        if name not in self._information_sources:
+            identity = Identity(name=name)
+            self._information_sources[name] = InformationSource(identity=identity)
+        return self._information_sources[name]
 
     def _create_malware_sample_observable(self, value: str, data: BytesIO, uuid: str) -> Observable:
         filename, hash_value = value.split('|')
@@ -837,10 +851,12 @@ class MISPtoSTIX1Parser(MISPtoSTIXParser):
 
     def _create_observable(self, stix_object: _OBSERVABLE_OBJECT_TYPES, attribute_uuid: str, feature: str, alternative_uuid: Optional[str] = None) -> Observable:
         stix_object.parent.id_ = f"{self._orgname_id}:{feature}-{attribute_uuid}"
-        observable = Observable(stix_object)
         if alternative_uuid is None:
             alternative_uuid = attribute_uuid
-        observable.id_ = f"{self._orgname_id}:Observable-{alternative_uuid}"
+        observable = Observable(
+            stix_object,
+            id_=f"{self._orgname_id}:Observable-{alternative_uuid}"
+        )
         return observable
 
     def _create_observable_composition(self, observables: list, uuid: str, name: Optional[str] = None) -> Observable:
@@ -980,6 +996,10 @@ class MISPtoSTIX1Parser(MISPtoSTIXParser):
             attributes['group'] = groups
 
     def _set_handling(self, tags: list) -> Marking:
+        # The markings are shared between the STIX objects with the same tags
+        key = tuple(tags)
+        if key in self._handlings:
+            return self._handlings[key]
         sorted_tags = defaultdict(list)
         for tag in tags:
             feature = 'tlp_tags' if self._is_tlp_tag(tag) else 'simple_tags'
@@ -995,12 +1015,14 @@ class MISPtoSTIX1Parser(MISPtoSTIXParser):
             simple_marking.statement = tag
             marking_specification.marking_structures.append(simple_marking)
         handling.add_marking(marking_specification)
+        self._handlings[key] = handling
         return handling
 
-    def _set_indicator_type(self, attribute_type: str) -> str:
-        if attribute_type in self._mapping.misp_indicator_type:
-            return self._mapping.misp_indicator_type[attribute_type]
-        return 'Malware Artifacts'
+    def _set_indicator_type(self, attribute_type: str) -> IndicatorType:
+        if attribute_type not in self._indicator_types:
+            indicator_type = self._mapping.misp_indicator_type.get(attribute_type, 'Malware Artifacts')
+            self._indicator_types[attribute_type] = IndicatorType(indicator_type)
+        return self._indicator_types[attribute_type]
 
     @staticmethod
     def _set_user_id(account_object: Union[UnixUserAccount, WinUser], attributes: dict, feature: str):
@@ -1015,6 +1037,10 @@ class MISPtoSTIX1Parser(MISPtoSTIXParser):
     #                              UTILITY FUNCTIONS.                              #
     ################################################################################
 
+    def _append_ttp(self, ttp: TTP):
+        self._stix_package.add_ttp(ttp)
+        self._ttps.setdefault(ttp.id_, ttp)
+
     @staticmethod
     def _from_datetime_to_str(date):
         return date.strftime("%Y-%m-%dT%H:%M:%S+00:00")
@@ -1027,13 +1053,13 @@ class MISPtoSTIX1AttributesParser(MISPtoSTIX1Parser):
         self._identifier = 'attributes collection'
         self._ids = set()
 
-    def parse_json_content(self, filename):
-        with open(filename, 'rt', encoding='utf-8') as f:
-            attributes = json.loads(f.read())
-            if attributes.get('response') is not None:
-                attributes = attributes['response']
+    def parse_json_content(self, filename, incremental: bool = False):
+        attributes = self._load_json_content(filename, incremental)
+        if attributes.get('response') is not None:
+            attributes = attributes['response']
         self._stix_package = STIXPackage()
-        if 'Attribute' in attributes:
+        self._ttps = {}
+        if isinstance(attributes, dict) and 'Attribute' in attributes:
             attributes = attributes['Attribute']
         for attribute in attributes:
             self._resolve_attribute(attribute)
@@ -1058,7 +1084,7 @@ class MISPtoSTIX1AttributesParser(MISPtoSTIX1Parser):
         tags = self._handle_non_indicator_attribute_tags_and_galaxies(attribute, ttp)
         if tags:
             ttp.handling = self._set_handling(tags)
-        self._stix_package.add_ttp(ttp)
+        self._append_ttp(ttp)
 
     def _handle_test_mechanism(self, attribute: dict, test_mechanism: Union[SnortTestMechanism, YaraTestMechanism]):
         indicator = self._create_indicator_from_attribute(attribute)
@@ -1076,11 +1102,11 @@ class MISPtoSTIX1AttributesParser(MISPtoSTIX1Parser):
 class MISPtoSTIX1EventsParser(MISPtoSTIX1Parser):
     def __init__(self, orgname: str, version: str):
         super().__init__(orgname, version)
-        self._mapping.declare_objects_mapping()
+        if not hasattr(self._mapping, 'objects_mapping'):
+            self._mapping.declare_objects_mapping()
 
-    def parse_json_content(self, filename):
-        with open(filename, 'rt', encoding='utf-8') as f:
-            json_content = json.loads(f.read())
+    def parse_json_content(self, filename, incremental: bool = False):
+        json_content = self._load_json_content(filename, incremental)
         if json_content.get('response'):
             package = STIXPackage()
             for event in json_content['response']:
@@ -1090,12 +1116,19 @@ class MISPtoSTIX1EventsParser(MISPtoSTIX1Parser):
         else:
             self.parse_misp_event(json_content)
 
+    def iter_json_content(self, filename, incremental: bool = False) -> Iterator[STIXPackage]:
+        json_content = self._load_json_content(filename, incremental)
+        for misp_event in json_content.get('response') or (json_content,):
+            self.parse_misp_event(misp_event)
+            yield self._stix_package
+
     def parse_misp_event(self, misp_event: dict):
         self._header_comment = []
         self._objects_to_parse = defaultdict(dict)
         self._contextualised_data = set()
         self._ids = set()
         self._ttp_references = {}
+        self._ttps = {}
         if 'Event' in misp_event:
             misp_event = misp_event['Event']
         self._misp_event = misp_event
@@ -1105,20 +1138,20 @@ class MISPtoSTIX1EventsParser(MISPtoSTIX1Parser):
         self._stix_package = self._create_stix_package()
         self._incident = self._create_incident()
         self._generate_stix_objects()
-        if self._stix_package.ttps is not None:
-            for ttp in self._stix_package.ttps.ttp:
-                uuid = '-'.join(ttp.id_.split('-')[-5:])
-                if uuid in self._ttp_references:
-                    for referenced_uuid, relationship in self._ttp_references[uuid]:
-                        if referenced_uuid in self._contextualised_data:
-                            referenced_id = f'{self._orgname_id}:TTP-{referenced_uuid}'
-                            timestamp = self._quick_fetch_ttp_timestamp(referenced_id)
-                            related_ttp = self._create_related_ttp(
-                                f'{self._orgname_id}:TTP-{referenced_uuid}',
-                                relationship,
-                                timestamp=timestamp
-                            )
-                            ttp.add_related_ttp(related_ttp)
+        for uuid, references in self._ttp_references.items():
+            ttp = self._ttps.get(f'{self._orgname_id}:TTP-{uuid}')
+            if ttp is None:
+                continue
+            for referenced_uuid, relationship in references:
+                if referenced_uuid in self._contextualised_data:
+                    referenced_id = f'{self._orgname_id}:TTP-{referenced_uuid}'
+                    referenced_ttp = self._ttps.get(referenced_id)
+                    related_ttp = self._create_related_ttp(
+                        referenced_id,
+                        relationship,
+                        timestamp=None if referenced_ttp is None else referenced_ttp.timestamp
+                    )
+                    ttp.add_related_ttp(related_ttp)
         self._stix_package.add_incident(self._incident)
         stix_header = STIXHeader()
         stix_header.title = f"Export from {producer}'s MISP"
@@ -1202,17 +1235,19 @@ class MISPtoSTIX1EventsParser(MISPtoSTIX1Parser):
     ################################################################################
 
     def _resolve_objects(self):
+        non_indicator_parsers = self._dispatch_table('non_indicator_names')
+        object_parsers = self._dispatch_table('objects_mapping')
         for misp_object in self._misp_event['Object']:
             object_name = misp_object['name']
             if self._check_object_name(misp_object):
                 continue
             try:
-                if object_name in self._mapping.non_indicator_names:
-                    getattr(self, self._mapping.non_indicator_names[object_name])(misp_object)
+                if object_name in non_indicator_parsers:
+                    non_indicator_parsers[object_name](misp_object)
                 else:
                     to_ids = self._fetch_ids_flag(misp_object['Attribute'])
-                    to_call = self._fetch_objects_mapping_function(object_name)
-                    observable = getattr(self, to_call)(misp_object)
+                    object_parser = object_parsers.get(object_name, self._parse_custom_object)
+                    observable = object_parser(misp_object)
                     if to_ids:
                         self._handle_misp_object_with_context(misp_object, observable)
                     else:
@@ -1291,11 +1326,6 @@ class MISPtoSTIX1EventsParser(MISPtoSTIX1Parser):
                 attributes_dict[relation].append(value)
         return attributes_dict
 
-    def _fetch_objects_mapping_function(self, object_name: str) -> str:
-        if object_name in self._mapping.objects_mapping:
-            return self._mapping.objects_mapping[object_name]
-        return '_parse_custom_object'
-
     def _handle_custom_properties(self, attributes: dict, multiple: Optional[bool] = True) -> CustomProperties:
         custom_properties = CustomProperties()
         if not multiple:
@@ -1317,7 +1347,7 @@ class MISPtoSTIX1EventsParser(MISPtoSTIX1Parser):
     def _handle_misp_object_with_context(self, misp_object: dict, observable: Observable):
         indicator = self._create_indicator_from_object(misp_object)
         indicator.add_indicator_type(self._set_indicator_type(misp_object['name']))
-        indicator.add_valid_time_position(ValidTime())
+        indicator.add_valid_time_position(self._valid_time)
         indicator.add_observable(observable)
         tags = self._handle_object_tags_and_galaxies(misp_object, indicator)
         if tags:
@@ -1332,10 +1362,10 @@ class MISPtoSTIX1EventsParser(MISPtoSTIX1Parser):
         tags, galaxies = self._extract_object_attribute_tags_and_galaxies(misp_object)
         tag_names = set()
         if galaxies:
+            galaxy_parsers = self._dispatch_table('galaxy_types_mapping', 'object')
             for galaxy_type, galaxy in galaxies.items():
                 if galaxy_type in getattr(self._mapping, galaxy_name):
-                    to_call = self._mapping.galaxy_types_mapping[galaxy_type]
-                    getattr(self, to_call.format('object'))(galaxy, stix_object)
+                    galaxy_parsers[galaxy_type](galaxy, stix_object)
                     tag_names.update(self._quick_fetch_tag_names(galaxy))
             return tuple(tag for tag in tags if tag not in tag_names)
         return tuple(tags)
@@ -1344,9 +1374,9 @@ class MISPtoSTIX1EventsParser(MISPtoSTIX1Parser):
         tags, galaxies = self._extract_object_attribute_tags_and_galaxies(misp_object)
         if galaxies:
             tag_names = set()
+            galaxy_parsers = self._dispatch_table('galaxy_types_mapping', 'attribute')
             for galaxy_type, galaxy in galaxies.items():
-                to_call = self._mapping.galaxy_types_mapping[galaxy_type]
-                getattr(self, to_call.format('attribute'))(galaxy, indicator)
+                galaxy_parsers[galaxy_type](galaxy, indicator)
                 tag_names.update(self._quick_fetch_tag_names(galaxy))
             return tuple(tag for tag in tags if tag not in tag_names)
         return tuple(tags)
@@ -1362,7 +1392,7 @@ class MISPtoSTIX1EventsParser(MISPtoSTIX1Parser):
         )
         self._incident.add_leveraged_ttps(related_ttp)
         self._contextualised_data.add(misp_object['uuid'])
-        self._stix_package.add_ttp(ttp)
+        self._append_ttp(ttp)
 
     def _parse_asn_object(self, misp_object: dict) -> Observable:
         attributes = self._extract_multiple_object_attributes(
@@ -2146,17 +2176,15 @@ class MISPtoSTIX1EventsParser(MISPtoSTIX1Parser):
 
     def _create_indicator_from_object(self, misp_object: dict) -> Indicator:
         timestamp = self._datetime_from_timestamp(misp_object['timestamp'])
-        indicator = Indicator(timestamp=timestamp)
-        indicator.id_ = f"{self._orgname_id}:Indicator-{misp_object['uuid']}"
+        indicator = Indicator(
+            id_=f"{self._orgname_id}:Indicator-{misp_object['uuid']}",
+            timestamp=timestamp
+        )
         indicator.producer = self._producer
         indicator.title = f"{misp_object.get('meta-category')}: {misp_object['name']} (MISP Object)"
         if any(misp_object.get(feature) for feature in ('comment', 'description')):
             indicator.description = misp_object['comment'] if misp_object.get('comment') else misp_object['description']
-        indicator.confidence = Confidence(
-            value=self._mapping.confidence_value,
-            description=self._mapping.confidence_description,
-            timestamp=timestamp
-        )
+        indicator.confidence = self._create_confidence(timestamp)
         return indicator
 
     @staticmethod
@@ -2238,8 +2266,3 @@ class MISPtoSTIX1EventsParser(MISPtoSTIX1Parser):
         if not tag.startswith('tlp:'):
             return False
         return tag.startswith('tlp:') and ':'.join(tag.split(':')[1:]) in self._mapping.TLP_order
-
-    def _quick_fetch_ttp_timestamp(self, object_id: str) -> datetime:
-        for ttp in self._stix_package.ttps.ttp:
-            if ttp.id_ == object_id:
-                return ttp.timestamp
@@ -1,23 +1,29 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import json
-import os
 import re
+from .. import datetime_from_str
 from .exportparser import MISPtoSTIXParser
+from .galaxies_catalog import GalaxiesCatalog
 from collections import defaultdict
-from copy import deepcopy
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
 from stix2.properties import ListProperty, StringProperty
 from stix2.v20.bundle import Bundle as Bundle_v20
 from stix2.v21.bundle import Bundle as Bundle_v21
-from typing import Generator, Optional, Tuple, Union
+from stix2patterns.v21.object_validator import HASHES_REGEX
+from typing import Iterator, Optional, Tuple, Union
 
+# Attributes read at once from the attributes collections to be grouped by type
+_attributes_batch_size = 1000
+# Values with no other quote or backslash than escaped ones, as in the patterns string literals
+_escaped_pattern_value = re.compile(r"(?:[^'\\]|\\['\\])*")
 _label_fields = ('type', 'category', 'to_ids')
 _misp_time_fields = ('first_seen', 'last_seen')
 _object_attributes_additional_fields = ('category', 'comment', 'data', 'to_ids', 'uuid')
 _object_attributes_fields = ('type', 'object_relation', 'value')
+_pattern_quotes = '"\''
 _stix_time_fields = {
     'indicator': ('valid_from', 'valid_until'),
     'observed-data': ('first_observed', 'last_observed')
@@ -29,18 +35,19 @@ class MISPtoSTIX2Parser(MISPtoSTIXParser):
         super().__init__()
         self.__ids: dict = {}
         self.__interoperability = interoperability
-        self._results_handling_function = '_append_SDO'
+        self.__kill_chain_phases: dict = {}
+        self.__validated_pattern_templates: set = set()
+        self._results_handling_function = self._append_SDO
         self._id_parsing_function = {
-            'attribute': '_define_stix_object_id',
-            'object': '_define_stix_object_id'
+            'attribute': self._define_stix_object_id,
+            'object': self._define_stix_object_id
         }
 
-    def parse_json_content(self, filename: Union[Path, str]):
-        with open(filename, 'rt', encoding='utf-8') as f:
-            json_content = json.loads(f.read())
+    def parse_json_content(self, filename: Union[Path, str], incremental: bool = False):
+        json_content = self._load_json_content(filename, incremental)
         if json_content.get('response'):
             json_content = json_content['response']
-            if isinstance(json_content, list):
+            if not isinstance(json_content, dict):
                 self._events_parsing_init()
                 for event in json_content:
                     self._parse_misp_event(event)
@@ -51,14 +58,15 @@ class MISPtoSTIX2Parser(MISPtoSTIXParser):
             self.parse_misp_event(json_content)
 
     def parse_misp_attributes(self, attributes: dict):
-        self._results_handling_function = '_append_SDO_without_refs'
+        self._results_handling_function = self._append_SDO_without_refs
         if hasattr(self, '_identifier') and self._identifier != 'attributes collection':
             self.__ids = {}
         self._identifier = 'attributes collection'
         self._markings = {}
         self.__objects = []
         self.__relationships = []
-        self.__object_refs = []
+        self.__object_refs = {}
+        self.__target_refs = {}
         self.__identity_id = self._mapping.misp_identity_args['id']
         if self.__identity_id not in self.unique_ids:
             identity = self._create_identity(self._mapping.misp_identity_args)
@@ -68,8 +76,11 @@ class MISPtoSTIX2Parser(MISPtoSTIXParser):
             if 'Galaxy' in attributes:
                 self._parse_event_galaxies(attributes['Galaxy'])
             attributes = attributes['Attribute']
-        for attribute in attributes:
-            self._resolve_attribute(attribute)
+        attributes = iter(attributes)
+        batch = list(islice(attributes, _attributes_batch_size))
+        while batch:
+            self._parse_attributes_batch(batch)
+            batch = list(islice(attributes, _attributes_batch_size))
         if self._markings:
             for marking in self._markings.values():
                 self.__objects.append(marking)
@@ -86,7 +97,8 @@ class MISPtoSTIX2Parser(MISPtoSTIXParser):
         self._misp_event = misp_event
         self._identifier = self._misp_event['uuid']
         self._markings = {}
-        self.__object_refs = []
+        self.__object_refs = {}
+        self.__target_refs = {}
         self.__relationships = []
         self._set_identity()
         self._parse_event_data()
@@ -118,7 +130,7 @@ class MISPtoSTIX2Parser(MISPtoSTIXParser):
 
     @property
     def object_refs(self) -> list:
-        return self.__object_refs
+        return list(self.__object_refs)
 
     def populate_unique_ids(self, unique_ids: dict):
         self.__ids.update(unique_ids)
@@ -137,7 +149,12 @@ class MISPtoSTIX2Parser(MISPtoSTIXParser):
 
     def _append_SDO(self, stix_object):
         self.__objects.append(stix_object)
-        self.__object_refs.append(stix_object.id)
+        self._append_object_ref(stix_object.id)
+
+    def _append_object_ref(self, object_ref: str):
+        if object_ref not in self.__object_refs:
+            self.__object_refs[object_ref] = None
+            self.__target_refs.setdefault(object_ref.split('--')[1], object_ref)
 
     def _append_SDO_without_refs(self, stix_object):
         self.__objects.append(stix_object)
@@ -173,7 +190,7 @@ class MISPtoSTIX2Parser(MISPtoSTIXParser):
                     'id': report_id,
                     'type': 'report',
                     'published': published,
-                    'object_refs': self.__object_refs,
+                    'object_refs': self.object_refs,
                     'allow_custom': True
                 }
             )
@@ -181,36 +198,7 @@ class MISPtoSTIX2Parser(MISPtoSTIXParser):
         return self._handle_unpublished_report(report_args)
 
     def _generate_galaxies_catalog(self):
-        current_path = Path(os.path.dirname(os.path.realpath(__file__)))
-        cti_path = current_path.parent / 'data' / 'cti'
-        self._galaxies_catalog = defaultdict(lambda: defaultdict(list))
-        self._identities = {}
-        for filename in cti_path.glob('*/*.json'):
-            with open(filename, 'rt', encoding='utf-8') as f:
-                bundle = json.loads(f.read())
-            for stix_object in bundle['objects']:
-                if stix_object['type'] == 'identity':
-                    object_id = stix_object['id']
-                    if object_id not in self.unique_ids or object_id not in self._identities:
-                        self._identities[object_id] = stix_object
-                    continue
-                if not stix_object.get('name'):
-                    continue
-                name = stix_object['name']
-                object_type = stix_object['type']
-                object_id = stix_object['id']
-                if object_id not in self._get_object_ids(name, object_type):
-                    self._galaxies_catalog[name][object_type].append(stix_object)
-                if stix_object.get('external_references'):
-                    for reference in stix_object['external_references']:
-                        if reference['source_name'] in self._mapping.source_names:
-                            external_id = reference['external_id']
-                            if object_id not in self._get_object_ids(external_id, object_type):
-                                self._galaxies_catalog[external_id][object_type].append(stix_object)
-                            break
-
-    def _get_object_ids(self, name: str, object_type: str) -> Generator[None, None, str]:
-        return (stix_object['id'] for stix_object in self._galaxies_catalog[name][object_type])
+        self._galaxies_catalog = GalaxiesCatalog.load(self._mapping.source_names)
 
     def _handle_markings(self, object_args: dict, markings: tuple):
         marking_ids = []
@@ -219,10 +207,10 @@ class MISPtoSTIX2Parser(MISPtoSTIXParser):
                 marking_ids.append(self._markings[marking]['id'])
                 continue
             if self._is_tlp_tag(marking):
-                marking_definition = deepcopy(self._mapping.tlp_markings[marking])
-                marking_id = marking_definition.id
+                # The TLP marking definitions are immutable, so the shared mapping instances are used
+                marking_id = self._mapping.tlp_marking_ids[marking]
                 if marking_id not in self.unique_ids:
-                    self._markings[marking] = marking_definition
+                    self._markings[marking] = self._mapping.tlp_markings[marking]
                     self.__ids[marking_id] = marking_id
                 marking_ids.append(marking_id)
                 continue
@@ -265,7 +253,7 @@ class MISPtoSTIX2Parser(MISPtoSTIXParser):
                     ]
                 if sighting.get('source', ''):
                     sighting_args['description'] = sighting['source']
-                getattr(self, self._results_handling_function)(self._create_sighting(sighting_args))
+                self._results_handling_function(self._create_sighting(sighting_args))
             elif sighting_type == '1':
                 self._handle_opinion_object(sighting, reference_id)
 
@@ -281,28 +269,86 @@ class MISPtoSTIX2Parser(MISPtoSTIXParser):
 
     def _resolve_attribute(self, attribute: dict):
         attribute_type = attribute['type']
+        attribute_parsers = self._dispatch_table('attribute_types_mapping')
         try:
-            if attribute_type in self._mapping.attribute_types_mapping:
-                getattr(self, self._mapping.attribute_types_mapping[attribute_type])(attribute)
+            if attribute_type in attribute_parsers:
+                attribute_parsers[attribute_type](attribute)
             else:
                 self._parse_custom_attribute(attribute)
                 self._attribute_not_mapped_warning(attribute_type)
         except Exception as exception:
             self._attribute_error(attribute, exception)
 
+    def _parse_attributes_batch(self, attributes: list):
+        # The patterns, labels and kill chain phases are built once per type and
+        # category, then the attributes are converted in their input order
+        values = defaultdict(dict)
+        for index, attribute in enumerate(attributes):
+            if attribute.get('to_ids') is True and all(isinstance(attribute.get(feature), str) for feature in ('category', 'value')):
+                values[attribute['type']][index] = attribute['value']
+        pattern_parsers = self._dispatch_table('attribute_batch_patterns_mapping')
+        indicators = {}
+        for attribute_type, type_values in values.items():
+            if attribute_type not in pattern_parsers:
+                continue
+            shared_args = {}
+            for index, template, value in pattern_parsers[attribute_type](attribute_type, type_values):
+                attribute = attributes[index]
+                category = attribute['category']
+                if category not in shared_args:
+                    shared_args[category] = (
+                        self._create_labels(attribute),
+                        self._create_killchain(category)
+                    )
+                indicators[index] = (template, value, *shared_args[category])
+        for index, attribute in enumerate(attributes):
+            if index in indicators:
+                self._handle_attribute_batch_indicator(attribute, *indicators[index])
+            else:
+                self._resolve_attribute(attribute)
+
+    def _handle_attribute_batch_indicator(self, attribute: dict, template: str, value: str, labels: list, kill_chain_phases: list):
+        # The patterns of a validated template only differ by their escaped value
+        validated_pattern = (
+            template in self.__validated_pattern_templates and
+            _escaped_pattern_value.fullmatch(value) is not None
+        )
+        indicator_args = {
+            'labels': labels[:],
+            'kill_chain_phases': kill_chain_phases
+        }
+        try:
+            self._handle_attribute_indicator_arguments(
+                attribute,
+                template.format(value),
+                indicator_args,
+                validated_pattern
+            )
+        except Exception as exception:
+            self._attribute_error(attribute, exception)
+        else:
+            self.__validated_pattern_templates.add(template)
+
     def _handle_attribute_indicator(self, attribute: dict, pattern: str, indicator_args: Optional[dict] = None):
-        indicator_id = getattr(self, self._id_parsing_function['attribute'])('indicator', attribute)
         indicator_arguments = {
-            'id': indicator_id,
-            'type': 'indicator',
             'labels': self._create_labels(attribute),
-            'kill_chain_phases': self._create_killchain(attribute['category']),
-            'created_by_ref': self.__identity_id,
-            'interoperability': True
+            'kill_chain_phases': self._create_killchain(attribute['category'])
         }
         if indicator_args is not None:
             indicator_arguments.update(indicator_args)
-        indicator_arguments['pattern'] = pattern
+        self._handle_attribute_indicator_arguments(attribute, pattern, indicator_arguments)
+
+    def _handle_attribute_indicator_arguments(self, attribute: dict, pattern: str, indicator_arguments: dict, validated_pattern: bool = False):
+        indicator_id = self._id_parsing_function['attribute']('indicator', attribute)
+        indicator_arguments.update(
+            {
+                'id': indicator_id,
+                'type': 'indicator',
+                'created_by_ref': self.__identity_id,
+                'interoperability': True,
+                'pattern': pattern
+            }
+        )
         indicator_arguments.update(self._handle_indicator_time_fields(attribute))
         if attribute.get('comment'):
             indicator_arguments['description'] = attribute['comment']
@@ -313,12 +359,13 @@ class MISPtoSTIX2Parser(MISPtoSTIXParser):
         )
         if markings:
             self._handle_markings(indicator_arguments, markings)
-        getattr(self, self._results_handling_function)(self._create_indicator(indicator_arguments))
+        indicator = self._create_indicator(indicator_arguments, validated_pattern)
+        self._results_handling_function(indicator)
         if attribute.get('Sighting'):
             self._handle_sightings(attribute['Sighting'], indicator_id)
 
     def _handle_attribute_observable(self, attribute: dict, observable: Union[dict, list]):
-        observable_id = getattr(self, self._id_parsing_function['attribute'])('observed-data', attribute)
+        observable_id = self._id_parsing_function['attribute']('observed-data', attribute)
         observable_args = {
             'id': observable_id,
             'type': 'observed-data',
@@ -343,11 +390,11 @@ class MISPtoSTIX2Parser(MISPtoSTIXParser):
     def _handle_attribute_tags_and_galaxies(self, attribute: dict, object_id: str, timestamp: datetime) -> tuple:
         if attribute.get('Galaxy'):
             tag_names: list = []
+            galaxy_parsers = self._dispatch_table('galaxy_types_mapping', 'attribute')
             for galaxy in attribute['Galaxy']:
                 galaxy_type = galaxy['type']
-                if galaxy_type in self._mapping.galaxy_types_mapping:
-                    to_call = self._mapping.galaxy_types_mapping[galaxy_type]
-                    getattr(self, to_call.format('attribute'))(galaxy, object_id, timestamp)
+                if galaxy_type in galaxy_parsers:
+                    galaxy_parsers[galaxy_type](galaxy, object_id, timestamp)
                     tag_names.extend(self._quick_fetch_tag_names(galaxy))
                 else:
                     self._attribute_galaxy_not_mapped_warning(galaxy_type, attribute['type'])
@@ -382,7 +429,7 @@ class MISPtoSTIX2Parser(MISPtoSTIXParser):
             self._parse_autonomous_system_attribute_observable(attribute)
 
     def _parse_campaign_name_attribute(self, attribute: dict):
-        campaign_id = getattr(self, self._id_parsing_function['attribute'])('campaign', attribute)
+        campaign_id = self._id_parsing_function['attribute']('campaign', attribute)
         timestamp = self._datetime_from_timestamp(attribute['timestamp'])
         campaign_args = {
             'id': campaign_id,
@@ -401,12 +448,12 @@ class MISPtoSTIX2Parser(MISPtoSTIXParser):
         )
         if markings:
             self._handle_markings(campaign_args, markings)
-        getattr(self, self._results_handling_function)(self._create_campaign(campaign_args))
+        self._results_handling_function(self._create_campaign(campaign_args))
         if attribute.get('Sighting'):
             self._handle_sightings(attribute['Sighting'], campaign_id)
 
     def _parse_custom_attribute(self, attribute: dict):
-        custom_id = getattr(self, self._id_parsing_function['attribute'])('x-misp-attribute', attribute)
+        custom_id = self._id_parsing_function['attribute']('x-misp-attribute', attribute)
         timestamp = self._datetime_from_timestamp(attribute['timestamp'])
         custom_args = {
             'id': custom_id,
@@ -428,7 +475,7 @@ class MISPtoSTIX2Parser(MISPtoSTIXParser):
         )
         if markings:
             self._handle_markings(custom_args, markings)
-        getattr(self, self._results_handling_function)(self._create_custom_attribute(custom_args))
+        self._results_handling_function(self._create_custom_attribute(custom_args))
         if attribute.get('Sighting'):
             self._handle_sightings(attribute['Sighting'], custom_id)
 
@@ -678,7 +725,7 @@ class MISPtoSTIX2Parser(MISPtoSTIXParser):
             self._parse_custom_attribute(attribute)
 
     def _parse_vulnerability_attribute(self, attribute: dict):
-        vulnerability_id = getattr(self, self._id_parsing_function['attribute'])('vulnerability', attribute)
+        vulnerability_id = self._id_parsing_function['attribute']('vulnerability', attribute)
         timestamp = self._datetime_from_timestamp(attribute['timestamp'])
         vulnerability_args = {
             'id': vulnerability_id,
@@ -698,7 +745,7 @@ class MISPtoSTIX2Parser(MISPtoSTIXParser):
         )
         if markings:
             self._handle_markings(vulnerability_args, markings)
-        getattr(self, self._results_handling_function)(self._create_vulnerability(vulnerability_args))
+        self._results_handling_function(self._create_vulnerability(vulnerability_args))
         if attribute.get('Sighting'):
             self._handle_sightings(attribute['Sighting'], vulnerability_id)
 
@@ -716,11 +763,12 @@ class MISPtoSTIX2Parser(MISPtoSTIXParser):
     ################################################################################
 
     def _resolve_objects(self):
+        object_parsers = self._dispatch_table('objects_mapping')
         for misp_object in self._misp_event['Object']:
             try:
                 object_name = misp_object['name']
-                if object_name in self._mapping.objects_mapping:
-                    getattr(self, self._mapping.objects_mapping[object_name])(misp_object)
+                if object_name in object_parsers:
+                    object_parsers[object_name](misp_object)
                 else:
                     self._parse_custom_object(misp_object)
                     self._object_not_mapped_warning(object_name)
@@ -761,7 +809,7 @@ class MISPtoSTIX2Parser(MISPtoSTIXParser):
         return {attribute['object_relation']: self._handle_value_for_pattern(attribute['value']) for attribute in attributes}
 
     def _handle_non_indicator_object(self, misp_object: dict, object_args: dict, object_type: str, killchain: bool = False):
-        object_id = getattr(self, self._id_parsing_function['object'])(object_type, misp_object)
+        object_id = self._id_parsing_function['object'](object_type, misp_object)
         timestamp = self._datetime_from_timestamp(misp_object['timestamp'])
         object_args.update(
             {
@@ -795,7 +843,7 @@ class MISPtoSTIX2Parser(MISPtoSTIXParser):
         self._append_SDO(getattr(self, f"_create_{object_type.replace('-', '_')}")(object_args))
 
     def _handle_object_indicator(self, misp_object: dict, pattern: list):
-        indicator_id = getattr(self, self._id_parsing_function['object'])('indicator', misp_object)
+        indicator_id = self._id_parsing_function['object']('indicator', misp_object)
         indicator_args = {
             'id': indicator_id,
             'type': 'indicator',
@@ -825,7 +873,7 @@ class MISPtoSTIX2Parser(MISPtoSTIXParser):
         self._append_SDO(self._create_indicator(indicator_args))
 
     def _handle_object_observable(self, misp_object: dict, observable: Union[dict, list]):
-        observable_id = getattr(self, self._id_parsing_function['object'])('observed-data', misp_object)
+        observable_id = self._id_parsing_function['object']('observed-data', misp_object)
         observable_args = {
             'id': observable_id,
             'type': 'observed-data',
@@ -855,10 +903,10 @@ class MISPtoSTIX2Parser(MISPtoSTIXParser):
         tags, galaxies = self._extract_object_attribute_tags_and_galaxies(misp_object)
         if galaxies:
             tag_names = set()
+            galaxy_parsers = self._dispatch_table('galaxy_types_mapping', 'attribute')
             for galaxy_type, galaxy in galaxies.items():
-                if galaxy_type in self._mapping.galaxy_types_mapping:
-                    to_call = self._mapping.galaxy_types_mapping[galaxy_type]
-                    getattr(self, to_call.format('attribute'))(galaxy, object_id, timestamp)
+                if galaxy_type in galaxy_parsers:
+                    galaxy_parsers[galaxy_type](galaxy, object_id, timestamp)
                     tag_names.update(self._quick_fetch_tag_names(galaxy))
                 else:
                     self._object_galaxy_not_mapped_warning(galaxy_type, misp_object['name'])
@@ -1091,7 +1139,7 @@ class MISPtoSTIX2Parser(MISPtoSTIXParser):
         }
 
     def _parse_custom_object(self, misp_object: dict):
-        custom_id = getattr(self, self._id_parsing_function['object'])('x-misp-object', misp_object)
+        custom_id = self._id_parsing_function['object']('x-misp-object', misp_object)
         timestamp = self._datetime_from_timestamp(misp_object['timestamp'])
         custom_args = {
             'id': custom_id,
@@ -1884,43 +1932,25 @@ class MISPtoSTIX2Parser(MISPtoSTIXParser):
     #                          GALAXIES PARSING FUNCTIONS                          #
     ################################################################################
 
-    def _check_external_references(self, references: list, values: list, feature: str) -> bool:
-        for reference in references:
-            if reference['source_name'] in self._mapping.source_names and reference[feature] in values:
-                return True
-        return False
-
-    def _check_galaxy_matching(self, cluster: dict, *args: Tuple[str, str]) -> Union[str, None]:
-        if self._check_galaxy_name(*args):
-            return self._fetch_galaxy_matching_by_name(cluster, *args)
-        if cluster.get('meta') is not None:
+    def _check_galaxy_matching(self, cluster: dict, name: str, object_type: str) -> Union[str, None]:
+        stix_object = self._galaxies_catalog.match_by_name(name, object_type)
+        if stix_object is None and cluster.get('meta') is not None:
             meta = cluster['meta']
             key = 'external_id'
             for key, feature in zip((key, 'refs'), (key, 'url')):
                 if meta.get(key) is None:
                     continue
-                if self._check_galaxy_references(meta[key], feature, *args):
-                    return self._fetch_galaxy_matching_by_reference(
-                        meta[key],
-                        feature,
-                        *args
-                    )
-
-    def _check_galaxy_name(self, name: str, object_type: str) -> bool:
-        names = 0
-        for stix_object in self._galaxies_catalog[name][object_type]:
-            if stix_object['name'] == name:
-                names += 1
-        return names == 1
-
-    def _check_galaxy_references(self, values: str, feature: str, name: str, object_type: str) -> bool:
-        numbers = 0
-        for stix_object in self._galaxies_catalog[name][object_type]:
-            if stix_object['name'] != name or not stix_object.get('external_references'):
-                continue
-            if self._check_external_references(stix_object['external_references'], values, feature):
-                numbers += 1
-        return numbers == 1
+                stix_object = self._galaxies_catalog.match_by_references(
+                    name,
+                    object_type,
+                    feature,
+                    meta[key]
+                )
+                if stix_object is not None:
+                    break
+        if stix_object is not None:
+            self._handle_galaxy_matching(object_type, stix_object)
+            return stix_object['id']
 
     def _define_source_name(self, value: str) -> str:
         for prefix, source_name in self._mapping.external_id_to_source_name.items():
@@ -1932,20 +1962,6 @@ class MISPtoSTIX2Parser(MISPtoSTIXParser):
             return 'WASC'
         return 'mitre-attack'
 
-    def _fetch_galaxy_matching_by_name(self, cluster: dict, name: str, object_type: str) -> Union[str, None]:
-        for stix_object in self._galaxies_catalog[name][object_type]:
-            if stix_object['name'] == name:
-                self._handle_galaxy_matching(object_type, stix_object)
-                return stix_object['id']
-
-    def _fetch_galaxy_matching_by_reference(self, values: list, feature: str, name: str, object_type: str) -> Union[str, None]:
-        for stix_object in self._galaxies_catalog[name][object_type]:
-            if stix_object['name'] != name or not stix_object.get('external_references'):
-                continue
-            if self._check_external_references(stix_object['external_references'], values, feature):
-                self._handle_galaxy_matching(object_type, stix_object)
-                return stix_object['id']
-
     def _handle_attribute_galaxy_relationships(self, source_id: str, target_ids: list, timestamp: datetime):
         source_type = source_id.split('--')[0]
         if source_type not in self._mapping.relationship_specs:
@@ -1978,7 +1994,7 @@ class MISPtoSTIX2Parser(MISPtoSTIXParser):
     def _handle_galaxy_matching(self, object_type: str, stix_object: dict):
         identity_id = stix_object['created_by_ref']
         if identity_id not in self.unique_ids:
-            identity = self._create_identity(self._identities[identity_id])
+            identity = self._create_identity(self._galaxies_catalog.identity(identity_id))
             self.__objects.insert(0, identity)
             self.__index += 1
             self.__ids[identity_id] = identity_id
@@ -1987,8 +2003,7 @@ class MISPtoSTIX2Parser(MISPtoSTIXParser):
 
     def _handle_object_refs(self, object_refs: list):
         for object_ref in object_refs:
-            if object_ref not in self.__object_refs:
-                self.__object_refs.append(object_ref)
+            self._append_object_ref(object_ref)
 
     def _is_galaxy_parsed(self, object_refs: list, cluster: dict) -> bool:
         object_id = cluster['uuid']
@@ -2318,15 +2333,17 @@ class MISPtoSTIX2Parser(MISPtoSTIXParser):
             labels.append(cluster['tag_name'])
         return labels
 
-    @staticmethod
-    def _create_killchain(category: str) -> list:
-        kill_chain = [
-            {
-                'kill_chain_name': 'misp-category',
-                'phase_name': category
-            }
-        ]
-        return kill_chain
+    def _create_killchain(self, category: str) -> list:
+        # Kill chain phases are immutable, so the objects of a same category share them
+        if category not in self.__kill_chain_phases:
+            kill_chain_phase = self._create_kill_chain_phase(
+                {
+                    'kill_chain_name': 'misp-category',
+                    'phase_name': category
+                }
+            )
+            self.__kill_chain_phases[category] = kill_chain_phase
+        return [self.__kill_chain_phases[category]]
 
     @staticmethod
     def _create_labels(attribute: dict) -> list:
@@ -2374,7 +2391,7 @@ class MISPtoSTIX2Parser(MISPtoSTIXParser):
         return contact_information
 
     def _parse_identity_args(self, misp_object: dict, identity_class: str) -> dict:
-        identity_id = getattr(self, self._id_parsing_function['object'])('identity', misp_object)
+        identity_id = self._id_parsing_function['object']('identity', misp_object)
         timestamp = self._datetime_from_timestamp(misp_object['timestamp'])
         identity_args = {
             'id': identity_id,
@@ -2746,7 +2763,7 @@ class MISPtoSTIX2Parser(MISPtoSTIXParser):
         return f"file:name = '{name}'"
 
     def _create_hash_pattern(self, hash_type: str, value: str, prefix: Optional[str]='file:hashes') -> str:
-        value = value.strip('"').strip("'").strip('\\')
+        value = self._sanitize_hash_value(value)
         return f"{prefix}.{self._define_hash_type(hash_type)} = '{value}'"
 
     def _create_ip_pattern(self, ip_type: str, value: str) -> str:
@@ -2763,6 +2780,50 @@ class MISPtoSTIX2Parser(MISPtoSTIXParser):
     def _create_regkey_pattern(key: str) -> str:
         return f"windows-registry-key:key = '{key}'"
 
+    ################################################################################
+    #                      BATCH PATTERNS CREATION FUNCTIONS.                      #
+    ################################################################################
+
+    def _create_domain_batch_patterns(self, attribute_type: str, values: dict) -> Iterator[tuple]:
+        template = f"[{self._create_domain_pattern('{}')}]"
+        for index, value in values.items():
+            yield index, template, self._handle_value_for_pattern(value)
+
+    def _create_filename_batch_patterns(self, attribute_type: str, values: dict) -> Iterator[tuple]:
+        template = f"[{self._create_filename_pattern('{}')}]"
+        for index, value in values.items():
+            yield index, template, self._handle_value_for_pattern(value)
+
+    def _create_hash_batch_patterns(self, attribute_type: str, values: dict) -> Iterator[tuple]:
+        hash_type = self._define_hash_type(attribute_type)
+        template = f"[file:hashes.{hash_type} = '{{}}']"
+        # The hash values not matching their type are left to the full pattern validation
+        hash_regex = HASHES_REGEX.get(hash_type)
+        for index, value in values.items():
+            value = self._sanitize_hash_value(value)
+            if hash_regex is None or re.match(hash_regex[0], value):
+                yield index, template, value
+
+    def _create_ip_batch_patterns(self, attribute_type: str, values: dict) -> Iterator[tuple]:
+        ip_type = attribute_type.split('-')[1]
+        templates = {
+            address_type: f"[network-traffic:{ip_type}_ref.type = '{address_type}' AND network-traffic:{ip_type}_ref.value = '{{}}']"
+            for address_type in ('ipv4-addr', 'ipv6-addr')
+        }
+        for index, value in values.items():
+            value = self._handle_value_for_pattern(value)
+            yield index, templates[self._define_address_type(value)], value
+
+    def _create_mutex_batch_patterns(self, attribute_type: str, values: dict) -> Iterator[tuple]:
+        template = "[mutex:name = '{}']"
+        for index, value in values.items():
+            yield index, template, self._handle_value_for_pattern(value)
+
+    def _create_url_batch_patterns(self, attribute_type: str, values: dict) -> Iterator[tuple]:
+        template = "[url:value = '{}']"
+        for index, value in values.items():
+            yield index, template, self._handle_value_for_pattern(value)
+
     ################################################################################
     #                              UTILITY FUNCTIONS.                              #
     ################################################################################
@@ -2777,10 +2838,7 @@ class MISPtoSTIX2Parser(MISPtoSTIXParser):
 
     @staticmethod
     def _datetime_from_str(timestamp: str) -> datetime:
-        regex = '%Y-%m-%dT%H:%M:%S'
-        if '.' in timestamp:
-            regex = f'{regex}.%f'
-        return datetime.strptime(timestamp.split('+')[0], regex)
+        return datetime_from_str(timestamp)
 
     @staticmethod
     def _define_address_type(address):
@@ -2819,9 +2877,7 @@ class MISPtoSTIX2Parser(MISPtoSTIXParser):
         return uuids
 
     def _find_target_uuid(self, reference: str) -> Union[str, None]:
-        for object_ref in self.__object_refs:
-            if reference in object_ref:
-                return object_ref
+        return self.__target_refs.get(reference)
 
     @staticmethod
     def _get_matching_email_display_name(display_names: list, address: str) -> Optional[int]:
@@ -2894,12 +2950,15 @@ class MISPtoSTIX2Parser(MISPtoSTIXParser):
     def _handle_value_for_pattern(self, attribute_value: str) -> str:
         #return attribute_value.replace("'", '##APOSTROPHE##').replace('"', '##QUOTE##')
         sanitized = self._sanitize_registry_key_value(attribute_value)
-        return sanitized.replace("'", "\\'").replace('"', '\\\\"')
+        # Most values have no character to escape, so each replace pass is only run when needed
+        if "'" in sanitized:
+            sanitized = sanitized.replace("'", "\\'")
+        if '"' in sanitized:
+            sanitized = sanitized.replace('"', '\\\\"')
+        return sanitized
 
     def _is_tlp_tag(self, tag: str) -> bool:
-        if not tag.startswith('tlp:'):
-            return False
-        return tag in self._mapping.tlp_markings
+        return tag in self._mapping.tlp_marking_ids
 
     @staticmethod
     def _parse_custom_data_value(value_to_parse: Union[str, tuple]) -> Union[dict, str]:
@@ -2967,20 +3026,21 @@ class MISPtoSTIX2Parser(MISPtoSTIXParser):
             self.__relationships.append(relationship)
 
     def _sanitize_registry_key_value(self, value: str) -> str:
-        sanitized = self._sanitize_value(value.strip()).replace('\\', '\\\\')
+        sanitized = self._sanitize_value(value.strip())
+        if '\\' in sanitized:
+            sanitized = sanitized.replace('\\', '\\\\')
+        # Once the backslashes are doubled, a percent sign preceded by one is always preceded by two
         if '%' not in sanitized or '\\\\%' in sanitized:
             return sanitized
-        if '\\%' in sanitized:
-            return sanitized.replace('\\%', '\\\\%')
         return sanitized.replace('%', '\\\\%')
 
-    def _sanitize_value(self, value: str) -> str:
-        for character in ('"', "'"):
-            if value.startswith(character):
-                return self._sanitize_value(value[1:])
-            if value.endswith(character):
-                return self._sanitize_value(value[:-1])
-        return value
+    @staticmethod
+    def _sanitize_hash_value(value: str) -> str:
+        return value.strip('"').strip("'").strip('\\')
+
+    @staticmethod
+    def _sanitize_value(value: str) -> str:
+        return value.strip(_pattern_quotes)
 
     def _select_pe_object(self, pe_uuid: str) -> dict:
         to_ids, pe_object = self._objects_to_parse['pe'][pe_uuid]
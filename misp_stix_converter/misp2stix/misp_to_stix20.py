@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+from .. import shared_mapping
 from .misp_to_stix2 import MISPtoSTIX2Parser
 from .stix20_mapping import Stix20Mapping
 from collections import defaultdict
@@ -8,6 +9,7 @@ from datetime import datetime
 from stix2.properties import (DictionaryProperty, IDProperty, ListProperty,
                               ReferenceProperty, StringProperty, TimestampProperty)
 from stix2.v20.bundle import Bundle
+from stix2.v20.common import KillChainPhase
 from stix2.v20.observables import (Artifact, AutonomousSystem, Directory, DomainName,
     EmailAddress, EmailMessage, EmailMIMEComponent, File, IPv4Address, IPv6Address,
     MACAddress, Mutex, NetworkTraffic, Process, Software, URL, UserAccount,
@@ -93,11 +95,17 @@ class CustomOpinion:
     pass
 
 
+class ValidatedPatternIndicator(Indicator):
+    # The pattern was built from a template already validated with an escaped value
+    def _check_object_constraints(self):
+        pass
+
+
 class MISPtoSTIX20Parser(MISPtoSTIX2Parser):
     def __init__(self, interoperability=False):
         super().__init__(interoperability)
         self._version = '2.0'
-        self._mapping = Stix20Mapping()
+        self._mapping = shared_mapping(Stix20Mapping)
 
     def _parse_event_data(self):
         if self._misp_event.get('Attribute'):
@@ -148,7 +156,7 @@ class MISPtoSTIX20Parser(MISPtoSTIX2Parser):
             )
         if sighting.get('source', ''):
             opinion_args['x-misp-source'] = sighting['source']
-        getattr(self, self._results_handling_function)(CustomOpinion(**opinion_args))
+        self._results_handling_function(CustomOpinion(**opinion_args))
 
     def _handle_unpublished_report(self, report_args: dict) -> Report:
         report_id = f"report--{self._misp_event['uuid']}"
@@ -954,13 +962,19 @@ class MISPtoSTIX20Parser(MISPtoSTIX2Parser):
         return Identity(**identity_args)
 
     @staticmethod
-    def _create_indicator(indicator_args: dict) -> Indicator:
+    def _create_indicator(indicator_args: dict, validated_pattern: bool = False) -> Indicator:
+        if validated_pattern:
+            return ValidatedPatternIndicator(**indicator_args)
         return Indicator(**indicator_args)
 
     @staticmethod
     def _create_intrusion_set(intrusion_set_args: dict) -> IntrusionSet:
         return IntrusionSet(**intrusion_set_args)
 
+    @staticmethod
+    def _create_kill_chain_phase(kill_chain_args: dict) -> KillChainPhase:
+        return KillChainPhase(**kill_chain_args)
+
     def _create_malware(self, malware_args: dict, cluster: Optional[dict]=None) -> Malware:
         if cluster is not None:
             malware_args['kill_chain_phases'] = self._create_killchain(cluster['type'])
@@ -968,7 +982,7 @@ class MISPtoSTIX20Parser(MISPtoSTIX2Parser):
 
     def _create_observed_data(self, args: dict, observable: dict):
         args['objects'] = observable
-        getattr(self, self._results_handling_function)(ObservedData(**args))
+        self._results_handling_function(ObservedData(**args))
 
     @staticmethod
     def _create_PE_extension(extension_args: dict) -> WindowsPEBinaryExt:
@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 
 import re
+from .. import shared_mapping
 from .misp_to_stix2 import MISPtoSTIX2Parser
 from .stix21_mapping import Stix21Mapping
 from collections import defaultdict
@@ -9,6 +10,7 @@ from datetime import datetime
 from stix2.properties import (DictionaryProperty, IDProperty, ListProperty,
                               ReferenceProperty, StringProperty, TimestampProperty)
 from stix2.v21.bundle import Bundle
+from stix2.v21.common import KillChainPhase
 from stix2.v21.observables import (Artifact, AutonomousSystem, Directory, DomainName,
     EmailAddress, EmailMessage, EmailMIMEComponent, File, IPv4Address, IPv6Address,
     MACAddress, Mutex, NetworkTraffic, Process, Software, URL, UserAccount,
@@ -60,17 +62,27 @@ class CustomMispObject():
     pass
 
 
+class ValidatedPatternIndicator(Indicator):
+    # The pattern was built from a template already validated with an escaped value
+    def _check_object_constraints(self):
+        super(Indicator, self)._check_object_constraints()
+        valid_from = self.get('valid_from')
+        valid_until = self.get('valid_until')
+        if valid_from and valid_until and valid_until <= valid_from:
+            raise ValueError(f"{self.id} 'valid_until' must be greater than 'valid_from'")
+
+
 class MISPtoSTIX21Parser(MISPtoSTIX2Parser):
     def __init__(self, interoperability=False):
         super().__init__(interoperability)
         self._version = '2.1'
-        self._mapping = Stix21Mapping()
+        self._mapping = shared_mapping(Stix21Mapping)
 
     def _parse_event_data(self):
         if self._misp_event.get('EventReport'):
             self._id_parsing_function = {
-                'attribute': '_define_stix_object_id_from_attribute',
-                'object': '_define_stix_object_id_from_object'
+                'attribute': self._define_stix_object_id_from_attribute,
+                'object': self._define_stix_object_id_from_object
             }
             self._event_report_matching = defaultdict(list)
             self._handle_attributes_and_objects()
@@ -163,7 +175,7 @@ class MISPtoSTIX21Parser(MISPtoSTIX2Parser):
                     'allow_custom': True
                 }
             )
-        getattr(self, self._results_handling_function)(Opinion(**opinion_args))
+        self._results_handling_function(Opinion(**opinion_args))
 
     def _handle_unpublished_report(self, report_args: dict) -> Grouping:
         grouping_id = f"grouping--{self._misp_event['uuid']}"
@@ -550,7 +562,7 @@ class MISPtoSTIX21Parser(MISPtoSTIX2Parser):
         objects.insert(0, self._create_file_object(args))
 
     def _handle_patterning_object_indicator(self, misp_object: dict, indicator_args: dict):
-        indicator_id = getattr(self, self._id_parsing_function['object'])('indicator', misp_object)
+        indicator_id = self._id_parsing_function['object']('indicator', misp_object)
         indicator_args.update(
             {
                 'id': indicator_id,
@@ -580,32 +592,31 @@ class MISPtoSTIX21Parser(MISPtoSTIX2Parser):
 
     def _parse_account_object_observable(self, misp_object: dict, account_type: str):
         account_args = self._parse_account_args(misp_object['Attribute'], account_type)
-        account_args['id'] = getattr(self, self._id_parsing_function['object'])('user-account', misp_object)
+        account_args['id'] = self._id_parsing_function['object']('user-account', misp_object)
         account_object = UserAccount(**account_args)
         self._handle_object_observable(misp_object, [account_object])
 
     def _parse_account_object_with_attachment_observable(self, misp_object: dict, account_type: str):
         account_args = self._parse_account_with_attachment_args(misp_object['Attribute'], account_type)
-        account_args['id'] = getattr(self, self._id_parsing_function['object'])('user-account', misp_object)
+        account_args['id'] = self._id_parsing_function['object']('user-account', misp_object)
         account_object = UserAccount(**account_args)
         self._handle_object_observable(misp_object, [account_object])
 
     def _parse_android_app_object_observable(self, misp_object: dict):
         software_args = self._parse_android_app_args(misp_object['Attribute'])
-        software_args['id'] = getattr(self, self._id_parsing_function['object'])('software', misp_object)
+        software_args['id'] = self._id_parsing_function['object']('software', misp_object)
         software_object = Software(**software_args)
         self._handle_object_observable(misp_object, [software_object])
 
     def _parse_annotation_object(self, to_ids: bool, misp_object: dict):
         object_refs = []
         for reference in misp_object['ObjectReference']:
-            for object_ref in self.object_refs:
-                if reference['referenced_uuid'] in object_ref:
-                    object_refs.append(object_ref)
-                    break
+            object_ref = self._find_target_uuid(reference['referenced_uuid'])
+            if object_ref is not None:
+                object_refs.append(object_ref)
         if not object_refs:
             return self._parse_custom_object(misp_object)
-        note_id = getattr(self, self._id_parsing_function['object'])('note', misp_object)
+        note_id = self._id_parsing_function['object']('note', misp_object)
         timestamp = self._datetime_from_timestamp(misp_object['timestamp'])
         note_args = {
             'id': note_id,
@@ -642,24 +653,24 @@ class MISPtoSTIX21Parser(MISPtoSTIX2Parser):
 
     def _parse_asn_object_observable(self, misp_object: dict):
         as_args = self._parse_AS_args(misp_object['Attribute'])
-        as_args['id'] = getattr(self, self._id_parsing_function['object'])('autonomous-system', misp_object)
+        as_args['id'] = self._id_parsing_function['object']('autonomous-system', misp_object)
         AS_object = AutonomousSystem(**as_args)
         self._handle_object_observable(misp_object, [AS_object])
 
     def _parse_cpe_asset_object_observable(self, misp_object: dict):
         software_args = self._parse_cpe_asset_args(misp_object['Attribute'])
-        software_args['id'] = getattr(self, self._id_parsing_function['object'])('software', misp_object)
+        software_args['id'] = self._id_parsing_function['object']('software', misp_object)
         software_object = Software(**software_args)
         self._handle_object_observable(misp_object, [software_object])
 
     def _parse_credential_object_observable(self, misp_object: dict):
         credential_args = self._parse_credential_args(misp_object['Attribute'])
-        credential_args['id'] = getattr(self, self._id_parsing_function['object'])('user-account', misp_object)
+        credential_args['id'] = self._id_parsing_function['object']('user-account', misp_object)
         user_object = UserAccount(**credential_args)
         self._handle_object_observable(misp_object, [user_object])
 
     def _parse_directory_ref(self, file_args: dict, objects: list, value: str, uuid: str):
-        directory_id = getattr(self, self._id_parsing_function['attribute'])(
+        directory_id = self._id_parsing_function['attribute'](
             'directory',
             {'uuid': uuid}
         )
@@ -676,7 +687,7 @@ class MISPtoSTIX21Parser(MISPtoSTIX2Parser):
         observable_objects, resolves_to_refs = self._parse_domainip_ip_attributes(attributes)
         domain_args = {
             'resolves_to_refs': resolves_to_refs,
-            'id': getattr(self, self._id_parsing_function['object'])('domain-name', misp_object)
+            'id': self._id_parsing_function['object']('domain-name', misp_object)
         }
         domain_args.update(self._parse_domain_args(attributes))
         observable_objects.insert(0, DomainName(**domain_args))
@@ -785,7 +796,7 @@ class MISPtoSTIX21Parser(MISPtoSTIX2Parser):
             if attributes.get('from'):
                 attributes['from'] = [value[0] for value in attributes.pop('from')]
             email_message_args.update(self._parse_email_args(attributes))
-        email_message_args['id'] = getattr(self, self._id_parsing_function['object'])('email-message', misp_object)
+        email_message_args['id'] = self._id_parsing_function['object']('email-message', misp_object)
         objects.insert(0, EmailMessage(**email_message_args))
         self._handle_object_observable(misp_object, objects)
 
@@ -841,11 +852,11 @@ class MISPtoSTIX21Parser(MISPtoSTIX2Parser):
                 )
         if attributes:
             file_args.update(self._parse_file_args(attributes))
-        file_args['id'] = getattr(self, self._id_parsing_function['object'])('file', misp_object)
+        file_args['id'] = self._id_parsing_function['object']('file', misp_object)
         return file_args, objects
 
     def _parse_geolocation_object(self, misp_object: dict):
-        location_id = getattr(self, self._id_parsing_function['object'])('location', misp_object)
+        location_id = self._id_parsing_function['object']('location', misp_object)
         timestamp = self._datetime_from_timestamp(misp_object['timestamp'])
         location_args = {
             'id': location_id,
@@ -884,7 +895,7 @@ class MISPtoSTIX21Parser(MISPtoSTIX2Parser):
             with_data=self._mapping.image_data_fields
         )
         artifact_args = self._parse_image_args(attributes)
-        file_args = {'id': getattr(self, self._id_parsing_function['object'])('file', misp_object)}
+        file_args = {'id': self._id_parsing_function['object']('file', misp_object)}
         if attributes.get('filename'):
             file_args['name'] = self._select_single_feature(attributes, 'filename')
         if attributes:
@@ -907,7 +918,7 @@ class MISPtoSTIX21Parser(MISPtoSTIX2Parser):
         )
         protocols = set()
         network_traffic_args = {
-            'id': getattr(self, self._id_parsing_function['object'])(
+            'id': self._id_parsing_function['object'](
                 'network-traffic',
                 misp_object
             )
@@ -1005,7 +1016,7 @@ class MISPtoSTIX21Parser(MISPtoSTIX2Parser):
 
     def _parse_mutex_object_observable(self, misp_object: dict):
         mutex_args = self._parse_mutex_args(misp_object['Attribute'])
-        mutex_args['id'] = getattr(self, self._id_parsing_function['object'])('mutex', misp_object)
+        mutex_args['id'] = self._id_parsing_function['object']('mutex', misp_object)
         self._handle_object_observable(misp_object, [Mutex(**mutex_args)])
 
     def _parse_network_connection_object_observable(self, misp_object: dict):
@@ -1016,7 +1027,7 @@ class MISPtoSTIX21Parser(MISPtoSTIX2Parser):
         network_traffic_args, objects = self._parse_network_references(attributes)
         if attributes:
             network_traffic_args.update(self._parse_network_connection_args(attributes))
-        network_traffic_args['id'] = getattr(self, self._id_parsing_function['object'])(
+        network_traffic_args['id'] = self._id_parsing_function['object'](
             'network-traffic',
             misp_object
         )
@@ -1057,7 +1068,7 @@ class MISPtoSTIX21Parser(MISPtoSTIX2Parser):
             network_traffic_args, objects = self._parse_network_references(attributes)
             if attributes:
                 network_traffic_args.update(self._parse_network_socket_args(attributes))
-            network_traffic_args['id'] = getattr(self, self._id_parsing_function['object'])(
+            network_traffic_args['id'] = self._id_parsing_function['object'](
                 'network-traffic',
                 misp_object
             )
@@ -1107,7 +1118,7 @@ class MISPtoSTIX21Parser(MISPtoSTIX2Parser):
                 objects.append(File(id=image_uuid, name=filename))
                 process_args['image_ref'] = image_uuid
             process_args.update(self._parse_process_args(attributes, 'features'))
-            process_args['id'] = getattr(self, self._id_parsing_function['object'])(
+            process_args['id'] = self._id_parsing_function['object'](
                 'process',
                 misp_object
             )
@@ -1116,7 +1127,7 @@ class MISPtoSTIX21Parser(MISPtoSTIX2Parser):
 
     def _parse_registry_key_object_observable(self, misp_object: dict):
         registry_key_args = self._parse_registry_key_args(misp_object['Attribute'])
-        registry_key_args['id'] = getattr(self, self._id_parsing_function['object'])(
+        registry_key_args['id'] = self._id_parsing_function['object'](
             'windows-registry-key',
             misp_object
         )
@@ -1170,12 +1181,12 @@ class MISPtoSTIX21Parser(MISPtoSTIX2Parser):
 
     def _parse_url_object_observable(self, misp_object: dict):
         url_args = self._parse_url_args(misp_object['Attribute'])
-        url_args['id'] = getattr(self, self._id_parsing_function['object'])('url', misp_object)
+        url_args['id'] = self._id_parsing_function['object']('url', misp_object)
         self._handle_object_observable(misp_object, [URL(**url_args)])
 
     def _parse_user_account_object_observable(self, misp_object: dict):
         user_account_args = self._parse_user_account_args(misp_object['Attribute'])
-        user_account_args['id'] = getattr(self, self._id_parsing_function['object'])(
+        user_account_args['id'] = self._id_parsing_function['object'](
             'user-account',
             misp_object
         )
@@ -1184,7 +1195,7 @@ class MISPtoSTIX21Parser(MISPtoSTIX2Parser):
 
     def _parse_x509_object_observable(self, misp_object: dict):
         x509_args = self._parse_x509_args(misp_object['Attribute'])
-        x509_args['id'] = getattr(self, self._id_parsing_function['object'])(
+        x509_args['id'] = self._id_parsing_function['object'](
             'x509-certificate',
             misp_object
         )
@@ -1287,7 +1298,7 @@ class MISPtoSTIX21Parser(MISPtoSTIX2Parser):
         return Identity(**identity_args)
 
     @staticmethod
-    def _create_indicator(indicator_args: dict) -> Indicator:
+    def _create_indicator(indicator_args: dict, validated_pattern: bool = False) -> Indicator:
         indicator_args['spec_version'] = '2.1'
         if indicator_args.get('pattern_type') is None:
             indicator_args.update(
@@ -1296,12 +1307,18 @@ class MISPtoSTIX21Parser(MISPtoSTIX2Parser):
                     "pattern_version": "2.1",
                 }
             )
+        if validated_pattern:
+            return ValidatedPatternIndicator(**indicator_args)
         return Indicator(**indicator_args)
 
     @staticmethod
     def _create_intrusion_set(intrusion_set_args: dict) -> IntrusionSet:
         return IntrusionSet(**intrusion_set_args)
 
+    @staticmethod
+    def _create_kill_chain_phase(kill_chain_args: dict) -> KillChainPhase:
+        return KillChainPhase(**kill_chain_args)
+
     def _create_malware(self, malware_args: dict, cluster: Optional[dict]=None) -> Malware:
         if cluster is not None:
             malware_args.update(
@@ -1318,9 +1335,9 @@ class MISPtoSTIX21Parser(MISPtoSTIX2Parser):
 
     def _create_observed_data(self, args: dict, observables: list):
         args['object_refs'] = [observable.id for observable in observables]
-        getattr(self, self._results_handling_function)(ObservedData(**args))
+        self._results_handling_function(ObservedData(**args))
         for observable in observables:
-            getattr(self, self._results_handling_function)(observable)
+            self._results_handling_function(observable)
 
     @staticmethod
     def _create_PE_extension(extension_args: dict) -> WindowsPEBinaryExt:
@@ -1373,7 +1390,7 @@ class MISPtoSTIX21Parser(MISPtoSTIX2Parser):
         if attributes.get('url'):
             url, uuid = self._select_single_feature(attributes, 'url')
             return {
-                'id': getattr(self, self._id_parsing_function['attribute'])(
+                'id': self._id_parsing_function['attribute'](
                     'artifact',
                     {'uuid': uuid}
                 ),
@@ -1421,7 +1438,7 @@ class MISPtoSTIX21Parser(MISPtoSTIX2Parser):
             return None
         filename, data, uuid = attachment
         artifact_args = {
-            'id': getattr(self, self._id_parsing_function['attribute'])('artifact', {'uuid': uuid}),
+            'id': self._id_parsing_function['attribute']('artifact', {'uuid': uuid}),
             'payload_bin': data,
             'allow_custom': True
         }
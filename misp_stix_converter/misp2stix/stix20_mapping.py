@@ -11,7 +11,7 @@ class Stix20Mapping(Stix2Mapping):
     def __init__(self):
         super().__init__()
         self._declare_attributes_mapping()
-        self.__malware_sample_additional_observable_values = {"mime_type": "application/zip"}
+        self.__malware_sample_additional_observable_values = Mapping(mime_type="application/zip")
         self.__malware_sample_additional_pattern_values = "file:content_ref.mime_type = 'application/zip'"
         self.__tlp_markings = Mapping(
             **{
@@ -21,6 +21,9 @@ class Stix20Mapping(Stix2Mapping):
                 'tlp:red': TLP_RED
             }
         )
+        self.__tlp_marking_ids = Mapping(
+            **{tag: marking.id for tag, marking in self.__tlp_markings.items()}
+        )
 
     def declare_objects_mapping(self):
         self._declare_objects_mapping()
@@ -190,6 +193,10 @@ class Stix20Mapping(Stix2Mapping):
     def process_single_fields(self) -> tuple:
         return self.__process_single_fields
 
+    @property
+    def tlp_marking_ids(self) -> dict:
+        return self.__tlp_marking_ids
+
     @property
     def tlp_markings(self) -> dict:
         return self.__tlp_markings
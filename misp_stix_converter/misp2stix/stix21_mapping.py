@@ -29,7 +29,7 @@ class Stix21Mapping(Stix2Mapping):
             "decryption_key": "infected"
         }
         pattern_values = (f"file:content_ref.{key} = '{value}'" for key, value in artifact_values.items())
-        self.__malware_sample_additional_observable_values = artifact_values
+        self.__malware_sample_additional_observable_values = Mapping(**artifact_values)
         self.__malware_sample_additional_pattern_values = ' AND '.join(pattern_values)
         self.__tlp_markings = Mapping(
             **{
@@ -39,6 +39,9 @@ class Stix21Mapping(Stix2Mapping):
                 'tlp:red': TLP_RED
             }
         )
+        self.__tlp_marking_ids = Mapping(
+            **{tag: marking.id for tag, marking in self.__tlp_markings.items()}
+        )
 
     def declare_objects_mapping(self):
         v21_specific_objects = {
@@ -336,6 +339,10 @@ class Stix21Mapping(Stix2Mapping):
     def suricata_object_mapping(self) -> dict:
         return self.__suricata_object_mapping
 
+    @property
+    def tlp_marking_ids(self) -> dict:
+        return self.__tlp_marking_ids
+
     @property
     def tlp_markings(self) -> dict:
         return self.__tlp_markings
@@ -200,6 +200,24 @@ class Stix2Mapping:
         if updates is not None:
             _attribute_types_mapping.update(updates)
         self.__attribute_types_mapping = Mapping(**_attribute_types_mapping)
+        _attribute_batch_patterns_mapping = {
+            'domain': '_create_domain_batch_patterns',
+            'filename': '_create_filename_batch_patterns',
+            'hostname': '_create_domain_batch_patterns',
+            'ip-dst': '_create_ip_batch_patterns',
+            'ip-src': '_create_ip_batch_patterns',
+            'link': '_create_url_batch_patterns',
+            'mutex': '_create_mutex_batch_patterns',
+            'uri': '_create_url_batch_patterns',
+            'url': '_create_url_batch_patterns'
+        }
+        _attribute_batch_patterns_mapping.update(
+            dict.fromkeys(
+                self.__hash_attribute_types + ('cdhash', 'impfuzzy', 'pehash', 'telfhash'),
+                '_create_hash_batch_patterns'
+            )
+        )
+        self.__attribute_batch_patterns_mapping = Mapping(**_attribute_batch_patterns_mapping)
         # GALAXIES MAPPING
         _attack_pattern_types = (
             'mitre-attack-pattern',
@@ -874,6 +892,10 @@ class Stix2Mapping:
     def attack_pattern_single_fields(self) -> tuple:
         return self.__attack_pattern_single_fields
 
+    @property
+    def attribute_batch_patterns_mapping(self) -> dict:
+        return self.__attribute_batch_patterns_mapping
+
     @property
     def attribute_types_mapping(self) -> dict:
         return self.__attribute_types_mapping
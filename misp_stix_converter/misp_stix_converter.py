@@ -2,10 +2,12 @@
 #!/usr/bin/env python3
 
 import json
-import os
 import re
+import shutil
 import sys
-from .misp2stix.framing import stix1_attributes_framing, stix1_framing
+from .misp2stix.framing import (_handle_namespaces, stix1_attributes_framing,
+    stix1_framing, stix1_package_framing, stix_xml_separator)
+from .misp2stix.json_stream import load_json_content
 from .misp2stix.misp_to_stix1 import MISPtoSTIX1AttributesParser, MISPtoSTIX1EventsParser
 from .misp2stix.misp_to_stix20 import MISPtoSTIX20Parser
 from .misp2stix.misp_to_stix21 import MISPtoSTIX21Parser
@@ -14,27 +16,36 @@ from .stix2misp.external_stix1_to_misp import ExternalSTIX1toMISPParser
 from .stix2misp.external_stix2_to_misp import ExternalSTIX2toMISPParser
 from .stix2misp.internal_stix1_to_misp import InternalSTIX1toMISPParser
 from .stix2misp.internal_stix2_to_misp import InternalSTIX2toMISPParser
-from collections import defaultdict
+from .stix2misp.stix2_to_misp import iter_stix_objects
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
 from cybox.core.observable import Observables
 from mixbox import idgen
-from mixbox.namespaces import Namespace, NamespaceNotFoundError, register_namespace
+from mixbox.namespaces import Namespace, NamespaceNotFoundError, get_full_ns_map, register_namespace
+from functools import partial
+from io import StringIO
 from pathlib import Path
 from stix.core import Campaigns, CoursesOfAction, Indicators, ThreatActors, STIXHeader, STIXPackage
 from stix.core.ttps import TTPs
 from stix2.base import STIXJSONEncoder
-from stix2.parsing import parse as stix2_parser
 from stix2.v20 import Bundle as Bundle_v20
 from stix2.v21 import Bundle as Bundle_v21
-from typing import List, Union
+from tempfile import SpooledTemporaryFile
+from typing import Iterable, Iterator, List, Optional, Union
 from uuid import uuid4
 
 _default_namespace = 'https://misp-project.org'
 _default_org = 'MISP'
+_default_spool_size = 1 << 22
+# Conversions submitted to the process pools ahead of the results written, per worker
+_default_tasks_per_worker = 2
 _files_type = Union[Path, str]
 _STIX1_default_format = 'xml'
 _STIX1_default_version = '1.1.1'
 _STIX1_valid_formats = ('json', 'xml')
 _STIX1_valid_versions = ('1.1.1', '1.2')
+_STIX2_INDENTED_ENCODER = STIXJSONEncoder(indent=4)
+_STIX2_OBJECT_INDENT = ' ' * 8
 
 
 ################################################################################
@@ -51,6 +62,11 @@ class AttributeCollectionHandler():
     def actual_features(self):
         return tuple(key for key, values in self.__features.items() if values)
 
+    def close(self):
+        for values in self.__features.values():
+            if values.get('buffer') is not None:
+                values['buffer'].close()
+
     @property
     def features(self):
         return (
@@ -65,11 +81,11 @@ class AttributeCollectionHandler():
 
     @property
     def campaigns(self):
-        return self.__features['campaigns'].get('filename')
+        return self.__features['campaigns'].get('buffer')
 
     @campaigns.setter
-    def campaigns(self, filename):
-        self.__features['campaigns']['filename'] = f'{filename}.{self.__return_format}'
+    def campaigns(self, buffer):
+        self.__features['campaigns']['buffer'] = buffer
         self.__features['campaigns'].update(
             {
                 'header': '    <stix:Campaigns>\n',
@@ -90,11 +106,11 @@ class AttributeCollectionHandler():
 
     @property
     def courses_of_action(self):
-        return self.__features['courses_of_action'].get('filename')
+        return self.__features['courses_of_action'].get('buffer')
 
     @courses_of_action.setter
-    def courses_of_action(self, filename):
-        self.__features['courses_of_action']['filename'] = f'{filename}.{self.__return_format}'
+    def courses_of_action(self, buffer):
+        self.__features['courses_of_action']['buffer'] = buffer
         self.__features['courses_of_action'].update(
             {
                 'header': '    <stix:CoursesOfAction>\n',
@@ -115,11 +131,11 @@ class AttributeCollectionHandler():
 
     @property
     def exploit_targets(self):
-        return self.__features['exploit_targets'].get('filename')
+        return self.__features['exploit_targets'].get('buffer')
 
     @exploit_targets.setter
-    def exploit_targets(self, filename):
-        self.__features['exploit_targets']['filename'] = f'{filename}.{self.__return_format}'
+    def exploit_targets(self, buffer):
+        self.__features['exploit_targets']['buffer'] = buffer
         self.__features['exploit_targets'].update(
             {
                 'header': '    <stix:ExploitTargets>\n',
@@ -140,11 +156,11 @@ class AttributeCollectionHandler():
 
     @property
     def indicators(self):
-        return self.__features['indicators'].get('filename')
+        return self.__features['indicators'].get('buffer')
 
     @indicators.setter
-    def indicators(self, filename):
-        self.__features['indicators']['filename'] = f'{filename}.{self.__return_format}'
+    def indicators(self, buffer):
+        self.__features['indicators']['buffer'] = buffer
         self.__features['indicators'].update(
             {
                 'header': '    <stix:Indicators>\n',
@@ -165,11 +181,11 @@ class AttributeCollectionHandler():
 
     @property
     def observables(self):
-        return self.__features['observables'].get('filename')
+        return self.__features['observables'].get('buffer')
 
     @observables.setter
-    def observables(self, filename):
-        self.__features['observables']['filename'] = f'{filename}.{self.__return_format}'
+    def observables(self, buffer):
+        self.__features['observables']['buffer'] = buffer
         self.__features['observables'].update(
             {
                 'header': '    <stix:Observables>\n',
@@ -190,11 +206,11 @@ class AttributeCollectionHandler():
 
     @property
     def threat_actors(self):
-        return self.__features['threat_actors'].get('filename')
+        return self.__features['threat_actors'].get('buffer')
 
     @threat_actors.setter
-    def threat_actors(self, filename):
-        self.__features['threat_actors']['filename'] = f'{filename}.{self.__return_format}'
+    def threat_actors(self, buffer):
+        self.__features['threat_actors']['buffer'] = buffer
         self.__features['threat_actors'].update(
             {
                 'header': '    <stix:ThreatActors>\n',
@@ -215,11 +231,11 @@ class AttributeCollectionHandler():
 
     @property
     def ttps(self):
-        return self.__features['ttps'].get('filename')
+        return self.__features['ttps'].get('buffer')
 
     @ttps.setter
-    def ttps(self, filename):
-        self.__features['ttps']['filename'] = f'{filename}.{self.__return_format}'
+    def ttps(self, buffer):
+        self.__features['ttps']['buffer'] = buffer
         self.__features['ttps'].update(
             {
                 'header': '    <stix:TTPs>\n',
@@ -239,10 +255,102 @@ class AttributeCollectionHandler():
         return self.__features['ttps']['header']
 
 
+class STIX1PackageWriter():
+    def __init__(self, handle, return_format: str, version: str,
+                 namespace: str = _default_namespace, org: str = _default_org,
+                 package: Optional[STIXPackage] = None):
+        self.__handle = handle
+        self.__return_format = return_format
+        self.__indent = None
+        if package is None:
+            self.__header, self.__separator, self.__footer = stix1_framing(
+                namespace, org, return_format, version
+            )
+        else:
+            # Same layout as the package written at once with _write_raw_stix
+            self.__header, self.__separator, self.__footer = stix1_package_framing(
+                package, namespace, org, return_format
+            )
+            if return_format == 'json':
+                self.__indent = self.__separator[2:]
+        self.__namespaces = get_full_ns_map()
+        self.__empty = True
+
+    @property
+    def indent(self):
+        return self.__indent
+
+    def write_header(self):
+        self.__handle.write(self.__header)
+
+    def write_footer(self):
+        self.__handle.write(self.__footer)
+
+    def write_package(self, package: STIXPackage):
+        if package.related_packages is not None:
+            for related_package in package.related_packages:
+                self.write_package(related_package.item)
+            return
+        self.__write_separator()
+        _export_stix1_package(
+            self.__handle.write, package, self.__return_format, self.__namespaces,
+            indent=self.__indent
+        )
+
+    def write_serialized_packages(self, contents: Iterable[str]):
+        for content in contents:
+            self.__write_separator()
+            self.__handle.write(content)
+
+    def __write_separator(self):
+        if self.__empty:
+            self.__empty = False
+        else:
+            self.__handle.write(self.__separator)
+
+
+class STIX2BundleWriter():
+    def __init__(self, handle, version: str, compact: bool = False):
+        self.__handle = handle
+        self.__bundle = Bundle_v20 if version == '2.0' else Bundle_v21
+        self.__compact = compact
+        self.__empty = True
+
+    def write_header(self):
+        bundle = self.__bundle(allow_custom=True)
+        if self.__compact:
+            header = json.dumps(bundle, cls=STIXJSONEncoder, separators=(',', ':'))[:-1]
+            self.__handle.write(f'{header},"objects":[')
+            return
+        header = json.dumps(bundle, cls=STIXJSONEncoder, indent=4)[:-2]
+        self.__handle.write(f'{header},\n    "objects": [\n')
+
+    def write_footer(self):
+        self.__handle.write(']}' if self.__compact else '\n    ]\n}')
+
+    def write_objects(self, stix_objects: list):
+        for stix_object in stix_objects:
+            self.__write_separator()
+            self.__handle.writelines(_iter_stix2_object_chunks(stix_object, self.__compact))
+
+    def write_serialized_objects(self, contents: Iterable[str]):
+        for content in contents:
+            self.__write_separator()
+            self.__handle.write(content)
+
+    def __write_separator(self):
+        if self.__empty:
+            self.__empty = False
+        else:
+            self.__handle.write(',' if self.__compact else ',\n')
+
+
 def misp_attribute_collection_to_stix1(
     output_filename: _files_type, *input_files: List[_files_type],
     return_format: str=_STIX1_default_format, version: str=_STIX1_default_version,
-    in_memory: bool=False, namespace: str=_default_namespace, org: str=_default_org
+    in_memory: bool=False, namespace: str=_default_namespace, org: str=_default_org,
+    spool_size: int=_default_spool_size, tmp_dir: Optional[_files_type]=None,
+    buffer_size: int=-1
 ):
     if return_format not in _STIX1_valid_formats:
         return_format = _STIX1_default_format
@@ -275,49 +383,50 @@ def misp_attribute_collection_to_stix1(
                 for ttp in current.ttps:
                     package.add_ttp(ttp)
         return _write_raw_stix(package, output_filename, namespace, org, return_format)
-    current_path = Path(output_filename).parent.resolve()
     handler = AttributeCollectionHandler(return_format)
     header, separator, footer = stix1_attributes_framing(namespace, org, return_format, version)
-    for input_file in input_files:
-        parser.parse_json_content(input_file)
-        current = parser.stix_package
-        for feature in handler.features:
-            values = getattr(current, feature)
-            if values is not None and values:
-                content = globals()[f'_get_{feature}'](values, return_format)
-                if not content:
-                    continue
-                filename = getattr(handler, feature)
-                if filename is None:
-                    setattr(handler, feature, uuid4())
-                    filename = getattr(handler, feature)
-                    with open(current_path / filename, 'wt', encoding='utf-8') as f:
-                        current_header = getattr(handler, f'{feature}_header')
-                        f.write(f'{current_header}{content}')
-                    continue
-                with open(current_path / filename, 'at', encoding='utf-8') as f:
-                    f.write(content)
-    with open(output_filename, 'wt', encoding='utf-8') as result:
-        result.write(header)
-        actual_features = handler.actual_features
-        for feature in actual_features:
-            filename = getattr(handler, feature)
-            if filename is not None:
-                with open(current_path / filename, 'rt', encoding='utf-8') as current:
-                    content = current.read() if return_format == 'xml' else current.read()[:-2]
+    try:
+        for input_file in input_files:
+            parser.parse_json_content(input_file)
+            current = parser.stix_package
+            for feature in handler.features:
+                values = getattr(current, feature)
+                if values is not None and values:
+                    content = globals()[f'_get_{feature}'](values, return_format)
+                    if not content:
+                        continue
+                    buffer = getattr(handler, feature)
+                    if buffer is None:
+                        buffer = SpooledTemporaryFile(
+                            max_size=spool_size, mode='w+t', encoding='utf-8', dir=tmp_dir
+                        )
+                        setattr(handler, feature, buffer)
+                        buffer.write(getattr(handler, f'{feature}_header'))
+                    elif return_format == 'json':
+                        buffer.write(separator)
+                    buffer.write(content)
+        with open(output_filename, 'wt', encoding='utf-8', buffering=buffer_size) as result:
+            result.write(header)
+            actual_features = handler.actual_features
+            for feature in actual_features:
+                buffer = getattr(handler, feature)
+                buffer.seek(0)
+                shutil.copyfileobj(buffer, result)
                 current_footer = getattr(handler, f'{feature}_footer')
                 if return_format == 'json' and feature == actual_features[-1]:
                     current_footer = current_footer[:-2]
-                result.write(f'{content}{current_footer}')
-                os.remove(current_path / filename)
-        result.write(footer)
+                result.write(current_footer)
+            result.write(footer)
+    finally:
+        handler.close()
     return 1
 
 
 def misp_event_collection_to_stix1(
     output_filename: _files_type, *input_files: List[_files_type],
     return_format: str=_STIX1_default_format, version: str=_STIX1_default_version,
-    in_memory: bool=False, namespace: str=_default_namespace, org: str=_default_org
+    in_memory: bool=False, namespace: str=_default_namespace, org: str=_default_org,
+    workers: int=1, buffer_size: int=-1
 ):
     if return_format not in _STIX1_valid_formats:
         return_format = _STIX1_default_format
@@ -325,8 +434,15 @@ def misp_event_collection_to_stix1(
         version = _STIX1_default_version
     if org != _default_org:
         org = re.sub('[\W]+', '', org.replace(" ", "_"))
+    # A single file is written with the same layout as misp_to_stix1
+    package = _create_stix_package(org, version) if len(input_files) == 1 else None
+    if workers > 1:
+        return _misp_events_to_stix1_parallel(
+            output_filename, input_files, return_format, version, namespace, org, workers,
+            buffer_size=buffer_size, package=package
+        )
     parser = MISPtoSTIX1EventsParser(org, version)
-    if in_memory or len(input_files) == 1:
+    if in_memory:
         package = _create_stix_package(org, version)
         for filename in input_files:
             parser.parse_json_content(filename)
@@ -336,94 +452,102 @@ def misp_event_collection_to_stix1(
             else:
                 package.add_related_package(parser.stix_package)
         return _write_raw_stix(package, output_filename, namespace, org, return_format)
-    header, separator, footer = stix1_framing(namespace, org, return_format, version)
-    parser.parse_json_content(input_files[0])
-    content = _get_events(parser.stix_package, return_format)
-    with open(output_filename, 'wt', encoding='utf-8') as f:
-        f.write(f'{header}{content}')
-    for filename in input_files[1:]:
-        parser.parse_json_content(filename)
-        content = _get_events(parser.stix_package, return_format)
-        with open(output_filename, 'at', encoding='utf-8') as f:
-            f.write(f'{separator}{content}')
-    with open(output_filename, 'at', encoding='utf-8') as f:
-        f.write(footer)
+    with open(output_filename, 'wt', encoding='utf-8', buffering=buffer_size) as f:
+        writer = STIX1PackageWriter(
+            f, return_format, version, namespace=namespace, org=org, package=package
+        )
+        writer.write_header()
+        for filename in input_files:
+            for package in parser.iter_json_content(filename):
+                writer.write_package(package)
+        writer.write_footer()
     return 1
 
 
-def misp_collection_to_stix2_0(output_filename: _files_type, *input_files: List[_files_type], in_memory: bool=False):
+def misp_collection_to_stix2_0(output_filename: _files_type, *input_files: List[_files_type], in_memory: bool=False, workers: int=1, buffer_size: int=-1):
+    if workers > 1 and len(input_files) > 1:
+        return _misp_collection_to_stix2_parallel('2.0', output_filename, input_files, workers, buffer_size)
     parser = MISPtoSTIX20Parser()
     if in_memory or len(input_files) == 1:
         objects = []
         for filename in input_files:
             parser.parse_json_content(filename)
             objects.extend(parser.stix_objects)
-        with open(output_filename, 'wt', encoding='utf-8') as f:
+        with open(output_filename, 'wt', encoding='utf-8', buffering=buffer_size) as f:
             f.write(json.dumps(Bundle_v20(objects), cls=STIXJSONEncoder, indent=4))
         return 1
-    with open(output_filename, 'wt', encoding='utf-8') as f:
-        f.write(f'{json.dumps(Bundle_v20(), cls=STIXJSONEncoder, indent=4)[:-2]},\n    "objects": [\n')
-    for filename in input_files[:-1]:
-        parser.parse_json_content(filename)
-        with open(output_filename, 'at', encoding='utf-8') as f:
-            f.write(f'{json.dumps([parser.stix_objects], cls=STIXJSONEncoder, indent=4)[8:-8]},\n')
-    parser.parse_json_content(input_files[-1])
-    with open(output_filename, 'at', encoding='utf-8') as f:
-        footer = '    ]\n}'
-        f.write(f'{json.dumps([parser.stix_objects], cls=STIXJSONEncoder, indent=4)[8:-8]}\n{footer}')
+    with open(output_filename, 'wt', encoding='utf-8', buffering=buffer_size) as f:
+        writer = STIX2BundleWriter(f, '2.0')
+        writer.write_header()
+        for filename in input_files:
+            parser.parse_json_content(filename)
+            writer.write_objects(parser.stix_objects)
+        writer.write_footer()
     return 1
 
 
-def misp_collection_to_stix2_1(output_filename: _files_type, *input_files: List[_files_type], in_memory: bool=False):
+def misp_collection_to_stix2_1(output_filename: _files_type, *input_files: List[_files_type], in_memory: bool=False, workers: int=1, buffer_size: int=-1):
+    if workers > 1 and len(input_files) > 1:
+        return _misp_collection_to_stix2_parallel('2.1', output_filename, input_files, workers, buffer_size)
     parser = MISPtoSTIX21Parser()
     if in_memory or len(input_files) == 1:
         objects = []
         for filename in input_files:
             parser.parse_json_content(filename)
             objects.extend(parser.stix_objects)
-        with open(output_filename, 'wt', encoding='utf-8') as f:
+        with open(output_filename, 'wt', encoding='utf-8', buffering=buffer_size) as f:
             f.write(json.dumps(Bundle_v21(objects), cls=STIXJSONEncoder, indent=4))
         return 1
-    with open(output_filename, 'wt', encoding='utf-8') as f:
-        f.write(f'{json.dumps(Bundle_v21(), cls=STIXJSONEncoder, indent=4)[:-2]},\n    "objects": [\n')
-    for filename in input_files[:-1]:
-        parser.parse_json_content(filename)
-        with open(output_filename, 'at', encoding='utf-8') as f:
-            f.write(f'{json.dumps([parser.stix_objects], cls=STIXJSONEncoder, indent=4)[8:-8]},\n')
-    parser.parse_json_content(input_files[-1])
-    with open(output_filename, 'at', encoding='utf-8') as f:
-        footer = '    ]\n}'
-        f.write(f'{json.dumps([parser.stix_objects], cls=STIXJSONEncoder, indent=4)[8:-8]}\n{footer}')
+    with open(output_filename, 'wt', encoding='utf-8', buffering=buffer_size) as f:
+        writer = STIX2BundleWriter(f, '2.1')
+        writer.write_header()
+        for filename in input_files:
+            parser.parse_json_content(filename)
+            writer.write_objects(parser.stix_objects)
+        writer.write_footer()
     return 1
 
 
-def misp_to_stix1(filename: _files_type, return_format: str, version: str, namespace=_default_namespace, org=_default_org):
+def misp_to_stix1(filename: _files_type, return_format: str, version: str, namespace=_default_namespace, org=_default_org, workers: int=1):
     if org != _default_org:
         org = re.sub('[\W]+', '', org.replace(" ", "_"))
-    package = _create_stix_package(org, version)
+    if workers > 1:
+        return _misp_events_to_stix1_parallel(
+            f'{filename}.out', (filename,), return_format, version, namespace, org, workers,
+            package=_create_stix_package(org, version)
+        )
     parser = MISPtoSTIX1EventsParser(org, version)
-    parser.parse_json_content(filename)
-    if parser.stix_package.related_packages is not None:
-        for related_package in parser.stix_package.related_packages:
-            package.add_related_package(related_package)
-    else:
-        package.add_related_package(parser.stix_package)
-    return _write_raw_stix(package, f'{filename}.out', namespace, org, return_format)
+    with open(f'{filename}.out', 'wt', encoding='utf-8') as f:
+        writer = STIX1PackageWriter(
+            f, return_format, version, namespace=namespace, org=org,
+            package=_create_stix_package(org, version)
+        )
+        writer.write_header()
+        for package in parser.iter_json_content(filename):
+            writer.write_package(package)
+        writer.write_footer()
+    return 1
 
 
-def misp_to_stix2_0(filename: _files_type):
+def misp_to_stix2_0(filename: _files_type, compact: bool=False):
     parser = MISPtoSTIX20Parser()
     parser.parse_json_content(filename)
     with open(f'{filename}.out', 'wt', encoding='utf-8') as f:
-        f.write(json.dumps(parser.bundle, cls=STIXJSONEncoder, indent=4))
+        writer = STIX2BundleWriter(f, '2.0', compact=compact)
+        writer.write_header()
+        writer.write_objects(parser.stix_objects)
+        writer.write_footer()
     return 1
 
 
-def misp_to_stix2_1(filename: _files_type):
+def misp_to_stix2_1(filename: _files_type, compact: bool=False):
     parser = MISPtoSTIX21Parser()
     parser.parse_json_content(filename)
     with open(f'{filename}.out', 'wt', encoding='utf-8') as f:
-        f.write(json.dumps(parser.bundle, cls=STIXJSONEncoder, indent=4))
+        writer = STIX2BundleWriter(f, '2.1', compact=compact)
+        writer.write_header()
+        writer.write_objects(parser.stix_objects)
+        writer.write_footer()
     return 1
 
 
@@ -445,10 +569,9 @@ def stix_to_misp(filename):
 
 
 def stix2_to_misp(filename):
-    with open(filename, 'rt', encoding='utf-8') as f:
-        bundle = stix2_parser(f.read(), allow_custom=True, interoperability=True)
-    stix_parser = InternalSTIX2toMISPParser() if _from_misp(bundle.objects) else ExternalSTIX2toMISPParser()
-    stix_parser.parse_stix_content(bundle)
+    from_misp = _from_misp(iter_stix_objects(filename))
+    stix_parser = InternalSTIX2toMISPParser(trusted_input=True) if from_misp else ExternalSTIX2toMISPParser()
+    stix_parser.parse_stix_content(filename)
     stix_parser.save_file()
     return
 
@@ -468,6 +591,109 @@ def _create_stix_package(orgname: str, version: str) -> STIXPackage:
     return package
 
 
+################################################################################
+#                            PROCESS POOL HELPERS.                             #
+################################################################################
+
+def _map_in_order(executor, function, arguments: Iterable, workers: int) -> Iterator:
+    # Unlike executor.map, the arguments are consumed along with the results
+    pending = deque()
+    for argument in arguments:
+        pending.append(executor.submit(function, argument))
+        if len(pending) == workers * _default_tasks_per_worker:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+################################################################################
+#                          STIX 1 COLLECTION HELPERS.                          #
+################################################################################
+
+def _convert_misp_event_to_stix1(orgname: str, version: str, return_format: str,
+                                 indent: Optional[str], misp_event: dict) -> str:
+    parser = MISPtoSTIX1EventsParser(orgname, version)
+    parser.parse_misp_event(misp_event)
+    content = StringIO()
+    _export_stix1_package(
+        content.write, parser.stix_package, return_format, get_full_ns_map(), indent=indent
+    )
+    return content.getvalue()
+
+
+def _iter_misp_events(input_files: tuple) -> Iterator[dict]:
+    for filename in input_files:
+        json_content = load_json_content(filename)
+        yield from json_content.get('response') or (json_content,)
+
+
+def _misp_events_to_stix1_parallel(output_filename: _files_type, input_files: tuple,
+                                   return_format: str, version: str, namespace: str,
+                                   org: str, workers: int, buffer_size: int=-1,
+                                   package: Optional[STIXPackage] = None):
+    with ProcessPoolExecutor(max_workers=workers, initializer=_handle_namespaces,
+                             initargs=(namespace, org)) as executor:
+        with open(output_filename, 'wt', encoding='utf-8', buffering=buffer_size) as f:
+            writer = STIX1PackageWriter(
+                f, return_format, version, namespace=namespace, org=org, package=package
+            )
+            conversion = partial(
+                _convert_misp_event_to_stix1, org, version, return_format, writer.indent
+            )
+            writer.write_header()
+            writer.write_serialized_packages(
+                _map_in_order(executor, conversion, _iter_misp_events(input_files), workers)
+            )
+            writer.write_footer()
+    return 1
+
+
+################################################################################
+#                          STIX 2 COLLECTION HELPERS.                          #
+################################################################################
+
+def _convert_misp_file_to_stix2(version: str, filename: _files_type, compact: bool=False) -> tuple:
+    parser = MISPtoSTIX20Parser() if version == '2.0' else MISPtoSTIX21Parser()
+    parser.parse_json_content(filename)
+    contents = tuple(
+        (stix_object.id, _serialize_stix2_object(stix_object, compact))
+        for stix_object in parser.stix_objects
+    )
+    return contents, frozenset(parser.unique_ids.values())
+
+
+def _misp_collection_to_stix2_parallel(version: str, output_filename: _files_type,
+                                       input_files: tuple, workers: int, buffer_size: int=-1):
+    unique_ids = set()
+    conversion = partial(_convert_misp_file_to_stix2, version)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        with open(output_filename, 'wt', encoding='utf-8', buffering=buffer_size) as f:
+            writer = STIX2BundleWriter(f, version)
+            writer.write_header()
+            for contents, file_unique_ids in _map_in_order(executor, conversion, input_files, workers):
+                writer.write_serialized_objects(
+                    content for object_id, content in contents
+                    if object_id not in unique_ids or object_id not in file_unique_ids
+                )
+                unique_ids.update(file_unique_ids)
+            writer.write_footer()
+    return 1
+
+
+def _iter_stix2_object_chunks(stix_object, compact: bool=False) -> Iterator[str]:
+    if compact:
+        yield json.dumps(stix_object, cls=STIXJSONEncoder, separators=(',', ':'))
+        return
+    # Objects are nested in the bundle objects list, i.e. 2 levels deep
+    yield _STIX2_OBJECT_INDENT
+    for chunk in _STIX2_INDENTED_ENCODER.iterencode(stix_object):
+        yield chunk.replace('\n', f'\n{_STIX2_OBJECT_INDENT}') if '\n' in chunk else chunk
+
+
+def _serialize_stix2_object(stix_object, compact: bool=False) -> str:
+    return ''.join(_iter_stix2_object_chunks(stix_object, compact))
+
+
 ################################################################################
 #                        STIX CONTENT LOADING FUNCTIONS                        #
 ################################################################################
@@ -562,15 +788,28 @@ def _get_courses_of_action_header(return_format: str = 'xml') -> str:
 
 
 def _get_events(package: STIXPackage, return_format: str = 'xml') -> str:
-    if return_format == 'xml':
-        if package.related_packages is not None:
-            length = 96 + len(package.id_) + len(package.version)
-            return package.to_xml(include_namespaces=False).decode()[length:-82]
-        content = '\n            '.join(package.to_xml(include_namespaces=False).decode().split('\n'))
-        return f'            {content}\n'
+    packages = [package]
     if package.related_packages is not None:
-        return ', '.join(related_package.to_json() for related_package in package.related_packages)
-    return json.dumps({'package': package.to_dict()})
+        packages = [related_package.item for related_package in package.related_packages]
+    content = StringIO()
+    namespaces = get_full_ns_map()
+    separator = stix_xml_separator() if return_format == 'xml' else ', '
+    for index, stix_package in enumerate(packages):
+        if index:
+            content.write(separator)
+        _export_stix1_package(content.write, stix_package, return_format, namespaces)
+    return content.getvalue()
+
+
+def _export_stix1_package(write, package: STIXPackage, return_format: str, namespaces: dict,
+                          indent: Optional[str] = None):
+    if return_format == 'xml':
+        package.to_obj().export(write, 3, namespaces, name_='Package')
+    elif indent is None:
+        write(json.dumps({'package': package.to_dict()}))
+    else:
+        content = json.dumps({'package': package.to_dict()}, indent=4)
+        write(content.replace('\n', f'\n{indent}'))
 
 
 def _get_indicators(indicators: Indicators, return_format: str = 'xml') -> str:
@@ -1,3 +1,9 @@
+from threading import Lock
+
+_SHARED_MAPPINGS = {}
+_SHARED_MAPPINGS_LOCK = Lock()
+
+
 class Mapping(dict):
     def __setitem__(self, key, value):
         raise TypeError(f'{type(self).__name__} object does not support item assignment')
@@ -9,3 +15,13 @@ class Mapping(dict):
         if attribute in ('clear', 'update', 'pop', 'popitem', 'setdefault'):
             raise AttributeError(f'{type(self).__name__} object has no attribute {attribute}')
         return super().__getattribute__(attribute)
+
+
+def shared_mapping(mapping_class: type):
+    try:
+        return _SHARED_MAPPINGS[mapping_class]
+    except KeyError:
+        with _SHARED_MAPPINGS_LOCK:
+            if mapping_class not in _SHARED_MAPPINGS:
+                _SHARED_MAPPINGS[mapping_class] = mapping_class()
+        return _SHARED_MAPPINGS[mapping_class]
@@ -0,0 +1,45 @@
+import re
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Union
+
+# Events carry a few distinct timestamps repeated on all their attributes & objects
+_TIMESTAMPS_CACHE_SIZE = 4096
+_DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%S'
+_DATETIME_REGEX = re.compile(
+    r'(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})(?:\.(\d{1,6}))?', re.ASCII
+)
+
+
+@lru_cache(maxsize=_TIMESTAMPS_CACHE_SIZE)
+def datetime_from_str(timestamp: str) -> datetime:
+    value = timestamp.split('+')[0]
+    # Fast path for the fixed %Y-%m-%dT%H:%M:%S[.%f] formats, strptime handles the rest
+    match = _DATETIME_REGEX.fullmatch(value)
+    if match is not None and ('.' in timestamp) == (match.group(7) is not None):
+        *fields, microseconds = match.groups()
+        try:
+            return datetime(
+                *(int(field) for field in fields),
+                int(microseconds.ljust(6, '0')) if microseconds else 0
+            )
+        except ValueError:
+            pass
+    regex = f'{_DATETIME_FORMAT}.%f' if '.' in timestamp else _DATETIME_FORMAT
+    return datetime.strptime(value, regex)
+
+
+@lru_cache(maxsize=_TIMESTAMPS_CACHE_SIZE)
+def datetime_from_stix_str(timestamp: str) -> datetime:
+    # STIX 2 timestamps are UTC ones, e.g. 2020-10-25T16:22:00.000Z
+    return datetime_from_str(timestamp.rstrip('Z')).replace(tzinfo=timezone.utc)
+
+
+@lru_cache(maxsize=_TIMESTAMPS_CACHE_SIZE)
+def datetime_from_timestamp(timestamp: Union[int, str]) -> datetime:
+    return datetime.utcfromtimestamp(int(timestamp))
+
+
+@lru_cache(maxsize=_TIMESTAMPS_CACHE_SIZE)
+def timestamp_from_datetime(date: datetime) -> int:
+    return int(date.timestamp())
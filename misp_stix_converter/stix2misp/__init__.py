@@ -1,4 +1,5 @@
 from .external_stix1_to_misp import ExternalSTIX1toMISPParser
 from .external_stix2_to_misp import ExternalSTIX2toMISPParser
 from .internal_stix1_to_misp import InternalSTIX1toMISPParser
-from .internal_stix2_to_misp import InternalSTIX2toMISPParser
\ No newline at end of file
+from .internal_stix2_to_misp import InternalSTIX2toMISPParser
+from .synonyms_index import build_synonyms_index
\ No newline at end of file
@@ -582,16 +582,14 @@ class ExternalSTIX2toMISPParser(STIX2toMISPParser):
     def _check_existing_galaxy_name(self, stix_object_name: str) -> Union[list, None]:
         if stix_object_name in self.synonyms_mapping:
             return self.synonyms_mapping[stix_object_name]
-        for name, tag_names in self.synonyms_mapping.items():
-            if stix_object_name in name:
-                return tag_names
+        return self.synonyms_mapping.first_containing(stix_object_name)
 
     @staticmethod
-    def _extract_types_from_observable_objects(observable_objects: dict) -> list:
-        return sorted({observable.type for observable in observable_objects.values()})
+    def _extract_types_from_observable_objects(observable_objects: dict) -> str:
+        return '_'.join(sorted({observable.type for observable in observable_objects.values()}))
 
-    def _extract_types_from_observable_refs(self, observable_refs: list) -> list:
-        return sorted({self._observable[object_ref].type for object_ref in observable_refs})
+    def _extract_types_from_observable_refs(self, observable_refs: list) -> str:
+        return '_'.join(sorted({self._observable[object_ref].type for object_ref in observable_refs}))
 
     @staticmethod
     def _handle_object_forcing(attributes: list, object_forcing: tuple) -> bool:
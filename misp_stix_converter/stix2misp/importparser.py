@@ -1,11 +1,8 @@
 # -*- coding: utf-8 -*-
 #!/usr/bin/env python3
 
-import json
-import subprocess
 import traceback
-from .exceptions import (SynonymsResourceJSONError, UnavailableGalaxyResourcesError,
-    UnavailableSynonymsResourceError)
+from .synonyms_index import load_synonyms_file, load_synonyms_mapping
 from collections import defaultdict
 from pathlib import Path
 from stix2.v20.sdo import(
@@ -18,15 +15,12 @@ from stix2.v21.sdo import(
     ThreatActor as ThreatActor_v21, Vulnerability as Vulnerability_v21)
 from typing import Union
 
-_ROOT_PATH = Path(__file__).parents[1].resolve()
-
 
 class STIXtoMISPParser:
     def __init__(self, synonyms_path: Union[None, str]):
         self._identifier: str
         self._galaxies: dict = {}
-        if synonyms_path is not None:
-            self.__synonyms_path = Path(synonyms_path)
+        self.__synonyms_path = None if synonyms_path is None else Path(synonyms_path)
         self.__errors: defaultdict = defaultdict(set)
         self.__warnings: defaultdict = defaultdict(set)
 
@@ -39,7 +33,10 @@ class STIXtoMISPParser:
         try:
             return self.__synonyms_mapping
         except AttributeError:
-            self.__get_synonyms_mapping()
+            if self.__synonyms_path is None:
+                self.__synonyms_mapping = load_synonyms_mapping()
+            else:
+                self.__synonyms_mapping = load_synonyms_file(self.__synonyms_path)
             return self.__synonyms_mapping
 
     @property
@@ -83,6 +80,10 @@ class STIXtoMISPParser:
         message = f"Error with the Intrusion Set object with id {intrusion_set_id}: {tb}"
         self.__errors[self._identifier].add(message)
 
+    def _invalid_stix_object_error(self, object_error: str):
+        message = f"Error loading the invalid STIX object with id {object_error}"
+        self.__errors[self._identifier].add(message)
+
     def _malware_error(self, malware_id: str, exception: Exception):
         tb = self._parse_traceback(exception)
         message = f"Error with the Malware object with id {malware_id}: {tb}"
@@ -157,81 +158,3 @@ class STIXtoMISPParser:
         tb = self._parse_traceback(exception)
         message = f"Error with the Vulnerability object with id {vulnerability_id}: {tb}"
         self.__errors[self._identifier].add(message)
-
-    ################################################################################
-    #           SYNONYMS TO GALAXY TAG NAMES MAPPING HANDLING FUNCTIONS.           #
-    ################################################################################
-
-    def __galaxies_up_to_date(self) -> bool:
-        fingerprint_path = _ROOT_PATH / 'data' / 'synonymsToTagNames.fingerprint'
-        if not fingerprint_path.exists():
-            return False
-        latest_fingerprint = self.__get_misp_galaxy_fingerprint()
-        if latest_fingerprint is None:
-            return False
-        with open(fingerprint_path, 'rt', encoding='utf-8') as f:
-            fingerprint = f.read()
-        return fingerprint == latest_fingerprint
-
-    def __generate_synonyms_mapping(self):
-        data_path = _ROOT_PATH / 'data' / 'misp-galaxy' / 'clusters'
-        if not data_path.exists():
-            raise UnavailableGalaxyResourcesError(data_path)
-        synonyms_mapping = defaultdict(list)
-        for filename in data_path.glob('*.json'):
-            with open(filename, 'rt', encoding='utf-8') as f:
-                cluster_definition = json.loads(f.read())
-            cluster_type = f"misp-galaxy:{cluster_definition['type']}"
-            for cluster in cluster_definition['values']:
-                value = cluster['value']
-                tag_name = f'{cluster_type}="{value}"'
-                synonyms_mapping[value].append(tag_name)
-                if cluster.get('meta') is not None and cluster['meta'].get('synonyms') is not None:
-                    for synonym in cluster['meta']['synonyms']:
-                        synonyms_mapping[synonym].append(tag_name)
-        with open(self.__synonyms_path, 'wt', encoding='utf-8') as f:
-            f.write(json.dumps(synonyms_mapping))
-        latest_fingerprint = self.__get_misp_galaxy_fingerprint()
-        if latest_fingerprint is not None:
-            fingerprint_path = _ROOT_PATH / 'data' / 'synonymsToTagNames.fingerprint'
-            with open(fingerprint_path, 'wt', encoding='utf-8') as f:
-                f.write(latest_fingerprint)
-
-    @staticmethod
-    def __get_misp_galaxy_fingerprint():
-        galaxy_path = _ROOT_PATH / 'data' / 'misp-galaxy'
-        status = subprocess.Popen(
-            [
-                'git',
-                'submodule',
-                'status',
-                galaxy_path
-            ],
-            stdout=subprocess.PIPE
-        )
-        stdout = status.communicate()[0]
-        try:
-            return stdout.decode().split(' ')[1]
-        except IndexError:
-            return None
-
-    def __get_synonyms_mapping(self):
-        if not hasattr(self, '__synonyms_path'):
-            self.__synonyms_path = _ROOT_PATH / 'data' / 'synonymsToTagNames.json'
-            if not self.__synonyms_path.exists() or not self.__galaxies_up_to_date():
-                self.__generate_synonyms_mapping()
-        else:
-            if not self.__synonyms_path.exists():
-                self.__generate_synonyms_mapping()
-        self.__load_synonyms_mapping()
-
-    def __load_synonyms_mapping(self):
-        try:
-            with open(self.__synonyms_path, 'rt', encoding='utf-8') as f:
-                self.__synonyms_mapping = json.loads(f.read())
-        except FileNotFoundError:
-            message = f""
-            raise UnavailableSynonymsResourceError(message)
-        except json.JSONDecodeError:
-            message = f""
-            raise SynonymsResourceJSONError(message)
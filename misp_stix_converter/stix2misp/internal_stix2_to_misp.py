@@ -1,13 +1,15 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+from .. import datetime_from_stix_str
 from .exceptions import (AttributeFromPatternParsingError, UndefinedSTIXObjectError,
     UndefinedIndicatorError, UndefinedObservableError, UnknownParsingFunctionError)
 from .internal_stix2_mapping import InternalSTIX2Mapping
 from .stix2_to_misp import (
-    STIX2toMISPParser, _ATTACK_PATTERN_TYPING, _COURSE_OF_ACTION_TYPING,
+    LazySTIXObject, STIX2toMISPParser, _ATTACK_PATTERN_TYPING, _COURSE_OF_ACTION_TYPING,
     _GALAXY_OBJECTS_TYPING, _SDO_TYPING, _VULNERABILITY_TYPING)
 from collections import defaultdict
+from collections.abc import Mapping
 from copy import deepcopy
 from datetime import datetime
 from pymisp import MISPObject, MISPSighting
@@ -23,7 +25,7 @@ from stix2.v21.sdo import (CustomObject as CustomObject_v21, Identity as Identit
     Indicator as Indicator_v21, Malware as Malware_v21, ObservedData as ObservedData_v21,
     Opinion, Tool as Tool_v21)
 from stix2.v21.sro import Sighting as Sighting_v21
-from typing import Optional, Union
+from typing import Iterator, Optional, Union
 
 _attribute_additional_fields = (
     'category',
@@ -65,17 +67,80 @@ _SIGHTING_TYPING = Union[
     Sighting_v20,
     Sighting_v21
 ]
+_STIX_TIMESTAMPS = frozenset(
+    (
+        'accessed', 'account_created', 'account_expires', 'account_first_login',
+        'account_last_login', 'analysis_ended', 'analysis_started', 'atime', 'created',
+        'created_time', 'credential_last_changed', 'ctime', 'date', 'end', 'first_observed',
+        'first_seen', 'last_observed', 'last_seen', 'modified', 'modified_time', 'mtime',
+        'object_modified', 'password_last_changed', 'published', 'start', 'start_time',
+        'stop_time', 'submitted', 'time_date_stamp', 'valid_from', 'valid_until',
+        'validity_not_after', 'validity_not_before'
+    )
+)
+
+
+def _adapt_stix_value(value):
+    if isinstance(value, dict):
+        return STIXContentAdapter(value)
+    if isinstance(value, list):
+        return [_adapt_stix_value(item) for item in value]
+    return value
+
+
+class STIXContentAdapter(Mapping):
+    __slots__ = ('__content',)
+
+    def __init__(self, content: dict):
+        self.__content = content
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__content
+
+    def __getattr__(self, name: str):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __getitem__(self, key: str):
+        value = self.__content[key]
+        # Custom properties are kept as they are by stix2 as well
+        if key.startswith('x_'):
+            return value
+        if key in _STIX_TIMESTAMPS:
+            return datetime_from_stix_str(value)
+        return _adapt_stix_value(value)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__content)
+
+    def __len__(self) -> int:
+        return len(self.__content)
 
 
 class InternalSTIX2toMISPParser(STIX2toMISPParser):
-    def __init__(self, synonyms_path: Optional[str] = None):
+    def __init__(self, synonyms_path: Optional[str] = None, trusted_input: Optional[bool] = False):
         super().__init__(synonyms_path)
         self._mapping = InternalSTIX2Mapping()
+        self.__trusted_input = trusted_input
+
+    @property
+    def trusted_input(self) -> bool:
+        return self.__trusted_input
 
     ################################################################################
     #                        STIX OBJECTS LOADING FUNCTIONS                        #
     ################################################################################
 
+    def _wrap_stix_content(self, content: dict) -> Union[LazySTIXObject, STIXContentAdapter]:
+        if self.trusted_input:
+            # Bundles exported by MISP are read as they are, without building and validating stix2 objects
+            return STIXContentAdapter(content)
+        return LazySTIXObject(content)
+
     def _load_custom_attribute(self, custom_attribute: _CUSTOM_TYPING):
         try:
             self._custom_attribute[custom_attribute.id] = custom_attribute
@@ -1,10 +1,12 @@
 # -*- coding: utf-8 -*-
 #!/usr/bin/env python3
 
+import json
 import sys
-import time
-from .exceptions import (ObjectRefLoadingError, ObjectTypeLoadingError,
-    SynonymsResourceJSONError, UnavailableGalaxyResourcesError,
+from .. import timestamp_from_datetime
+from ..misp2stix.json_stream import JSONStream
+from .exceptions import (InvalidSTIXObjectError, ObjectRefLoadingError,
+    ObjectTypeLoadingError, SynonymsResourceJSONError, UnavailableGalaxyResourcesError,
     UnavailableSynonymsResourceError, UndefinedIndicatorError,
     UndefinedSTIXObjectError, UndefinedObservableError, UnknownAttributeTypeError,
     UnknownObjectNameError, UnknownParsingFunctionError, UnknownStixObjectTypeError)
@@ -13,8 +15,10 @@ from .importparser import STIXtoMISPParser
 from .internal_stix2_mapping import InternalSTIX2Mapping
 from collections import defaultdict
 from datetime import datetime
+from pathlib import Path
 from pymisp import AbstractMISP, MISPEvent, MISPAttribute, MISPObject
-from stix2.parsing import parse as stix2_parser
+from stix2.exceptions import STIXError
+from stix2.parsing import dict_to_stix2
 from stix2.v20.bundle import Bundle as Bundle_v20
 from stix2.v20.common import MarkingDefinition as MarkingDefinition_v20
 from stix2.v20.sdo import (AttackPattern as AttackPattern_v20, Campaign as Campaign_v20,
@@ -35,7 +39,7 @@ from stix2.v21.sdo import (AttackPattern as AttackPattern_v21, Campaign as Campa
     Malware as Malware_v21, ObservedData as ObservedData_v21, Note, Report as Report_v21,
     ThreatActor as ThreatActor_v21, Tool as Tool_v21, Vulnerability as Vulnerability_v21)
 from stix2.v21.sro import Relationship as Relationship_v21
-from typing import Optional, Union
+from typing import Iterable, Iterator, Optional, Union
 
 _LOADED_FEATURES = (
     '_attack_pattern',
@@ -54,6 +58,10 @@ _LOADED_FEATURES = (
     '_vulnerability'
 )
 _MISP_OBJECTS_PATH = AbstractMISP().misp_objects_path
+# MISP object templates loaded by the current process, by object name
+_MISP_OBJECT_TEMPLATES: dict = {}
+# Properties read while loading the bundle, served without building the stix2 object
+_RAW_PROPERTIES = ('created_by_ref', 'id', 'type')
 _OBSERVABLE_TYPES = Union[
     Artifact, AutonomousSystem, Directory, DomainName, EmailAddress, EmailMessage,
     File, IPv4Address, IPv6Address, MACAddress, Mutex, NetworkTraffic, Process,
@@ -102,6 +110,72 @@ _VULNERABILITY_TYPING = Union[
 ]
 
 
+def iter_stix_objects(filename: Union[Path, str]) -> Iterator[dict]:
+    with open(filename, 'rt', encoding='utf-8') as f:
+        stream = JSONStream(f)
+        for key in stream.iter_keys():
+            if key == 'objects':
+                yield from stream.iter_array()
+            else:
+                stream.skip()
+
+
+def load_misp_object_template(name: str) -> Optional[dict]:
+    # Templates are only read, the objects created with the same name share them
+    if name not in _MISP_OBJECT_TEMPLATES:
+        template_path = _MISP_OBJECTS_PATH / name / 'definition.json'
+        template = None
+        if template_path.exists():
+            with open(template_path, 'rt', encoding='utf-8') as f:
+                template = json.loads(f.read())
+        _MISP_OBJECT_TEMPLATES[name] = template
+    return _MISP_OBJECT_TEMPLATES[name]
+
+
+class LazySTIXObject:
+    __slots__ = ('__content', '__stix_object')
+
+    def __init__(self, content: dict):
+        self.__content = content
+        self.__stix_object = None
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.stix_object
+
+    def __getattr__(self, name: str):
+        if name in _RAW_PROPERTIES and self.__stix_object is None:
+            try:
+                return self.__content[name]
+            except KeyError:
+                raise AttributeError(name)
+        return getattr(self.stix_object, name)
+
+    def __getitem__(self, key: str):
+        return self.stix_object[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.stix_object)
+
+    def __len__(self) -> int:
+        return len(self.stix_object)
+
+    @property
+    def stix_object(self):
+        if self.__stix_object is None:
+            try:
+                self.__stix_object = dict_to_stix2(
+                    self.__content, allow_custom=True, interoperability=True
+                )
+            except (STIXError, TypeError, ValueError) as exception:
+                # The validation is deferred until the object is used, the error
+                # has to be reported by the parsing functions from then on
+                raise InvalidSTIXObjectError(
+                    f"{self.__content.get('id')}: {exception}"
+                )
+            self.__content = None
+        return self.__stix_object
+
+
 class STIX2toMISPParser(STIXtoMISPParser):
     def __init__(self, synonyms_path: Union[None, str]):
         super().__init__(synonyms_path)
@@ -131,26 +205,27 @@ class STIX2toMISPParser(STIXtoMISPParser):
     def load_stix_bundle(self, bundle: Union[Bundle_v20, Bundle_v21]):
         self._identifier = bundle.id
         self.__stix_version = bundle.spec_version if hasattr(bundle, 'spec_version') else '2.1'
-        n_report = 0
-        for stix_object in bundle.objects:
-            try:
-                object_type = stix_object.type
-            except AttributeError:
-                object_type = stix_object['type']
-            if object_type in ('grouping', 'report'):
-                n_report += 1
-            try:
-                feature = self._mapping.stix_object_loading_mapping[object_type]
-            except KeyError:
-                self._unable_to_load_stix_object_type_error(object_type)
-                continue
-            if hasattr(stix_object, 'created_by_ref'):
-                self._creators.add(stix_object.created_by_ref)
-            try:
-                getattr(self, feature)(stix_object)
-            except AttributeError as exception:
-                self._critical_error(exception)
-        self.__n_report = 2 if n_report >= 2 else n_report
+        self._load_stix_objects(bundle.objects)
+
+    def load_stix_content(self, filename: Union[Path, str]):
+        bundle = {}
+        objects_loaded = False
+        with open(filename, 'rt', encoding='utf-8') as f:
+            stream = JSONStream(f)
+            for key in stream.iter_keys():
+                if key != 'objects':
+                    bundle[key] = stream.decode()
+                elif 'id' in bundle:
+                    self._identifier = bundle['id']
+                    self._load_stix_objects(map(self._wrap_stix_content, stream.iter_array()))
+                    objects_loaded = True
+                else:
+                    stream.skip()
+        if not objects_loaded:
+            # The bundle id, used to report the loading errors, comes after its objects
+            self._identifier = bundle['id']
+            self._load_stix_objects(map(self._wrap_stix_content, iter_stix_objects(filename)))
+        self.__stix_version = bundle.get('spec_version', '2.1')
 
     def parse_stix_bundle(self, single_event: Optional[bool] = False):
         self.__single_event = single_event
@@ -161,20 +236,18 @@ class STIX2toMISPParser(STIXtoMISPParser):
         try:
             getattr(self, feature)()
         except (
+            InvalidSTIXObjectError,
             SynonymsResourceJSONError,
             UnavailableGalaxyResourcesError,
             UnavailableSynonymsResourceError
         ) as error:
             self._critical_error(error)
 
-    def parse_stix_content(self, filename: str):
+    def parse_stix_content(self, filename: Union[Path, str]):
         try:
-            with open(filename, 'rt', encoding='utf-8') as f:
-                bundle = stix2_parser(f.read(), allow_custom=True, interoperability=True)
+            self.load_stix_content(filename)
         except Exception as exception:
             sys.exit(exception)
-        self.load_stix_bundle(bundle)
-        del bundle
         self.parse_stix_bundle()
 
     @property
@@ -200,6 +273,32 @@ class STIX2toMISPParser(STIXtoMISPParser):
     #                        STIX OBJECTS LOADING FUNCTIONS                        #
     ################################################################################
 
+    def _load_stix_objects(self, stix_objects: Iterable):
+        n_report = 0
+        for stix_object in stix_objects:
+            try:
+                object_type = stix_object.type
+            except AttributeError:
+                object_type = stix_object['type']
+            if object_type in ('grouping', 'report'):
+                n_report += 1
+            try:
+                feature = self._mapping.stix_object_loading_mapping[object_type]
+            except KeyError:
+                self._unable_to_load_stix_object_type_error(object_type)
+                continue
+            if hasattr(stix_object, 'created_by_ref'):
+                self._creators.add(stix_object.created_by_ref)
+            try:
+                getattr(self, feature)(stix_object)
+            except AttributeError as exception:
+                self._critical_error(exception)
+        self.__n_report = 2 if n_report >= 2 else n_report
+
+    @staticmethod
+    def _wrap_stix_content(content: dict) -> LazySTIXObject:
+        return LazySTIXObject(content)
+
     @staticmethod
     def _build_data_to_load(stix_object) -> dict:
         return {
@@ -351,7 +450,9 @@ class STIX2toMISPParser(STIXtoMISPParser):
             stix_object = getattr(self, feature)[object_ref]
             if isinstance(stix_object, dict):
                 stix_object['used'] = True
-                return stix_object['stix_object']
+                stix_object = stix_object['stix_object']
+            if isinstance(stix_object, LazySTIXObject):
+                return stix_object.stix_object
             return stix_object
         except AttributeError:
             raise ObjectTypeLoadingError(object_type)
@@ -381,6 +482,8 @@ class STIX2toMISPParser(STIXtoMISPParser):
             raise UnknownParsingFunctionError(feature)
         try:
             parser(object_ref)
+        except InvalidSTIXObjectError as error:
+            self._invalid_stix_object_error(error)
         except ObjectRefLoadingError as error:
             self._object_ref_loading_error(error)
         except ObjectTypeLoadingError as error:
@@ -611,11 +714,19 @@ class STIX2toMISPParser(STIXtoMISPParser):
         return misp_event
 
     def _create_misp_object(self, name: str, stix_object: Optional[_SDO_TYPING] = None) -> MISPObject:
-        misp_object = MISPObject(
-            name,
-            misp_objects_path_custom=_MISP_OBJECTS_PATH,
-            force_timestamps=True
-        )
+        template = load_misp_object_template(name)
+        if template is None:
+            misp_object = MISPObject(
+                name,
+                misp_objects_path_custom=_MISP_OBJECTS_PATH,
+                force_timestamps=True
+            )
+        else:
+            misp_object = MISPObject(
+                name,
+                misp_objects_template_custom=template,
+                force_timestamps=True
+            )
         if stix_object is not None:
             try:
                 misp_object.uuid = stix_object.id.split('--')[-1]
@@ -700,8 +811,4 @@ class STIX2toMISPParser(STIXtoMISPParser):
 
     @staticmethod
     def _timestamp_from_date(date: datetime) -> int:
-        return int(date.timestamp())
-        try:
-            return int(date.timestamp())
-        except AttributeError:
-            return int(time.mktime(time.strptime(date.split('+')[0], "%Y-%m-%dT%H:%M:%S.%fZ")))
+        return timestamp_from_datetime(date)
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import pickle
+from .exceptions import (SynonymsResourceJSONError, UnavailableGalaxyResourcesError,
+    UnavailableSynonymsResourceError)
+from collections import defaultdict
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+_ROOT_PATH = Path(__file__).parents[1].resolve()
+_CLUSTERS_PATH = _ROOT_PATH / 'data' / 'misp-galaxy' / 'clusters'
+_INDEX_PATH = _ROOT_PATH / 'data' / 'synonymsToTagNames.pickle'
+_INDEX_VERSION = 2
+_NGRAM_SIZE = 3
+# Synonyms mappings already loaded by the current process, by index or JSON file path
+_SYNONYMS_INDEXES: dict = {}
+
+
+def build_synonyms_index(clusters_path: Union[Path, str] = _CLUSTERS_PATH,
+                         index_path: Union[Path, str] = _INDEX_PATH) -> Path:
+    """
+    Compiles the MISP galaxy clusters into the on-disk index mapping each
+    cluster value and synonym with the galaxy tag names it stands for.
+
+    :param clusters_path: Path to the MISP galaxy clusters (defaults to the
+        submodule)
+    :param index_path: Path of the index to write
+    :return: The path of the written index
+    """
+    clusters_path = Path(clusters_path)
+    index_path = Path(index_path)
+    if not clusters_path.exists():
+        raise UnavailableGalaxyResourcesError(clusters_path)
+    fingerprint = _clusters_fingerprint(clusters_path)
+    synonyms_mapping = _generate_synonyms_mapping(clusters_path)
+    _write_index(index_path, fingerprint, synonyms_mapping)
+    _SYNONYMS_INDEXES[index_path.resolve()] = (fingerprint, synonyms_mapping)
+    return index_path
+
+
+def load_synonyms_mapping(clusters_path: Union[Path, str] = _CLUSTERS_PATH,
+                          index_path: Union[Path, str] = _INDEX_PATH) -> 'SynonymsMapping':
+    """
+    Returns the synonyms mapping shared by the parsers of the current process.
+    The index is compiled again when the cluster files changed since it was
+    written, and used as it is when the clusters are not available.
+
+    :param clusters_path: Path to the MISP galaxy clusters (defaults to the
+        submodule)
+    :param index_path: Path of the index to read, or to write if it is missing
+        or outdated
+    :return: The synonyms mapping, which must not be modified
+    """
+    clusters_path = Path(clusters_path)
+    index_path = Path(index_path).resolve()
+    fingerprint = _clusters_fingerprint(clusters_path) if clusters_path.exists() else None
+    if index_path in _SYNONYMS_INDEXES:
+        index_fingerprint, synonyms_mapping = _SYNONYMS_INDEXES[index_path]
+        if fingerprint is None or fingerprint == index_fingerprint:
+            return synonyms_mapping
+    index = _read_index(index_path)
+    if index is not None and (fingerprint is None or fingerprint == index['fingerprint']):
+        _SYNONYMS_INDEXES[index_path] = (index['fingerprint'], index['synonyms_mapping'])
+        return index['synonyms_mapping']
+    if fingerprint is None:
+        raise UnavailableGalaxyResourcesError(clusters_path)
+    synonyms_mapping = _generate_synonyms_mapping(clusters_path)
+    try:
+        _write_index(index_path, fingerprint, synonyms_mapping)
+    except OSError:
+        pass
+    _SYNONYMS_INDEXES[index_path] = (fingerprint, synonyms_mapping)
+    return synonyms_mapping
+
+
+def load_synonyms_file(synonyms_path: Union[Path, str]) -> 'SynonymsMapping':
+    """
+    Returns the synonyms mapping defined in a user provided JSON file, mapping
+    galaxy names and synonyms with their galaxy tag names. The file is only
+    read, and read again when it changed since it was loaded.
+
+    :param synonyms_path: Path to the JSON synonyms mapping
+    :return: The synonyms mapping, which must not be modified
+    """
+    synonyms_path = Path(synonyms_path).resolve()
+    try:
+        stat = synonyms_path.stat()
+    except OSError:
+        raise UnavailableSynonymsResourceError(synonyms_path)
+    fingerprint = json.dumps([stat.st_size, stat.st_mtime_ns])
+    if synonyms_path in _SYNONYMS_INDEXES:
+        file_fingerprint, synonyms_mapping = _SYNONYMS_INDEXES[synonyms_path]
+        if fingerprint == file_fingerprint:
+            return synonyms_mapping
+    try:
+        with open(synonyms_path, 'rt', encoding='utf-8') as f:
+            synonyms_mapping = SynonymsMapping(json.loads(f.read()))
+    except OSError:
+        raise UnavailableSynonymsResourceError(synonyms_path)
+    except (json.JSONDecodeError, TypeError, ValueError):
+        raise SynonymsResourceJSONError(synonyms_path)
+    _SYNONYMS_INDEXES[synonyms_path] = (fingerprint, synonyms_mapping)
+    return synonyms_mapping
+
+
+def _clusters_fingerprint(clusters_path: Path) -> str:
+    fingerprint = []
+    for filename in sorted(clusters_path.glob('*.json')):
+        stat = filename.stat()
+        fingerprint.append([filename.name, stat.st_size, stat.st_mtime_ns])
+    return json.dumps(fingerprint)
+
+
+def _generate_synonyms_mapping(clusters_path: Path) -> 'SynonymsMapping':
+    synonyms_mapping = defaultdict(list)
+    for filename in sorted(clusters_path.glob('*.json')):
+        with open(filename, 'rt', encoding='utf-8') as f:
+            cluster_definition = json.loads(f.read())
+        cluster_type = f"misp-galaxy:{cluster_definition['type']}"
+        for cluster in cluster_definition['values']:
+            value = cluster['value']
+            tag_name = f'{cluster_type}="{value}"'
+            synonyms_mapping[value].append(tag_name)
+            if cluster.get('meta') is not None and cluster['meta'].get('synonyms') is not None:
+                for synonym in cluster['meta']['synonyms']:
+                    synonyms_mapping[synonym].append(tag_name)
+    return SynonymsMapping(synonyms_mapping)
+
+
+def _read_index(index_path: Path) -> Optional[dict]:
+    try:
+        with open(index_path, 'rb') as f:
+            index = pickle.load(f)
+    except (OSError, EOFError, AttributeError, ImportError, IndexError, pickle.UnpicklingError):
+        return None
+    if not isinstance(index, dict) or index.get('version') != _INDEX_VERSION:
+        return None
+    return index
+
+
+def _write_index(index_path: Path, fingerprint: str, synonyms_mapping: 'SynonymsMapping'):
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = index_path.with_name(f'{index_path.name}.{os.getpid()}.tmp')
+    index = {
+        'version': _INDEX_VERSION,
+        'fingerprint': fingerprint,
+        'synonyms_mapping': synonyms_mapping
+    }
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, index_path)
+
+
+class SynonymsMapping(dict):
+    __names: Optional[list] = None
+    __ngrams: Optional[dict] = None
+
+    def __getstate__(self) -> dict:
+        # The n-grams index is built again on demand rather than stored
+        return {}
+
+    def first_containing(self, value: str) -> Union[list, None]:
+        """
+        Looks for the first name of the mapping, in its order, that contains
+        the given value, as a linear scan over the names would find it.
+
+        :param value: The value to look for in the galaxy names and synonyms
+        :return: The tag names of the first matching name, if any
+        """
+        if self.__ngrams is None:
+            self.__build_ngrams_index()
+        for position in self.__candidates(value):
+            name = self.__names[position]
+            if value in name:
+                return self[name]
+
+    def __build_ngrams_index(self):
+        names = list(self)
+        ngrams = defaultdict(list)
+        for position, name in enumerate(names):
+            for ngram in {name[index:index + _NGRAM_SIZE] for index in range(len(name) - _NGRAM_SIZE + 1)}:
+                ngrams[ngram].append(position)
+        self.__names = names
+        self.__ngrams = dict(ngrams)
+
+    def __candidates(self, value: str) -> Iterable[int]:
+        if len(value) < _NGRAM_SIZE:
+            return range(len(self.__names))
+        # Any name containing the value contains each of its n-grams, the rarest one narrows the scan the most
+        postings = []
+        for index in range(len(value) - _NGRAM_SIZE + 1):
+            posting = self.__ngrams.get(value[index:index + _NGRAM_SIZE])
+            if posting is None:
+                return ()
+            postings.append(posting)
+        return min(postings, key=len)
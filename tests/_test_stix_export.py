@@ -4,10 +4,11 @@
 import json
 import os
 import unittest
+from copy import deepcopy
 from datetime import datetime
 from pathlib import Path
 from stix.core import STIXPackage
-from uuid import uuid5, UUID
+from uuid import uuid4, uuid5, UUID
 from ._test_stix import TestSTIX2
 
 _DEFAULT_ORGNAME = 'MISP'
@@ -486,6 +487,46 @@ class TestSTIX2Export(TestSTIX2):
             for attribute in misp_object['Attribute']:
                 attribute['to_ids'] = False
 
+    def _run_attributes_batch_tests(self, attributes, reference_parser, validated_class):
+        batch = []
+        for attribute in attributes:
+            attribute['uuid'] = str(uuid4())
+            duplicate = deepcopy(attribute)
+            duplicate['uuid'] = str(uuid4())
+            batch.extend((attribute, duplicate))
+        quoted = deepcopy(attributes[-1])
+        quoted.update({'uuid': str(uuid4()), 'value': f"{quoted['value']}?q='quoted'"})
+        observable = deepcopy(attributes[0])
+        observable.update({'uuid': str(uuid4()), 'to_ids': False})
+        invalid = deepcopy(attributes[0])
+        invalid.update({'uuid': str(uuid4()), 'type': 'md5', 'value': 'invalid md5'})
+        batch.extend((quoted, observable, invalid))
+        self.parser.parse_misp_attributes(batch)
+        reference_parser.parse_misp_attributes([])
+        for attribute in batch:
+            reference_parser._resolve_attribute(attribute)
+        stix_objects = self.parser.stix_objects
+        self.assertEqual(
+            [stix_object.serialize() for stix_object in stix_objects],
+            [stix_object.serialize() for stix_object in reference_parser.stix_objects]
+        )
+        errors = self.parser.errors['attributes collection']
+        self.assertEqual(len(errors), 1)
+        self.assertTrue(errors[0].startswith(f"Error with the md5 attribute: invalid md5 (uuid: {invalid['uuid']})"))
+        self.assertEqual(stix_objects[-1].id, f"x-misp-attribute--{invalid['uuid']}")
+        indicators = [stix_object for stix_object in stix_objects if stix_object.type == 'indicator']
+        self.assertEqual(len(indicators), len(batch) - 2)
+        self.assertNotIsInstance(indicators[0], validated_class)
+        for indicator in indicators[1::2]:
+            self.assertIsInstance(indicator, validated_class)
+        kill_chain_phases = {}
+        for indicator in indicators:
+            kill_chain_phase = indicator.kill_chain_phases[0]
+            category = kill_chain_phase.phase_name
+            self.assertIs(kill_chain_phases.setdefault(category, kill_chain_phase), kill_chain_phase)
+            self.assertEqual(indicator.created_by_ref, self.parser.identity_id)
+        return indicators
+
     def _run_custom_attribute_tests(self, attribute, custom_object, object_ref, identity_id):
         attribute_type = attribute['type']
         category = attribute['category']
@@ -0,0 +1,359 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import argparse
+import inspect
+import json
+import platform
+import subprocess
+import sys
+import tracemalloc
+import warnings
+from base64 import b64encode
+from copy import deepcopy
+from datetime import datetime, timezone
+from misp_stix_converter import (
+    ExternalSTIX2toMISPParser, InternalSTIX2toMISPParser, MISPtoSTIX1EventsParser,
+    MISPtoSTIX20Parser, MISPtoSTIX21Parser, misp_to_stix1, misp_to_stix2_0, misp_to_stix2_1)
+from pathlib import Path
+from random import Random
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from uuid import UUID
+from . import test_events
+
+_EXPORTS = ('misp_to_stix1', 'misp_to_stix20', 'misp_to_stix21')
+_IMPORTS = (
+    'internal_stix20_to_misp', 'internal_stix21_to_misp',
+    'trusted_stix20_to_misp', 'trusted_stix21_to_misp',
+    'external_stix20_to_misp', 'external_stix21_to_misp'
+)
+_MICROBENCHMARKS = ('stix1_ttp_references', 'stix2_object_references', 'stix2_pattern_escaping')
+_UUID_FIELDS = ('uuid', 'referenced_uuid', 'object_uuid')
+
+
+################################################################################
+#                           SYNTHETIC EVENTS CREATION                          #
+################################################################################
+
+def _is_convertible(event: dict) -> bool:
+    # Only the fixtures every benchmarked conversion supports are used as templates
+    try:
+        MISPtoSTIX1EventsParser('MISP', '1.1.1').parse_misp_event(deepcopy(event))
+        for parser in (MISPtoSTIX20Parser(), MISPtoSTIX21Parser()):
+            parser.parse_misp_event(deepcopy(event))
+            for import_parser in (InternalSTIX2toMISPParser(), ExternalSTIX2toMISPParser()):
+                import_parser.load_stix_bundle(parser.bundle)
+                import_parser.parse_stix_bundle()
+    except Exception:
+        return False
+    return True
+
+
+class EventGenerator:
+    def __init__(self, seed: int = 0):
+        self.__random = Random(seed)
+        self.__attributes = []
+        self.__galaxies = []
+        self.__object_groups = []
+        for name, builder in inspect.getmembers(test_events, inspect.isfunction):
+            if not name.startswith('get_event_with_'):
+                continue
+            parameters = inspect.signature(builder).parameters.values()
+            if any(parameter.default is parameter.empty for parameter in parameters):
+                continue
+            event = builder()
+            if not _is_convertible(event):
+                continue
+            event = event['Event']
+            if event.get('Object'):
+                if all('timestamp' in misp_object for misp_object in event['Object']):
+                    self.__object_groups.append(event['Object'])
+            elif event.get('Attribute'):
+                self.__attributes.extend(
+                    attribute for attribute in event['Attribute'] if 'timestamp' in attribute
+                )
+            if event.get('Galaxy'):
+                self.__galaxies.extend(event['Galaxy'])
+        self.__galaxies = [
+            galaxy for galaxy in self.__galaxies if self.__is_attribute_galaxy(galaxy)
+        ]
+
+    def generate_event(self, attributes: int, objects: int = 0, galaxy_density: float = 0.0,
+                       attachment_size: int = 0) -> dict:
+        event = test_events.get_base_event()
+        event['Event']['uuid'] = self.__uuid()
+        data = b64encode(bytes(self.__random.getrandbits(8) for _ in range(attachment_size))).decode()
+        for index in range(attributes):
+            attribute = self.__remap_uuids(
+                deepcopy(self.__attributes[index % len(self.__attributes)])
+            )
+            if attachment_size and 'data' in attribute:
+                attribute['data'] = data
+            if self.__galaxies and self.__random.random() < galaxy_density:
+                attribute['Galaxy'] = [deepcopy(self.__random.choice(self.__galaxies))]
+            event['Event']['Attribute'].append(attribute)
+        index = 0
+        while len(event['Event']['Object']) < objects:
+            group = self.__remap_uuids(
+                deepcopy(self.__object_groups[index % len(self.__object_groups)])
+            )
+            for misp_object in group:
+                for attribute in misp_object['Attribute']:
+                    if attachment_size and 'data' in attribute:
+                        attribute['data'] = data
+            event['Event']['Object'].extend(group)
+            index += 1
+        return event
+
+    def generate_object_references_event(self, references: int) -> dict:
+        # Ring of attack-pattern objects, each referencing the next one, converted before its target
+        event = test_events.get_base_event()
+        event['Event']['uuid'] = self.__uuid()
+        template = test_events.get_event_with_attack_pattern_object()['Event']['Object'][0]
+        for _ in range(references):
+            misp_object = deepcopy(template)
+            misp_object['uuid'] = self.__uuid()
+            event['Event']['Object'].append(misp_object)
+        for index, misp_object in enumerate(event['Event']['Object']):
+            referenced_object = event['Event']['Object'][(index + 1) % references]
+            misp_object['ObjectReference'] = [
+                {
+                    'referenced_uuid': referenced_object['uuid'],
+                    'relationship_type': 'related-to'
+                }
+            ]
+        return event
+
+    def generate_pattern_values(self, values: int) -> list:
+        # Values of the attributes and object attributes, as they are escaped in the STIX 2 patterns
+        pool = [attribute['value'] for attribute in self.__attributes]
+        for group in self.__object_groups:
+            for misp_object in group:
+                pool.extend(attribute['value'] for attribute in misp_object['Attribute'])
+        return [pool[index % len(pool)] for index in range(values)]
+
+    def generate_ttp_references_event(self, ttps: int) -> dict:
+        # Chain of attack-pattern objects, each referencing the previous TTP
+        event = test_events.get_base_event()
+        event['Event']['uuid'] = self.__uuid()
+        template = test_events.get_event_with_attack_pattern_object()['Event']['Object'][0]
+        for _ in range(ttps):
+            misp_object = deepcopy(template)
+            misp_object['uuid'] = self.__uuid()
+            if event['Event']['Object']:
+                misp_object['ObjectReference'] = [
+                    {
+                        'referenced_uuid': event['Event']['Object'][-1]['uuid'],
+                        'relationship_type': 'related-to'
+                    }
+                ]
+            event['Event']['Object'].append(misp_object)
+        return event
+
+    def __is_attribute_galaxy(self, galaxy: dict) -> bool:
+        event = test_events.get_base_event()
+        # Galaxies are also attached to the indicators built from to_ids attributes
+        attribute = deepcopy(
+            next(attribute for attribute in self.__attributes if attribute.get('to_ids'))
+        )
+        attribute['Galaxy'] = [galaxy]
+        event['Event']['Attribute'].append(attribute)
+        return _is_convertible(event)
+
+    def __remap_uuids(self, content):
+        uuids = {}
+        self.__collect_uuids(content, uuids)
+        return self.__replace_uuids(content, uuids)
+
+    def __collect_uuids(self, content, uuids: dict):
+        if isinstance(content, dict):
+            if 'GalaxyCluster' in content:
+                return
+            if isinstance(content.get('uuid'), str):
+                uuids.setdefault(content['uuid'], self.__uuid())
+            for value in content.values():
+                self.__collect_uuids(value, uuids)
+        elif isinstance(content, list):
+            for value in content:
+                self.__collect_uuids(value, uuids)
+
+    def __replace_uuids(self, content, uuids: dict):
+        if isinstance(content, dict):
+            if 'GalaxyCluster' in content:
+                return content
+            for key, value in content.items():
+                if key in _UUID_FIELDS and value in uuids:
+                    content[key] = uuids[value]
+                else:
+                    self.__replace_uuids(value, uuids)
+        elif isinstance(content, list):
+            for value in content:
+                self.__replace_uuids(value, uuids)
+        return content
+
+    def __uuid(self) -> str:
+        return str(UUID(int=self.__random.getrandbits(128), version=4))
+
+
+################################################################################
+#                            CONVERSION BENCHMARKS                             #
+################################################################################
+
+def _import_stix2(parser_class, filename: Path, **kwargs):
+    parser = parser_class(**kwargs)
+    parser.parse_stix_content(filename)
+    return parser
+
+
+def _conversions(event_file: Path) -> dict:
+    bundles = {version: Path(f'{event_file}.stix{version}.json') for version in ('20', '21')}
+    return {
+        'misp_to_stix1': lambda: misp_to_stix1(event_file, 'xml', '1.1.1'),
+        'misp_to_stix20': lambda: misp_to_stix2_0(event_file),
+        'misp_to_stix21': lambda: misp_to_stix2_1(event_file),
+        'internal_stix20_to_misp': lambda: _import_stix2(InternalSTIX2toMISPParser, bundles['20']),
+        'internal_stix21_to_misp': lambda: _import_stix2(InternalSTIX2toMISPParser, bundles['21']),
+        'trusted_stix20_to_misp': lambda: _import_stix2(InternalSTIX2toMISPParser, bundles['20'], trusted_input=True),
+        'trusted_stix21_to_misp': lambda: _import_stix2(InternalSTIX2toMISPParser, bundles['21'], trusted_input=True),
+        'external_stix20_to_misp': lambda: _import_stix2(ExternalSTIX2toMISPParser, bundles['20']),
+        'external_stix21_to_misp': lambda: _import_stix2(ExternalSTIX2toMISPParser, bundles['21'])
+    }
+
+
+def _measure(conversion, repeat: int) -> dict:
+    durations = []
+    for _ in range(repeat):
+        start = perf_counter()
+        conversion()
+        durations.append(perf_counter() - start)
+    tracemalloc.start()
+    try:
+        conversion()
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {
+        'durations': durations,
+        'best': min(durations),
+        'mean': sum(durations) / len(durations),
+        'peak_memory': peak_memory
+    }
+
+
+def run_benchmarks(sizes: list, objects: int = None, galaxy_density: float = 0.05,
+                   attachment_size: int = 1024, repeat: int = 3, seed: int = 0,
+                   conversions: tuple = _EXPORTS + _IMPORTS + _MICROBENCHMARKS,
+                   ttps: int = 10000, pattern_values: int = 100000,
+                   references: int = 50000) -> dict:
+    generator = EventGenerator(seed)
+    results = []
+    if 'stix1_ttp_references' in conversions:
+        ttp_event = generator.generate_ttp_references_event(ttps)
+        result = {'conversion': 'stix1_ttp_references', 'ttps': ttps}
+        result.update(
+            _measure(
+                lambda: MISPtoSTIX1EventsParser('MISP', '1.1.1').parse_misp_event(ttp_event),
+                repeat
+            )
+        )
+        results.append(result)
+    if 'stix2_object_references' in conversions:
+        # Measured at two sizes, the relationship targets resolution should scale linearly
+        for n_references in (references // 2, references):
+            references_event = generator.generate_object_references_event(n_references)
+            result = {'conversion': 'stix2_object_references', 'references': n_references}
+            result.update(
+                _measure(
+                    lambda: MISPtoSTIX21Parser().parse_misp_event(references_event),
+                    repeat
+                )
+            )
+            results.append(result)
+    if 'stix2_pattern_escaping' in conversions:
+        values = generator.generate_pattern_values(pattern_values)
+        parser = MISPtoSTIX21Parser()
+        result = {'conversion': 'stix2_pattern_escaping', 'values': pattern_values}
+        result.update(
+            _measure(
+                lambda: [parser._handle_value_for_pattern(value) for value in values],
+                repeat
+            )
+        )
+        results.append(result)
+    with TemporaryDirectory() as tmp_directory:
+        for size in sizes:
+            n_objects = size // 10 if objects is None else objects
+            event = generator.generate_event(size, n_objects, galaxy_density, attachment_size)
+            event_file = Path(tmp_directory) / f'event_{size}.json'
+            with open(event_file, 'wt', encoding='utf-8') as f:
+                f.write(json.dumps(event))
+            for version, conversion in zip(('20', '21'), (misp_to_stix2_0, misp_to_stix2_1)):
+                conversion(event_file)
+                Path(f'{event_file}.out').replace(f'{event_file}.stix{version}.json')
+            parameters = {
+                'attributes': len(event['Event']['Attribute']),
+                'objects': len(event['Event']['Object']),
+                'galaxy_density': galaxy_density,
+                'attachment_size': attachment_size,
+                'input_size': event_file.stat().st_size
+            }
+            del event
+            for name, conversion in _conversions(event_file).items():
+                if name not in conversions:
+                    continue
+                result = {'conversion': name, **parameters}
+                result.update(_measure(conversion, repeat))
+                results.append(result)
+    return {'metadata': _metadata(repeat, seed), 'results': results}
+
+
+def _metadata(repeat: int, seed: int) -> dict:
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+            cwd=Path(__file__).parent, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'date': datetime.now(timezone.utc).isoformat(),
+        'platform': platform.platform(),
+        'python': platform.python_version(),
+        'repeat': repeat,
+        'seed': seed
+    }
+
+
+def main():
+    warnings.simplefilter('ignore')
+    parser = argparse.ArgumentParser(description='Benchmark MISP <-> STIX conversions on synthetic events.')
+    parser.add_argument('-a', '--attributes', nargs='+', type=int, default=[1000, 10000], help='Number(s) of attributes of the generated events.')
+    parser.add_argument('-O', '--objects', type=int, help='Number of objects per event (default: a tenth of the attributes).')
+    parser.add_argument('-g', '--galaxy_density', type=float, default=0.05, help='Ratio of attributes with a galaxy attached.')
+    parser.add_argument('-s', '--attachment_size', type=int, default=1024, help='Size in bytes of the attachment and malware-sample data.')
+    parser.add_argument('-r', '--repeat', type=int, default=3, help='Number of timed runs per conversion.')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the events generator.')
+    parser.add_argument('-t', '--ttps', type=int, default=10000, help='Number of related TTPs in the STIX 1 TTP references benchmark.')
+    parser.add_argument('--references', type=int, default=50000, help='Number of objects, each referencing another one, in the STIX 2 object references benchmark (also run with half of them).')
+    parser.add_argument('-p', '--pattern_values', type=int, default=100000, help='Number of values escaped in the STIX 2 pattern escaping benchmark.')
+    parser.add_argument('-c', '--conversions', nargs='+', choices=_EXPORTS + _IMPORTS + _MICROBENCHMARKS, default=_EXPORTS + _IMPORTS + _MICROBENCHMARKS, help='Conversions to benchmark.')
+    parser.add_argument('-o', '--output', type=Path, help='Path of the JSON results file (default: standard output).')
+    args = parser.parse_args()
+    results = run_benchmarks(
+        args.attributes, objects=args.objects, galaxy_density=args.galaxy_density,
+        attachment_size=args.attachment_size, repeat=args.repeat, seed=args.seed,
+        conversions=tuple(args.conversions), ttps=args.ttps,
+        pattern_values=args.pattern_values, references=args.references
+    )
+    if args.output is None:
+        json.dump(results, sys.stdout, indent=4)
+        sys.stdout.write('\n')
+    else:
+        with open(args.output, 'wt', encoding='utf-8') as f:
+            f.write(json.dumps(results, indent=4))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import unittest
+from misp_stix_converter import ExternalSTIX2toMISPParser
+from .test_stix20_bundles import TestSTIX20Bundles
+from .test_stix21_bundles import TestSTIX21Bundles
+
+
+class TestExternalSTIX2Import(unittest.TestCase):
+    def setUp(self):
+        self.parser = ExternalSTIX2toMISPParser()
+
+    def _check_observed_data_mapping(self, bundle, feature):
+        self.parser.load_stix_bundle(bundle)
+        self.parser.parse_stix_bundle()
+        self.assertEqual(
+            self.parser.errors[bundle.id],
+            {f'Unknown STIX parsing function name: {feature}'}
+        )
+
+    def test_stix20_observable_objects_mapping(self):
+        bundle = TestSTIX20Bundles.get_bundle_with_domain_ip_observable_objects()
+        observed_data = bundle.objects[-1]
+        self.assertEqual(
+            self.parser._extract_types_from_observable_objects(observed_data.objects),
+            'domain-name_ipv4-addr'
+        )
+        self.assertEqual(
+            self.parser._handle_observable_objects_mapping(observed_data.objects),
+            '_parse_domain_ip_observable_objects'
+        )
+        self._check_observed_data_mapping(bundle, '_parse_domain_ip_observable_objects')
+
+    def test_stix21_observable_refs_mapping(self):
+        bundle = TestSTIX21Bundles.get_bundle_with_domain_ip_observable_objects()
+        self.parser.load_stix_bundle(bundle)
+        observed_data = bundle.objects[2]
+        self.assertEqual(
+            self.parser._handle_observable_mapping(observed_data),
+            '_parse_domain_ip_observable_refs'
+        )
+        self.parser = ExternalSTIX2toMISPParser()
+        self._check_observed_data_mapping(bundle, '_parse_domain_ip_observable_refs')
@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import sqlite3
+import unittest
+from misp_stix_converter import MISPtoSTIX21Parser, build_galaxies_catalog
+from misp_stix_converter.misp2stix.galaxies_catalog import GalaxiesCatalog
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from .test_events import get_event_with_attack_pattern_galaxy
+
+_MITRE_IDENTITY = {
+    "type": "identity",
+    "id": "identity--c78cb6e5-0c4b-4611-8297-d1b8b55e40b5",
+    "created": "2017-06-01T00:00:00.000Z",
+    "modified": "2017-06-01T00:00:00.000Z",
+    "name": "The MITRE Corporation",
+    "identity_class": "organization",
+    "spec_version": "2.1"
+}
+_ATTACK_PATTERN = {
+    "type": "attack-pattern",
+    "id": "attack-pattern--dcaa092b-7de9-4a21-977f-7fcb77e89c48",
+    "created": "2017-12-14T16:46:06.044Z",
+    "modified": "2021-02-09T13:29:41.012Z",
+    "created_by_ref": "identity--c78cb6e5-0c4b-4611-8297-d1b8b55e40b5",
+    "name": "Access Token Manipulation",
+    "spec_version": "2.1",
+    "external_references": [
+        {
+            "source_name": "mitre-attack",
+            "external_id": "T1134",
+            "url": "https://attack.mitre.org/techniques/T1134"
+        },
+        {
+            "source_name": "capec",
+            "external_id": "CAPEC-633",
+            "url": "https://capec.mitre.org/data/definitions/633.html"
+        }
+    ]
+}
+
+
+class TestGalaxiesCatalog(unittest.TestCase):
+    def setUp(self):
+        self._tmp_directory = TemporaryDirectory()
+        self._cti_path = Path(self._tmp_directory.name) / 'cti'
+        self._catalog_path = Path(self._tmp_directory.name) / 'galaxiesCatalog.db'
+        self._catalogs = []
+        self._write_bundle(
+            'enterprise-attack', _MITRE_IDENTITY, _ATTACK_PATTERN,
+            dict(_ATTACK_PATTERN, id='attack-pattern--1e3e9c77-2a1b-4a4c-9f4b-3ff87cf1b4c3', name='T1134'),
+            dict(_ATTACK_PATTERN, id='attack-pattern--8c4c3ba6-4f2a-4d0d-8d87-6bb2d0f6e0a4', name='T1134')
+        )
+
+    def tearDown(self):
+        for catalog in self._catalogs:
+            catalog.close()
+        self._tmp_directory.cleanup()
+
+    def _write_bundle(self, name, *stix_objects):
+        bundle_path = self._cti_path / name
+        bundle_path.mkdir(parents=True, exist_ok=True)
+        with open(bundle_path / f'{name}.json', 'wt', encoding='utf-8') as f:
+            f.write(json.dumps({'type': 'bundle', 'objects': stix_objects}))
+
+    def _load_catalog(self, catalog_path=None):
+        catalog = GalaxiesCatalog.load(
+            cti_path=self._cti_path,
+            catalog_path=self._catalog_path if catalog_path is None else catalog_path
+        )
+        self._catalogs.append(catalog)
+        return catalog
+
+    def test_catalog_entries(self):
+        self.assertEqual(build_galaxies_catalog(self._cti_path, self._catalog_path), self._catalog_path)
+        catalog = self._load_catalog()
+        self.assertIn('Access Token Manipulation', catalog)
+        self.assertNotIn('Process Injection', catalog)
+        self.assertEqual(
+            catalog.match_by_name('Access Token Manipulation', 'attack-pattern'),
+            _ATTACK_PATTERN
+        )
+        self.assertIsNone(catalog.match_by_name('Access Token Manipulation', 'malware'))
+        self.assertIn('attack-pattern', catalog['T1134'])
+        self.assertIsNone(catalog.match_by_name('T1134', 'attack-pattern'))
+        self.assertNotIn('CAPEC-633', catalog)
+        self.assertEqual(catalog.identity(_MITRE_IDENTITY['id']), _MITRE_IDENTITY)
+
+    def test_catalog_references_matching(self):
+        catalog = self._load_catalog()
+        args = ('T1134', 'attack-pattern')
+        self.assertIsNone(catalog.match_by_references(*args, 'external_id', ['T1134']))
+        self.assertIsNone(catalog.match_by_references(*args, 'external_id', ['CAPEC-633']))
+        self._write_bundle(
+            'mobile-attack',
+            dict(
+                _ATTACK_PATTERN,
+                id='attack-pattern--43e7dc91-05b2-474c-b9ac-2ed4fe101f4d',
+                external_references=[
+                    {
+                        'source_name': 'mitre-mobile-attack',
+                        'external_id': 'T1631',
+                        'url': 'https://attack.mitre.org/techniques/T1631'
+                    }
+                ]
+            )
+        )
+        catalog.close()
+        catalog = self._load_catalog()
+        args = ('Access Token Manipulation', 'attack-pattern')
+        self.assertIsNone(catalog.match_by_name(*args))
+        self.assertEqual(
+            catalog.match_by_references(*args, 'external_id', ['CAPEC-633'])['id'],
+            _ATTACK_PATTERN['id']
+        )
+        self.assertEqual(
+            catalog.match_by_references(*args, 'url', ['https://attack.mitre.org/techniques/T1631'])['id'],
+            'attack-pattern--43e7dc91-05b2-474c-b9ac-2ed4fe101f4d'
+        )
+        self.assertIsNone(catalog.match_by_references(*args, 'external_id', ['T1134', 'T1631']))
+        self.assertIsNone(catalog.match_by_references(*args, 'external_id', ['T1055']))
+
+    def test_catalog_update(self):
+        catalog = self._load_catalog()
+        self.assertTrue(self._catalog_path.exists())
+        self.assertNotIn('Process Injection', catalog)
+        self._write_bundle(
+            'mobile-attack',
+            dict(_ATTACK_PATTERN, id='attack-pattern--43e7dc91-05b2-474c-b9ac-2ed4fe101f4d', name='Process Injection')
+        )
+        # The loaded catalog is kept by the process until it is closed
+        self.assertIs(self._load_catalog(), catalog)
+        catalog.close()
+        self.assertIn('Process Injection', self._load_catalog())
+
+    def test_catalog_shared_by_the_process(self):
+        catalog = self._load_catalog()
+        self.assertIs(self._load_catalog(), catalog)
+        build_galaxies_catalog(self._cti_path, self._catalog_path)
+        with self.assertRaises(sqlite3.ProgrammingError):
+            catalog['Access Token Manipulation']
+        updated_catalog = self._load_catalog()
+        self.assertIsNot(updated_catalog, catalog)
+        self.assertIn('Access Token Manipulation', updated_catalog)
+        updated_catalog.close()
+        self.assertIsNot(self._load_catalog(), updated_catalog)
+
+    def test_catalog_without_cti_bundles(self):
+        build_galaxies_catalog(self._cti_path, self._catalog_path)
+        for filename in self._cti_path.glob('*/*.json'):
+            os.remove(filename)
+            os.rmdir(filename.parent)
+        os.rmdir(self._cti_path)
+        catalog = self._load_catalog()
+        self.assertIn('Access Token Manipulation', catalog)
+        catalog.close()
+        os.remove(self._catalog_path)
+        self.assertNotIn('Access Token Manipulation', self._load_catalog())
+
+    def test_catalog_in_read_only_directory(self):
+        catalog_directory = self._catalog_path.parent / 'catalog'
+        catalog_directory.mkdir()
+        catalog_directory.chmod(0o555)
+        try:
+            if os.access(catalog_directory, os.W_OK):
+                self.skipTest('The catalog directory is writable with the current privileges')
+            catalog_path = catalog_directory / 'galaxiesCatalog.db'
+            catalog = self._load_catalog(catalog_path)
+            self.assertIn('Access Token Manipulation', catalog)
+            self.assertEqual(list(catalog_directory.iterdir()), [])
+        finally:
+            catalog_directory.chmod(0o755)
+
+    def test_catalog_build_failure(self):
+        with open(self._cti_path / 'enterprise-attack' / 'enterprise-attack.json', 'at', encoding='utf-8') as f:
+            f.write('{')
+        with self.assertRaises(ValueError):
+            build_galaxies_catalog(self._cti_path, self._catalog_path)
+        self.assertEqual(list(self._catalog_path.parent.glob('*.tmp')), [])
+        self.assertFalse(self._catalog_path.exists())
+
+    def test_galaxy_matching(self):
+        event = get_event_with_attack_pattern_galaxy()
+        parser = MISPtoSTIX21Parser(interoperability=True)
+        parser._galaxies_catalog = self._load_catalog()
+        parser.parse_misp_event(event)
+        mitre_identity, _, grouping, attack_pattern = parser.stix_objects
+        self.assertEqual(mitre_identity.id, _MITRE_IDENTITY['id'])
+        self.assertEqual(attack_pattern.id, _ATTACK_PATTERN['id'])
+        self.assertIn(attack_pattern.id, grouping.object_refs)
@@ -2,6 +2,11 @@
 # -*- coding: utf-8 -*-
 
 import json
+from misp_stix_converter import InternalSTIX2toMISPParser
+from misp_stix_converter.stix2misp.internal_stix2_to_misp import STIXContentAdapter
+from misp_stix_converter.stix2misp.stix2_to_misp import LazySTIXObject
+from pathlib import Path
+from tempfile import TemporaryDirectory
 from .test_stix20_bundles import TestSTIX20Bundles
 from .update_documentation import AttributesDocumentationUpdater, ObjectsDocumentationUpdater
 from ._test_stix import TestSTIX20
@@ -2179,4 +2184,42 @@ class TestInternalSTIX20Import(TestInternalSTIX2Import, TestSTIX20):
         self._populate_documentation(
             misp_object = json.loads(misp_object.to_json()),
             observed_data = observed_data
-        )
\ No newline at end of file
+        )
+
+    ################################################################################
+    #                     STIX CONTENT STREAMED LOADING TESTS.                     #
+    ################################################################################
+
+    def test_stix20_bundle_streamed_from_file(self):
+        bundle = TestSTIX20Bundles.get_bundle_with_domain_ip_observable_attribute()
+        content = json.loads(bundle.serialize())
+        with TemporaryDirectory() as tmp_directory:
+            filename = Path(tmp_directory) / 'bundle.json'
+            with open(filename, 'wt', encoding='utf-8') as f:
+                # The objects are listed before the bundle id they are loaded for
+                f.write(json.dumps({'objects': content.pop('objects'), **content}))
+            self.parser.load_stix_content(filename)
+        _, report, observed_data = bundle.objects
+        self.assertEqual(self.parser.stix_version, '2.0')
+        self.assertIsInstance(self.parser._observed_data[observed_data.id], LazySTIXObject)
+        self.parser.parse_stix_bundle()
+        attribute = self._check_misp_event_features(self.parser.misp_event, report)[0]
+        self.assertEqual(self.parser._get_stix_object(observed_data.id), observed_data)
+        domain, address = self._check_observed_data_attribute(attribute, observed_data).values()
+        self.assertEqual(attribute.type, 'domain|ip')
+        self.assertEqual(attribute.value, f'{domain.value}|{address.value}')
+
+    def test_stix20_bundle_trusted_from_file(self):
+        bundle = TestSTIX20Bundles.get_bundle_with_x509_observable_object()
+        self.parser = InternalSTIX2toMISPParser(trusted_input=True)
+        with TemporaryDirectory() as tmp_directory:
+            filename = Path(tmp_directory) / 'bundle.json'
+            with open(filename, 'wt', encoding='utf-8') as f:
+                f.write(bundle.serialize())
+            self.parser.load_stix_content(filename)
+        _, report, observed_data = bundle.objects
+        self.assertIsInstance(self.parser._observed_data[observed_data.id], STIXContentAdapter)
+        self.parser.parse_stix_bundle()
+        misp_object = self._check_misp_event_features(self.parser.misp_event, report)[0]
+        x509 = self._check_observed_data_object(misp_object, observed_data)['0']
+        self._check_x509_observable_object(misp_object.attributes, x509)
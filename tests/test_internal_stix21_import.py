@@ -2,6 +2,11 @@
 # -*- coding: utf-8 -*-
 
 import json
+from misp_stix_converter import ExternalSTIX2toMISPParser, InternalSTIX2toMISPParser
+from misp_stix_converter.stix2misp.internal_stix2_to_misp import STIXContentAdapter
+from misp_stix_converter.stix2misp.stix2_to_misp import LazySTIXObject, load_misp_object_template
+from pathlib import Path
+from tempfile import TemporaryDirectory
 from .test_stix21_bundles import TestSTIX21Bundles
 from .update_documentation import AttributesDocumentationUpdater, ObjectsDocumentationUpdater
 from ._test_stix import TestSTIX21
@@ -2838,4 +2843,90 @@ class TestInternalSTIX21Import(TestInternalSTIX2Import, TestSTIX21):
         self._populate_documentation(
             misp_object = json.loads(misp_object.to_json()),
             observed_data = [observed_data, x509]
-        )
\ No newline at end of file
+        )
+
+    ################################################################################
+    #                     STIX CONTENT STREAMED LOADING TESTS.                     #
+    ################################################################################
+
+    def test_stix21_bundle_streamed_from_file(self):
+        bundle = TestSTIX21Bundles.get_bundle_with_domain_ip_observable_attribute()
+        with TemporaryDirectory() as tmp_directory:
+            filename = Path(tmp_directory) / 'bundle.json'
+            with open(filename, 'wt', encoding='utf-8') as f:
+                f.write(bundle.serialize(indent=4))
+            self.parser.load_stix_content(filename)
+        _, grouping, observed_data, domain, address = bundle.objects
+        self.assertEqual(self.parser.stix_version, '2.1')
+        self.assertIsInstance(self.parser._observed_data[observed_data.id], LazySTIXObject)
+        for observable in (domain, address):
+            self.assertIsInstance(self.parser._observable[observable.id], LazySTIXObject)
+        self.parser.parse_stix_bundle()
+        attribute = self._check_misp_event_features_from_grouping(self.parser.misp_event, grouping)[0]
+        self.assertEqual(self.parser._get_stix_object(observed_data.id), observed_data)
+        self.assertEqual(self.parser._observable[domain.id].value, domain.value)
+        self.assertEqual(attribute.type, 'domain|ip')
+        self.assertEqual(attribute.value, f'{domain.value}|{address.value}')
+
+    def test_stix21_bundle_trusted_from_file(self):
+        bundle = TestSTIX21Bundles.get_bundle_with_x509_observable_object()
+        self.parser = InternalSTIX2toMISPParser(trusted_input=True)
+        with TemporaryDirectory() as tmp_directory:
+            filename = Path(tmp_directory) / 'bundle.json'
+            with open(filename, 'wt', encoding='utf-8') as f:
+                f.write(bundle.serialize())
+            self.parser.load_stix_content(filename)
+        _, grouping, observed_data, x509 = bundle.objects
+        self.assertIsInstance(self.parser._observable[x509.id], STIXContentAdapter)
+        self.parser.parse_stix_bundle()
+        misp_object = self._check_misp_event_features_from_grouping(self.parser.misp_event, grouping)[0]
+        self._check_observed_data_object(misp_object, observed_data)
+        self.assertEqual(self.parser._get_stix_object(observed_data.id).modified, observed_data.modified)
+        self._check_x509_observable_object(misp_object.attributes, x509)
+
+    def test_stix21_invalid_bundle_from_file(self):
+        bundle = json.loads(
+            TestSTIX21Bundles.get_bundle_with_domain_ip_observable_attribute().serialize()
+        )
+        _, _, observed_data, domain, address = bundle['objects']
+        first_observed = observed_data.pop('first_observed')
+        for parser in (InternalSTIX2toMISPParser(), ExternalSTIX2toMISPParser()):
+            with TemporaryDirectory() as tmp_directory:
+                filename = Path(tmp_directory) / 'bundle.json'
+                with open(filename, 'wt', encoding='utf-8') as f:
+                    f.write(json.dumps(bundle))
+                parser.parse_stix_content(filename)
+            self.assertEqual(parser.misp_event.attributes, [])
+            errors = parser.errors[bundle['id']]
+            self.assertEqual(len(errors), 1)
+            self.assertEqual(
+                errors.pop(),
+                'Error loading the invalid STIX object with id '
+                f"{observed_data['id']}: No values for required properties "
+                'for ObservedData: (first_observed).'
+            )
+        observed_data['first_observed'] = first_observed
+        domain['resolves_to_refs'] = [[address['id']]]
+        with TemporaryDirectory() as tmp_directory:
+            filename = Path(tmp_directory) / 'bundle.json'
+            with open(filename, 'wt', encoding='utf-8') as f:
+                f.write(json.dumps(bundle))
+            self.parser.parse_stix_content(filename)
+        self.assertEqual(self.parser.misp_event.attributes, [])
+        error = self.parser.errors[bundle['id']].pop()
+        self.assertIn(f"Error with the Observed Data object with id {observed_data['id']}", error)
+        self.assertIn(f"{domain['id']}: Invalid value for DomainName 'resolves_to_refs'", error)
+
+    def test_stix21_misp_object_templates(self):
+        bundle = TestSTIX21Bundles.get_bundle_with_geolocation_object()
+        self.parser.load_stix_bundle(bundle)
+        self.parser.parse_stix_bundle()
+        _, grouping, location = bundle.objects
+        misp_object = self._check_misp_event_features_from_grouping(self.parser.misp_event, grouping)[0]
+        template = load_misp_object_template('geolocation')
+        self.assertIs(load_misp_object_template('geolocation'), template)
+        self.assertIs(misp_object._definition, template)
+        self.assertEqual(misp_object.template_uuid, template['uuid'])
+        self.assertEqual(misp_object.uuid, location.id.split('--')[1])
+        self.assertIsNone(load_misp_object_template('not-a-misp-object'))
+        self.assertEqual(self.parser._create_misp_object('not-a-misp-object').name, 'not-a-misp-object')
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import json
+import unittest
+from misp_stix_converter import (
+    MISPtoSTIX1AttributesParser, MISPtoSTIX1EventsParser, MISPtoSTIX20Parser, MISPtoSTIX21Parser)
+from misp_stix_converter.misp2stix.json_stream import StreamedArray, load_json_content
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from .test_events import get_event_with_file_and_pe_objects
+
+
+class TestJSONStream(unittest.TestCase):
+    def setUp(self):
+        self._current_path = Path(__file__).parent
+        self._tmp_directory = TemporaryDirectory()
+
+    def tearDown(self):
+        self._tmp_directory.cleanup()
+
+    def _write_event(self, event):
+        filename = Path(self._tmp_directory.name) / 'event.json'
+        with open(filename, 'wt', encoding='utf-8') as f:
+            f.write(json.dumps(event, indent=4))
+        return filename
+
+    def test_load_event(self):
+        event = get_event_with_file_and_pe_objects()
+        event['Event']['Tag'] = [{'name': 'tlp:white'}]
+        event['Event']['Attribute'] = [
+            {'type': 'ip-dst', 'value': '8.8.8.8', 'number': 12.5e3, 'flags': [True, False, None]},
+            {'type': 'text', 'value': 'unicode é \\"  ', 'data': 'x' * 5000}
+        ]
+        filename = self._write_event(event)
+        content = load_json_content(filename, chunk_size=7)
+        misp_event = content['Event']
+        self.assertIsInstance(misp_event['Attribute'], StreamedArray)
+        self.assertIsInstance(misp_event['Object'], StreamedArray)
+        self.assertEqual(len(misp_event['Attribute']), 2)
+        self.assertEqual(len(misp_event['Object']), len(event['Event']['Object']))
+        self.assertEqual(list(misp_event['Attribute']), event['Event']['Attribute'])
+        self.assertEqual(list(misp_event['Object']), event['Event']['Object'])
+        self.assertEqual(misp_event['Tag'], event['Event']['Tag'])
+        self.assertEqual(misp_event['Orgc'], event['Event']['Orgc'])
+
+    def test_load_empty_arrays(self):
+        filename = self._write_event({'Event': {'uuid': 'a', 'Attribute': [], 'Object': []}})
+        misp_event = load_json_content(filename, chunk_size=3)['Event']
+        self.assertFalse(misp_event['Attribute'])
+        self.assertEqual(list(misp_event['Object']), [])
+
+    def test_stix1_incremental_parsing(self):
+        for parser_class, name in zip((MISPtoSTIX1AttributesParser, MISPtoSTIX1EventsParser), ('attributes', 'events')):
+            filename = self._current_path / f'test_{name}_collection_1.json'
+            parser = parser_class('MISP', '1.1.1')
+            parser.parse_json_content(filename)
+            reference = parser.stix_package.to_dict()
+            parser = parser_class('MISP', '1.1.1')
+            parser.parse_json_content(filename, incremental=True)
+            self.assertEqual(
+                self._strip_ids(parser.stix_package.to_dict()),
+                self._strip_ids(reference)
+            )
+
+    def test_stix2_incremental_parsing(self):
+        for parser_class in (MISPtoSTIX20Parser, MISPtoSTIX21Parser):
+            for name in ('attributes', 'events'):
+                filename = self._current_path / f'test_{name}_collection_1.json'
+                parser = parser_class()
+                parser.parse_json_content(filename)
+                reference = json.loads(parser.bundle.serialize())['objects']
+                parser = parser_class()
+                parser.parse_json_content(filename, incremental=True)
+                self.assertEqual(json.loads(parser.bundle.serialize())['objects'], reference)
+
+    def _strip_ids(self, content):
+        if isinstance(content, dict):
+            return {key: self._strip_ids(value) for key, value in content.items() if key not in ('id', 'timestamp')}
+        if isinstance(content, list):
+            return [self._strip_ids(value) for value in content]
+        return content
@@ -1,12 +1,17 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import json
+import os
 import re
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from misp_stix_converter import (MISPtoSTIX1EventsParser, misp_attribute_collection_to_stix1,
                                  misp_event_collection_to_stix1, misp_to_stix1, stix1_framing)
+from misp_stix_converter.misp_stix_converter import _default_tasks_per_worker, _map_in_order
 from pathlib import Path
+from tempfile import TemporaryDirectory
 from uuid import uuid5, UUID
 from .test_events import *
 from ._test_stix_export import TestCollectionSTIX1Export
@@ -2696,6 +2701,33 @@ class TestCollectionStix1Export(TestCollectionSTIX1Export):
         )
         self._check_stix1_export_results(to_test_name, reference_name)
 
+    def test_attribute_collection_export_json(self):
+        name = 'test_attributes_collection'
+        output_file = self._current_path / f'{name}.json.out'
+        input_files = [self._current_path / f'{name}_{n}.json' for n in (1, 2)]
+        packages = []
+        with TemporaryDirectory() as tmp_dir:
+            for parameters in ({'in_memory': True}, {}, {'spool_size': 16, 'tmp_dir': tmp_dir}):
+                self.assertEqual(
+                    misp_attribute_collection_to_stix1(
+                        output_file,
+                        *input_files,
+                        return_format='json',
+                        version='1.1.1',
+                        **parameters
+                    ),
+                    1
+                )
+                with open(output_file, 'rt', encoding='utf-8') as f:
+                    packages.append(json.loads(f.read()))
+            self.assertEqual(os.listdir(tmp_dir), [])
+        for package in packages[1:]:
+            self.assertEqual(package['indicators'], packages[0]['indicators'])
+            self.assertEqual(
+                package['observables']['observables'],
+                packages[0]['observables']['observables']
+            )
+
     def test_event_collection_export_11(self):
         name = 'test_events_collection'
         to_test_name = f'{name}.json.out'
@@ -2723,6 +2755,17 @@ class TestCollectionStix1Export(TestCollectionSTIX1Export):
             1
         )
         self._check_stix1_collection_export_results(to_test_name, reference_name)
+        self.assertEqual(
+            misp_event_collection_to_stix1(
+                output_file,
+                *input_files,
+                return_format='xml',
+                version='1.1.1',
+                workers=2
+            ),
+            1
+        )
+        self._check_stix1_collection_export_results(to_test_name, reference_name)
 
     def test_event_collection_export_12(self):
         name = 'test_events_collection'
@@ -2751,6 +2794,71 @@ class TestCollectionStix1Export(TestCollectionSTIX1Export):
             1
         )
         self._check_stix1_collection_export_results(to_test_name, reference_name)
+        self.assertEqual(
+            misp_event_collection_to_stix1(
+                output_file,
+                *input_files,
+                return_format='xml',
+                version='1.2',
+                workers=2
+            ),
+            1
+        )
+        self._check_stix1_collection_export_results(to_test_name, reference_name)
+
+    def test_event_collection_export_json(self):
+        name = 'test_events_collection'
+        output_file = self._current_path / f'{name}.json.out'
+        input_files = [self._current_path / f'{name}_{n}.json' for n in (1, 2)]
+        related_packages = []
+        for parameters in ({}, {'in_memory': True}, {'workers': 2}):
+            self.assertEqual(
+                misp_event_collection_to_stix1(
+                    output_file,
+                    *input_files,
+                    return_format='json',
+                    version='1.1.1',
+                    **parameters
+                ),
+                1
+            )
+            with open(output_file, 'rt', encoding='utf-8') as f:
+                related_packages.append(json.loads(f.read())['related_packages']['related_packages'])
+        self.assertEqual(len(related_packages[0]), 4)
+        for packages in related_packages[1:]:
+            self.assertEqual(packages, related_packages[0])
+
+    def test_event_collection_parallel_window(self):
+        workers = 2
+        consumed = []
+
+        def arguments():
+            for argument in range(20):
+                consumed.append(argument)
+                yield argument
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = []
+            for result in _map_in_order(executor, str, arguments(), workers):
+                self.assertLessEqual(len(consumed) - len(results), workers * _default_tasks_per_worker)
+                results.append(result)
+        self.assertEqual(results, [str(argument) for argument in range(20)])
+
+    def test_event_export_json(self):
+        name = 'test_events_collection_1.json'
+        packages = []
+        for workers in (1, 2):
+            self.assertEqual(misp_to_stix1(self._current_path / name, 'json', '1.1.1', workers=workers), 1)
+            with open(self._current_path / f'{name}.out', 'rt', encoding='utf-8') as f:
+                content = f.read()
+            self.assertTrue(content.startswith('{\n    "id": "MISP:Package-'))
+            package = json.loads(content)
+            self.assertNotIn('timestamp', package)
+            self.assertEqual(package['stix_header']['title'], "Export from MISP's MISP")
+            self.assertEqual(content, json.dumps(package, indent=4))
+            package.pop('id')
+            packages.append(package)
+        self.assertEqual(*packages)
 
     def test_event_export_11(self):
         name = 'test_events_collection_1.json'
@@ -2761,3 +2869,5 @@ class TestCollectionStix1Export(TestCollectionSTIX1Export):
         name = 'test_events_collection_1.json'
         self.assertEqual(misp_to_stix1(self._current_path / name, 'xml', '1.2'), 1)
         self._check_stix1_export_results(f'{name}.out', 'test_event_stix12.xml')
+        self.assertEqual(misp_to_stix1(self._current_path / name, 'xml', '1.2', workers=2), 1)
+        self._check_stix1_export_results(f'{name}.out', 'test_event_stix12.xml')
@@ -2,6 +2,8 @@
 # -*- coding: utf-8 -*-
 
 from misp_stix_converter import MISPtoSTIX20Parser, misp_collection_to_stix2_0, misp_to_stix2_0
+from misp_stix_converter.misp2stix.misp_to_stix20 import ValidatedPatternIndicator
+from stix2.v20.common import TLP_WHITE
 from .test_events import *
 from .update_documentation import (
     AttributesDocumentationUpdater, GalaxiesDocumentationUpdater,
@@ -383,6 +385,7 @@ class TestSTIX20Export(TestSTIX2Export, TestSTIX20):
         _, _, _, marking = bundle.objects
         self.assertEqual(marking.definition_type, 'tlp')
         self.assertEqual(marking.definition['tlp'], 'white')
+        self.assertIs(marking, TLP_WHITE)
 
     ################################################################################
     #                        SINGLE ATTRIBUTES EXPORT TESTS                        #
@@ -2821,6 +2824,20 @@ class TestSTIX20Export(TestSTIX2Export, TestSTIX20):
             summary = 'branded-vulnerability'
         )
 
+    def test_attributes_collection_batch(self):
+        attributes = [
+            *get_event_with_domain_attribute()['Event']['Attribute'],
+            *get_event_with_hash_attributes()['Event']['Attribute'],
+            *get_event_with_ip_attributes()['Event']['Attribute'],
+            *get_event_with_mutex_attribute()['Event']['Attribute'],
+            *get_event_with_url_attributes()['Event']['Attribute']
+        ]
+        self._run_attributes_batch_tests(
+            attributes,
+            MISPtoSTIX20Parser(),
+            ValidatedPatternIndicator
+        )
+
 
 class TestSTIX20ExportInteroperability(TestSTIX2Export):
     def setUp(self):
@@ -2899,6 +2916,8 @@ class TestCollectionStix20Export(TestCollectionSTIX2Export):
         self._check_stix2_results_export(to_test_name, reference_name)
         self.assertEqual(misp_collection_to_stix2_0(output_file, *input_files, in_memory=True), 1)
         self._check_stix2_results_export(to_test_name, reference_name)
+        self.assertEqual(misp_collection_to_stix2_0(output_file, *input_files, workers=2), 1)
+        self._check_stix2_results_export(to_test_name, reference_name)
 
     def test_events_collection(self):
         name = 'test_events_collection'
@@ -2910,8 +2929,14 @@ class TestCollectionStix20Export(TestCollectionSTIX2Export):
         self._check_stix2_results_export(to_test_name, reference_name)
         self.assertEqual(misp_collection_to_stix2_0(output_file, *input_files, in_memory=True), 1)
         self._check_stix2_results_export(to_test_name, reference_name)
+        self.assertEqual(misp_collection_to_stix2_0(output_file, *input_files, workers=2), 1)
+        self._check_stix2_results_export(to_test_name, reference_name)
+        self.assertEqual(misp_collection_to_stix2_0(output_file, *input_files, buffer_size=1 << 16), 1)
+        self._check_stix2_results_export(to_test_name, reference_name)
 
     def test_event_export(self):
         name = 'test_events_collection_1.json'
         self.assertEqual(misp_to_stix2_0(self._current_path / name), 1)
         self._check_stix2_results_export(f'{name}.out', 'test_event_stix20.json')
+        self.assertEqual(misp_to_stix2_0(self._current_path / name, compact=True), 1)
+        self._check_stix2_results_export(f'{name}.out', 'test_event_stix20.json')
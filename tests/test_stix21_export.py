@@ -2,7 +2,11 @@
 # -*- coding: utf-8 -*-
 
 from datetime import datetime
+from types import SimpleNamespace
+from uuid import uuid4
 from misp_stix_converter import MISPtoSTIX21Parser, misp_collection_to_stix2_1, misp_to_stix2_1
+from misp_stix_converter.misp2stix.misp_to_stix21 import ValidatedPatternIndicator
+from stix2.v21.common import TLP_WHITE
 from .test_events import *
 from .update_documentation import (
     AttributesDocumentationUpdater, GalaxiesDocumentationUpdater,
@@ -540,6 +544,7 @@ class TestSTIX21Export(TestSTIX2Export, TestSTIX21):
         _, _, _, marking = stix_objects
         self.assertEqual(marking.definition_type, 'tlp')
         self.assertEqual(marking.definition['tlp'], 'white')
+        self.assertIs(marking, TLP_WHITE)
 
     ################################################################################
     #                        SINGLE ATTRIBUTES EXPORT TESTS                        #
@@ -3959,6 +3964,54 @@ class TestSTIX21Export(TestSTIX2Export, TestSTIX21):
             self._datetime_from_timestamp(vuln_object['timestamp'])
         )
 
+    def test_object_refs_deduplication(self):
+        self.parser.parse_misp_event(get_base_event())
+        object_refs = [f'indicator--{uuid4()}' for _ in range(3)]
+        for object_ref in object_refs:
+            self.parser._append_SDO(SimpleNamespace(id=object_ref))
+        self.parser._handle_object_refs(object_refs[::-1])
+        self.parser._append_SDO(SimpleNamespace(id=object_refs[1]))
+        self.assertEqual(self.parser.object_refs[-3:], object_refs)
+
+    def test_object_references_to_many_objects(self):
+        event = get_event_with_object_references()
+        coa_object = event['Event']['Object'][3]
+        ip_port_object = event['Event']['Object'][4]
+        ip_objects = []
+        for _ in range(100):
+            ip_object = deepcopy(ip_port_object)
+            ip_object['uuid'] = str(uuid4())
+            del ip_object['ObjectReference']
+            ip_objects.append(ip_object)
+        coa_object['ObjectReference'] = [
+            {
+                "referenced_uuid": ip_object['uuid'],
+                "relationship_type": "protects-against"
+            } for ip_object in reversed(ip_objects)
+        ]
+        event['Event']['Object'] = [coa_object, *ip_objects]
+        self.parser.parse_misp_event(event)
+        relationships = [
+            stix_object for stix_object in self.parser.stix_objects
+            if stix_object.type == 'relationship'
+        ]
+        self.assertEqual(len(relationships), len(ip_objects))
+        for relationship in relationships:
+            self.assertEqual(relationship.source_ref, f"course-of-action--{coa_object['uuid']}")
+        self.assertEqual(
+            [relationship.target_ref for relationship in relationships],
+            [f"indicator--{ip_object['uuid']}" for ip_object in reversed(ip_objects)]
+        )
+        self.assertIsNone(self.parser._find_target_uuid(str(uuid4())))
+
+    def test_shared_mapping(self):
+        parser = MISPtoSTIX21Parser()
+        self.assertIs(parser._mapping, self.parser._mapping)
+        self.parser.parse_misp_event(get_base_event())
+        self.assertTrue(hasattr(parser._mapping, 'objects_mapping'))
+        with self.assertRaises(TypeError):
+            parser._mapping.attribute_types_mapping['ip-src'] = '_parse_custom_attribute'
+
     ################################################################################
     #                            GALAXIES EXPORT TESTS.                            #
     ################################################################################
@@ -4070,6 +4123,22 @@ class TestSTIX21Export(TestSTIX2Export, TestSTIX21):
         self.parser.parse_misp_attributes(misp_attribute)
         self.assertIsNotNone(self.parser.bundle)
 
+    def test_attributes_collection_batch(self):
+        attributes = [
+            *get_event_with_domain_attribute()['Event']['Attribute'],
+            *get_event_with_hash_attributes()['Event']['Attribute'],
+            *get_event_with_ip_attributes()['Event']['Attribute'],
+            *get_event_with_mutex_attribute()['Event']['Attribute'],
+            *get_event_with_url_attributes()['Event']['Attribute']
+        ]
+        indicators = self._run_attributes_batch_tests(
+            attributes,
+            MISPtoSTIX21Parser(),
+            ValidatedPatternIndicator
+        )
+        for indicator in indicators:
+            self.assertEqual(indicator.spec_version, '2.1')
+
 
 class TestSTIX21ExportInteroperability(TestSTIX2Export, TestSTIX21):
     def setUp(self):
@@ -4151,6 +4220,8 @@ class TestCollectionStix21Export(TestCollectionSTIX2Export):
         self._check_stix2_results_export(to_test_name, reference_name)
         self.assertEqual(misp_collection_to_stix2_1(output_file, *input_files, in_memory=True), 1)
         self._check_stix2_results_export(to_test_name, reference_name)
+        self.assertEqual(misp_collection_to_stix2_1(output_file, *input_files, workers=2), 1)
+        self._check_stix2_results_export(to_test_name, reference_name)
 
     def test_events_collection(self):
         name = 'test_events_collection'
@@ -4162,8 +4233,14 @@ class TestCollectionStix21Export(TestCollectionSTIX2Export):
         self._check_stix2_results_export(to_test_name, reference_name)
         self.assertEqual(misp_collection_to_stix2_1(output_file, *input_files, in_memory=True), 1)
         self._check_stix2_results_export(to_test_name, reference_name)
+        self.assertEqual(misp_collection_to_stix2_1(output_file, *input_files, workers=2), 1)
+        self._check_stix2_results_export(to_test_name, reference_name)
+        self.assertEqual(misp_collection_to_stix2_1(output_file, *input_files, buffer_size=1 << 16), 1)
+        self._check_stix2_results_export(to_test_name, reference_name)
 
     def test_event_export(self):
         name = 'test_events_collection_1.json'
         self.assertEqual(misp_to_stix2_1(self._current_path / name), 1)
         self._check_stix2_results_export(f'{name}.out', 'test_event_stix21.json')
+        self.assertEqual(misp_to_stix2_1(self._current_path / name, compact=True), 1)
+        self._check_stix2_results_export(f'{name}.out', 'test_event_stix21.json')
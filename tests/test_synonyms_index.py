@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import unittest
+from misp_stix_converter import ExternalSTIX2toMISPParser, build_synonyms_index
+from misp_stix_converter.stix2misp.exceptions import (SynonymsResourceJSONError,
+    UnavailableGalaxyResourcesError, UnavailableSynonymsResourceError)
+from misp_stix_converter.stix2misp.synonyms_index import load_synonyms_file, load_synonyms_mapping
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+_THREAT_ACTOR_CLUSTER = {
+    "type": "threat-actor",
+    "values": [
+        {
+            "value": "APT 28",
+            "meta": {
+                "synonyms": ["Fancy Bear", "Sofacy"]
+            }
+        },
+        {
+            "value": "APT 29",
+            "meta": {
+                "synonyms": ["Cozy Bear"]
+            }
+        }
+    ]
+}
+_TOOL_CLUSTER = {
+    "type": "tool",
+    "values": [
+        {"value": "Sofacy"}
+    ]
+}
+
+
+class TestSynonymsIndex(unittest.TestCase):
+    def setUp(self):
+        self._tmp_directory = TemporaryDirectory()
+        self._clusters_path = Path(self._tmp_directory.name) / 'clusters'
+        self._index_path = Path(self._tmp_directory.name) / 'synonymsToTagNames.pickle'
+        self._synonyms_path = Path(self._tmp_directory.name) / 'synonyms.json'
+        self._write_cluster('threat-actor', _THREAT_ACTOR_CLUSTER)
+
+    def tearDown(self):
+        self._tmp_directory.cleanup()
+
+    def _load_synonyms_mapping(self):
+        return load_synonyms_mapping(self._clusters_path, self._index_path)
+
+    def _write_synonyms_file(self, synonyms_mapping):
+        with open(self._synonyms_path, 'wt', encoding='utf-8') as f:
+            f.write(json.dumps(synonyms_mapping))
+
+    def _write_cluster(self, name, cluster):
+        self._clusters_path.mkdir(parents=True, exist_ok=True)
+        with open(self._clusters_path / f'{name}.json', 'wt', encoding='utf-8') as f:
+            f.write(json.dumps(cluster))
+
+    def test_synonyms_mapping(self):
+        self.assertEqual(build_synonyms_index(self._clusters_path, self._index_path), self._index_path)
+        synonyms_mapping = self._load_synonyms_mapping()
+        self.assertEqual(
+            synonyms_mapping,
+            {
+                'APT 28': ['misp-galaxy:threat-actor="APT 28"'],
+                'Fancy Bear': ['misp-galaxy:threat-actor="APT 28"'],
+                'Sofacy': ['misp-galaxy:threat-actor="APT 28"'],
+                'APT 29': ['misp-galaxy:threat-actor="APT 29"'],
+                'Cozy Bear': ['misp-galaxy:threat-actor="APT 29"']
+            }
+        )
+        self.assertIs(self._load_synonyms_mapping(), synonyms_mapping)
+
+    def test_synonyms_mapping_update(self):
+        synonyms_mapping = self._load_synonyms_mapping()
+        self.assertTrue(self._index_path.exists())
+        self._write_cluster('tool', _TOOL_CLUSTER)
+        updated_mapping = self._load_synonyms_mapping()
+        self.assertIsNot(updated_mapping, synonyms_mapping)
+        self.assertEqual(
+            updated_mapping['Sofacy'],
+            ['misp-galaxy:threat-actor="APT 28"', 'misp-galaxy:tool="Sofacy"']
+        )
+
+    def test_synonyms_mapping_without_clusters(self):
+        build_synonyms_index(self._clusters_path, self._index_path)
+        for filename in self._clusters_path.glob('*.json'):
+            os.remove(filename)
+        os.rmdir(self._clusters_path)
+        self.assertIn('Cozy Bear', self._load_synonyms_mapping())
+        with self.assertRaises(UnavailableGalaxyResourcesError):
+            load_synonyms_mapping(self._clusters_path, self._index_path.with_name('missing.pickle'))
+
+    def test_parser_synonyms_path(self):
+        self._write_synonyms_file({'Fancy Bear': ['misp-galaxy:threat-actor="APT 28"']})
+        with open(self._synonyms_path, 'rb') as f:
+            content = f.read()
+        mtime = self._synonyms_path.stat().st_mtime_ns
+        parser = ExternalSTIX2toMISPParser(synonyms_path=str(self._synonyms_path))
+        self.assertEqual(parser.synonyms_mapping, {'Fancy Bear': ['misp-galaxy:threat-actor="APT 28"']})
+        self.assertEqual(parser._check_existing_galaxy_name('Bear'), ['misp-galaxy:threat-actor="APT 28"'])
+        with open(self._synonyms_path, 'rb') as f:
+            self.assertEqual(f.read(), content)
+        self.assertEqual(self._synonyms_path.stat().st_mtime_ns, mtime)
+        self.assertFalse(self._index_path.exists())
+
+    def test_parser_synonyms_path_update(self):
+        self._write_synonyms_file({'Fancy Bear': ['misp-galaxy:threat-actor="APT 28"']})
+        synonyms_mapping = load_synonyms_file(self._synonyms_path)
+        self.assertIs(load_synonyms_file(self._synonyms_path), synonyms_mapping)
+        self._write_synonyms_file({'Cozy Bear': ['misp-galaxy:threat-actor="APT 29"']})
+        self.assertEqual(
+            load_synonyms_file(self._synonyms_path),
+            {'Cozy Bear': ['misp-galaxy:threat-actor="APT 29"']}
+        )
+
+    def test_parser_synonyms_path_errors(self):
+        with self.assertRaises(UnavailableSynonymsResourceError):
+            load_synonyms_file(self._synonyms_path)
+        with open(self._synonyms_path, 'wt', encoding='utf-8') as f:
+            f.write('{"Fancy Bear": ')
+        with self.assertRaises(SynonymsResourceJSONError):
+            load_synonyms_file(self._synonyms_path)
+
+    def test_substring_matching(self):
+        self._write_cluster('tool', _TOOL_CLUSTER)
+        synonyms_mapping = self._load_synonyms_mapping()
+        for value in ('APT', 'Bear', 'ear', 'Sofa', 'PT 2', 'T 29', 'a', ''):
+            expected = next(
+                (tag_names for name, tag_names in synonyms_mapping.items() if value in name),
+                None
+            )
+            self.assertEqual(synonyms_mapping.first_containing(value), expected)
+        self.assertIsNone(synonyms_mapping.first_containing('Panda'))
+        self._write_synonyms_file(synonyms_mapping)
+        parser = ExternalSTIX2toMISPParser(synonyms_path=self._synonyms_path)
+        self.assertEqual(
+            parser._check_existing_galaxy_name('Sofacy'),
+            ['misp-galaxy:threat-actor="APT 28"', 'misp-galaxy:tool="Sofacy"']
+        )
+        self.assertEqual(
+            parser._check_existing_galaxy_name('Cozy'),
+            ['misp-galaxy:threat-actor="APT 29"']
+        )